@@ -17,6 +17,7 @@ import pandas as pd
 import asyncio
 import uuid
 import time
+import threading
 
 # NOTE: For deployment platforms (Heroku, Railway, etc.), ensure that:
 # 1. Request timeout is set to at least 30 minutes (1800 seconds)
@@ -29,6 +30,10 @@ from openai import OpenAI
 
 # Global dictionary to track background tasks
 BACKGROUND_TASKS = {}
+# Number of improving solutions kept per task in "solver_history"
+SOLVER_HISTORY_LIMIT = 50
+# Stop events of running timetable tasks, set by /cancel_task/{task_id}
+TASK_STOP_EVENTS = {}
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -62,12 +67,16 @@ from src.database_management.section_allocation import (
 from src.database_management.Slot_info import insert_time_slots
 from src.database_management.truncate_db import truncate_detail
 from src.database_management.models import Schedule
-from src.main_algorithm import gen_timetable_auto
+from src.main_algorithm import (gen_timetable_auto, precheck_timetable, draft_timetable, load_timetable_inputs,
+                                repair_timetable, reschedule_enrollment_changes)
+from src.schedule_model import STUDENT_CONFLICT_MODES, SOLVER_PARAMETER_TYPES
+from src.solver_pool import run_solver_job
 from src.database_management.dbconnection import (
     get_organization_by_domain, 
     get_organization_by_name, 
     get_db_session,
-    create_tables
+    ensure_tables_exist,
+    dispose_all_engines
 )
 from src.database_management.models import User
 from src.database_management.admin_manager import (
@@ -83,7 +92,9 @@ from src.database_management.settings_manager import (
     get_max_classes_per_slot,
     set_max_classes_per_slot,
     initialize_default_settings,
-    get_all_settings
+    get_all_settings,
+    get_solver_settings,
+    set_solver_settings
 )
 from src.database_management.organization_manager import (
     validate_organization_creation,
@@ -94,7 +105,6 @@ from src.database_management.organization_manager import (
     delete_organization
 
 )
-from sqlalchemy import text
 
 load_dotenv()
 print(os.getenv("DATABASE_URL"))
@@ -133,6 +143,12 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to initialize meta-database: {e}")
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the pooled database connections on shutdown."""
+    dispose_all_engines()
+
 # -------------------- Middleware and static files --------------------
 app.add_middleware(SessionMiddleware, secret_key=os.getenv("SECRET_KEY"))
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -173,26 +189,8 @@ def fetch_user_role_from_org_db(email: str, db_path: str, user_name: str = None,
             if schema_name.startswith("org_"):
                 org_name = schema_name[4:]  # Remove 'org_' prefix
         
-        # First, ensure tables exist
-        try:
-            if is_postgresql() and org_name:
-                with get_db_session(get_organization_database_url(), org_name) as session:
-                    # Check if Users table exists by querying it
-                    session.execute(text("SELECT 1 FROM \"Users\" LIMIT 1"))
-                    logger.info(f"✅ Users table exists in schema for {org_name}")
-            else:
-                with get_db_session(db_path) as session:
-                    # Check if Users table exists by querying it
-                    session.execute(text("SELECT 1 FROM Users LIMIT 1"))
-                    logger.info(f"✅ Users table exists at {db_path}")
-        except Exception as e:
-            # If table doesn't exist, create all tables
-            logger.info(f"🔧 Users table not found, creating tables...")
-            if is_postgresql() and org_name:
-                create_tables(get_organization_database_url(), org_name)
-            else:
-                create_tables(db_path)
-                logger.info(f"✅ Tables created successfully")
+        # Create the tables on first use of this database in the process
+        ensure_tables_exist(db_path, org_name)
             
         # Now proceed with user lookup/creation
         if is_postgresql() and org_name:
@@ -496,6 +494,14 @@ async def send_admin_data(
         toggle_student: bool = Form(True), 
         toggle_same_day: bool = Form(True),
         toggle_consec_days: bool = Form(False),
+        conflict_mode: str = Form("student"),
+        solver_max_time: Optional[str] = Form(None),
+        solver_num_workers: Optional[str] = Form(None),
+        solver_gap_limit: Optional[str] = Form(None),
+        solver_random_seed: Optional[str] = Form(None),
+        solver_linearization_level: Optional[str] = Form(None),
+        solver_log_search: Optional[str] = Form(None),
+        bypass_cache: bool = Form(False),
 ):
     """
     Processes admin data uploads, starts async timetable generation, returns task ID.
@@ -509,6 +515,34 @@ async def send_admin_data(
     if not db_path:
         raise HTTPException(status_code=422, detail="Database path not provided in session.")
 
+    if conflict_mode not in STUDENT_CONFLICT_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid conflict mode '{conflict_mode}'. Expected one of: {', '.join(STUDENT_CONFLICT_MODES)}."
+        )
+
+    # Blank solver fields mean "auto-tune from the instance size"
+    solver_form_fields = {
+        "max_time_in_seconds": solver_max_time,
+        "num_workers": solver_num_workers,
+        "relative_gap_limit": solver_gap_limit,
+        "random_seed": solver_random_seed,
+        "linearization_level": solver_linearization_level,
+        "log_search_progress": solver_log_search,
+    }
+    solver_settings = {}
+    for param_name, raw_value in solver_form_fields.items():
+        if raw_value is None or raw_value.strip() == "":
+            solver_settings[param_name] = None
+            continue
+        try:
+            if SOLVER_PARAMETER_TYPES[param_name] is bool:
+                solver_settings[param_name] = raw_value.strip().lower() in ("1", "true", "yes", "on")
+            else:
+                solver_settings[param_name] = SOLVER_PARAMETER_TYPES[param_name](raw_value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid value '{raw_value}' for solver setting {param_name}.")
+
     # 2. Validate that files are properly uploaded and not empty
     files_to_validate = {
         "courses_file": courses_file,
@@ -603,16 +637,52 @@ async def send_admin_data(
     # 7. Ensure time slots exist before generating timetable
     ensure_default_time_slots(db_path)
 
+    # Persist the solver settings for this organization; gen_timetable_auto reads them back
+    set_solver_settings(db_path, solver_settings)
+
+    # Reject data that cannot possibly be scheduled before tying up a solver worker.
+    # Loading, checking and drafting grow with the instance, so they run off the event loop.
+    scheduling_inputs = await run_in_threadpool(load_timetable_inputs, db_path)
+    presolve_error = await run_in_threadpool(precheck_timetable, db_path,
+                                             add_prof_constraints=toggle_prof,
+                                             add_timeslot_capacity=toggle_capacity,
+                                             add_no_same_day=toggle_same_day,
+                                             inputs=scheduling_inputs)
+    if presolve_error:
+        logger.info(f"Timetable pre-check failed: {presolve_error}")
+        raise HTTPException(status_code=400, detail=presolve_error)
+
+    # Greedy draft the admin can preview while the exact solve runs
+    draft = await run_in_threadpool(draft_timetable, db_path,
+                                    add_prof_constraints=toggle_prof,
+                                    add_timeslot_capacity=toggle_capacity,
+                                    add_no_same_day=toggle_same_day,
+                                    inputs=scheduling_inputs)
+    logger.info(f"Draft timetable: {len(draft['unplaced'])} course(s) not fully placed, "
+                f"{draft['student_clashes']} student clashes")
+
     # 8. Generate unique task ID and start background task
     task_id = str(uuid.uuid4())
     
     # Store task info
+    TASK_STOP_EVENTS[task_id] = threading.Event()
     BACKGROUND_TASKS[task_id] = {
         "status": "processing",
         "progress": "Starting timetable generation...",
         "result": None,
         "error": None,
-        "db_path": db_path
+        "db_path": db_path,
+        "solver_progress": None,
+        "solver_history": [],
+        "stopped_early": False,
+        "gap": None,
+        "cached": False,
+        "metrics": None,
+        "draft": {
+            "schedule": draft["schedule"].to_dict(orient="records"),
+            "unplaced": draft["unplaced"],
+            "student_clashes": draft["student_clashes"]
+        }
     }
     
     # Start background task
@@ -624,7 +694,9 @@ async def send_admin_data(
         toggle_student,
         toggle_same_day,
         toggle_consec_days,
-        request
+        request,
+        conflict_mode,
+        not bypass_cache
     ))
     
     # Return task ID immediately
@@ -632,9 +704,11 @@ async def send_admin_data(
 
 
 async def generate_timetable_async(task_id: str, db_path: str, toggle_prof: bool, toggle_capacity: bool, 
-                                  toggle_student: bool, toggle_same_day: bool, toggle_consec_days: bool, request: Request):
+                                  toggle_student: bool, toggle_same_day: bool, toggle_consec_days: bool, request: Request,
+                                  conflict_mode: str = "student", use_cache: bool = True):
     """
     Background task to generate timetable asynchronously.
+    With use_cache, an identical earlier run is reused instead of solved again.
     """
     try:
         # Update progress
@@ -648,17 +722,58 @@ async def generate_timetable_async(task_id: str, db_path: str, toggle_prof: bool
         await asyncio.sleep(0.1)
         
         BACKGROUND_TASKS[task_id]["progress"] = "Running multi-phase optimization (this may take several minutes)..."
-        
-        # Run the timetable generation in a thread pool to avoid blocking
+        started_at = time.time()
+
+        def report_solver_progress(update):
+            """Records solver progress in the task record (relayed from the solver process)."""
+            task = BACKGROUND_TASKS.get(task_id)
+            if task is None:
+                return
+            update = dict(update, total_elapsed_seconds=round(time.time() - started_at, 3))
+            task["solver_progress"] = update
+            if update.get("cached"):
+                task["cached"] = True
+                task["progress"] = "Reusing the timetable of an identical earlier run..."
+            elif update.get("queued"):
+                task["progress"] = "Waiting for a free solver worker..."
+            elif update.get("stopped_early"):
+                task["gap"] = update["gap"]
+            elif update.get("objective") is None:
+                task["progress"] = f"Running optimization {update['phase']}..."
+            else:
+                task["progress"] = (f"Running optimization {update['phase']}: objective {update['objective']:.0f}, "
+                                    f"gap {update['gap']:.1%}, {update['total_elapsed_seconds']:.0f}s elapsed")
+                # Replace rather than append so a concurrent /task_status read never sees a list mid-update
+                task["solver_history"] = (task["solver_history"] + [update])[-SOLVER_HISTORY_LIMIT:]
+
+        # Filled by the solver with per-phase statistics (see schedule_courses)
+        solver_metrics = {}
+
+        # With SOLVER_EXPORT_DIR set, every solved model is exported for offline replay
+        solver_export_root = os.getenv("SOLVER_EXPORT_DIR")
+
+        # Solve in an isolated worker process (see src/solver_pool.py); the thread only waits on it
         result = await run_in_threadpool(
+            run_solver_job,
             gen_timetable_auto,
-            db_path,
-            add_prof_constraints=toggle_prof,
-            add_timeslot_capacity=toggle_capacity,
-            add_student_conflicts=toggle_student,
-            add_no_same_day=toggle_same_day,
-            add_no_consec_days=toggle_consec_days
+            dict(
+                db_path=db_path,
+                add_prof_constraints=toggle_prof,
+                add_timeslot_capacity=toggle_capacity,
+                add_student_conflicts=toggle_student,
+                add_no_same_day=toggle_same_day,
+                add_no_consec_days=toggle_consec_days,
+                conflict_mode=conflict_mode,
+                use_cache=use_cache,
+                export_dir=os.path.join(solver_export_root, task_id) if solver_export_root else None,
+                metrics=solver_metrics
+            ),
+            progress_callback=report_solver_progress,
+            stop_event=TASK_STOP_EVENTS.get(task_id)
         )
+        BACKGROUND_TASKS[task_id]["metrics"] = solver_metrics
+        # One JSON line per run, so the numbers survive in the platform's log stream
+        logger.info(json.dumps({"event": "solver_metrics", "task_id": task_id, "db_path": db_path, **solver_metrics}))
         
         BACKGROUND_TASKS[task_id]["progress"] = "Processing optimization results..."
         await asyncio.sleep(0.1)
@@ -667,14 +782,31 @@ async def generate_timetable_async(task_id: str, db_path: str, toggle_prof: bool
         if len(result) == 3:
             schedule_data, conflicts, infeasibility_reason = result
             if schedule_data.empty:
-                # Store infeasibility reason
+                # Store infeasibility reason; the saved timetable is left as it was
+                if infeasibility_reason.startswith("STOPPED EARLY"):
+                    progress = "Timetable generation was stopped before a complete schedule was found"
+                elif " TIMED OUT" in infeasibility_reason:
+                    progress = "Timetable generation ran out of solver time"
+                else:
+                    progress = "Timetable generation failed due to constraints"
                 BACKGROUND_TASKS[task_id].update({
                     "status": "failed",
                     "error": infeasibility_reason,
-                    "progress": "Timetable generation failed due to constraints",
+                    "stopped_early": infeasibility_reason.startswith("STOPPED EARLY"),
+                    "progress": progress,
                     "completed_at": time.time()
                 })
                 logger.info(f"Timetable generation failed: {infeasibility_reason}")
+            elif infeasibility_reason.startswith("STOPPED EARLY"):
+                # Stopped through /cancel_task; the best complete schedule so far has been saved
+                BACKGROUND_TASKS[task_id].update({
+                    "status": "completed",
+                    "result": "success",
+                    "stopped_early": True,
+                    "progress": infeasibility_reason,
+                    "completed_at": time.time()
+                })
+                logger.info(f"Timetable generation stopped early: {infeasibility_reason}")
             else:
                 # Success
                 BACKGROUND_TASKS[task_id].update({
@@ -703,20 +835,72 @@ async def generate_timetable_async(task_id: str, db_path: str, toggle_prof: bool
             "progress": "Error occurred during timetable generation",
             "completed_at": time.time()
         })
+    finally:
+        TASK_STOP_EVENTS.pop(task_id, None)
 
 
 @app.get("/task_status/{task_id}")
 async def get_task_status(task_id: str, request: Request):
     """
     Get the status of a background task.
+
+    While the solver runs, "solver_progress" holds the latest phase, objective,
+    best bound, gap and elapsed time, and "solver_history" the improving
+    solutions found so far. "draft_available" tells whether /task_draft has
+    a greedy draft timetable to preview. Once the run ends, "metrics" holds the
+    per-phase solver statistics.
     """
     if not is_admin(request):
         raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
     
     if task_id not in BACKGROUND_TASKS:
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    return JSONResponse(BACKGROUND_TASKS[task_id])
+
+    # The draft can be large; it is served by /task_draft instead of on every poll
+    task = {key: value for key, value in BACKGROUND_TASKS[task_id].items() if key != "draft"}
+    task["draft_available"] = BACKGROUND_TASKS[task_id].get("draft") is not None
+    return JSONResponse(task)
+
+
+@app.get("/task_draft/{task_id}")
+async def get_task_draft(task_id: str, request: Request):
+    """
+    Returns the greedy draft timetable computed when the task was started:
+    "schedule" rows of Course ID and Scheduled Time, the sessions per course
+    it could not place ("unplaced") and its "student_clashes". The exact
+    solve replaces it once the task completes.
+    """
+    if not is_admin(request):
+        raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
+
+    if task_id not in BACKGROUND_TASKS or BACKGROUND_TASKS[task_id].get("draft") is None:
+        raise HTTPException(status_code=404, detail="Draft not found")
+
+    return JSONResponse(BACKGROUND_TASKS[task_id]["draft"])
+
+
+@app.post("/cancel_task/{task_id}")
+async def cancel_task(task_id: str, request: Request):
+    """
+    Stops a running timetable generation. The solver keeps the best schedule
+    found so far, which is saved like a normal result and flagged with
+    "stopped_early" and its optimality "gap" in the task status. A schedule
+    that does not yet meet every hard constraint is discarded instead: the
+    task fails and the saved timetable is left as it was.
+    """
+    if not is_admin(request):
+        raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
+
+    if task_id not in BACKGROUND_TASKS:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    stop_event = TASK_STOP_EVENTS.get(task_id)
+    if stop_event is None or BACKGROUND_TASKS[task_id]["status"] != "processing":
+        raise HTTPException(status_code=409, detail="Task is not running")
+
+    stop_event.set()
+    BACKGROUND_TASKS[task_id]["progress"] = "Stopping optimization and keeping the best timetable found so far..."
+    return JSONResponse({"task_id": task_id, "status": "stopping"})
 
 
 # -------------------- Page Endpoints --------------------
@@ -821,7 +1005,9 @@ async def get_admin_data(request: Request):
     db_path = request.session.get("db_path")
     if not user_info or not db_path:
         return RedirectResponse(url="/home")
-    return templates.TemplateResponse("data_entry.html", {"request": request, "user": user_info, "db_path": db_path})
+    solver_settings = get_solver_settings(db_path)
+    return templates.TemplateResponse("data_entry.html", {"request": request, "user": user_info, "db_path": db_path,
+                                                          "solver_settings": solver_settings})
 
 
 @app.get("/timetable", response_class=HTMLResponse)
@@ -916,7 +1102,11 @@ async def download_schedule_csv(request: Request):
 
 @app.post("/update_schedule")
 async def update_schedule_api(request: Request):
-    """Move a course to a different time slot."""
+    """
+    Move a course to a different time slot. Unless "repair" is false, the
+    courses around the edit are then re-optimised (see repair_timetable) and
+    the outcome is returned under "repair".
+    """
     if not is_admin(request):
         raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
 
@@ -948,10 +1138,53 @@ async def update_schedule_api(request: Request):
             data["to_end"],
             db_path,
         )
-        return JSONResponse(status_code=200, content={"message": "Schedule updated"})
+        if not data.get("repair", True):
+            return JSONResponse(status_code=200, content={"message": "Schedule updated"})
+        repair = await run_in_threadpool(repair_timetable, db_path, data["course"],
+                                         f"{data['to_day']} {data['to_start']}")
+        return JSONResponse(status_code=200, content={"message": "Schedule updated", "repair": repair})
     except Exception as e:
         return JSONResponse(status_code=500, content={"detail": str(e)})
 
+@app.post("/update_enrollments")
+async def update_enrollments_api(request: Request, student_courses_file: UploadFile = File(...)):
+    """
+    Apply a revised student registration file to the saved timetable. Only the
+    courses whose enrollment changed (and the courses they collide with) are
+    re-scheduled; see reschedule_enrollment_changes. Admin-only.
+    """
+    if not is_admin(request):
+        raise HTTPException(status_code=403, detail="Access forbidden: Admins only.")
+
+    db_path = request.session.get("db_path")
+    if not db_path:
+        raise HTTPException(status_code=422, detail="Database path not provided in session.")
+
+    if not student_courses_file.filename or not student_courses_file.filename.lower().endswith(('.csv', '.xlsx')):
+        raise HTTPException(status_code=400, detail="Please upload the student courses file as CSV or Excel.")
+    if not timetable_made(db_path):
+        raise HTTPException(status_code=404, detail="No timetable generated yet. Generate a timetable first.")
+
+    try:
+        if student_courses_file.filename.lower().endswith('.csv'):
+            student_courses = pd.read_csv(student_courses_file.file)
+        else:
+            student_courses = pd.read_excel(BytesIO(await student_courses_file.read()))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading student courses file: {str(e)}")
+    missing_columns = {"Roll No.", "G CODE"} - set(student_courses.columns)
+    if missing_columns:
+        raise HTTPException(status_code=400,
+                            detail=f"Student courses file is missing column(s): {', '.join(sorted(missing_columns))}")
+
+    try:
+        result = await run_in_threadpool(reschedule_enrollment_changes, db_path, student_courses)
+        return JSONResponse(status_code=200, content=result)
+    except Exception as e:
+        logger.error(f"Error applying enrollment changes: {e}")
+        return JSONResponse(status_code=500, content={"detail": str(e)})
+
+
 @app.get("/download-section-mapping")
 async def download_section_mapping_csv(request: Request):
     """
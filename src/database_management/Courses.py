@@ -1,4 +1,4 @@
-from .dbconnection import get_db_session, create_tables
+from .dbconnection import get_db_session, ensure_tables_exist
 from .models import User, Course, CourseProfessor
 from .migration import migrate_database_for_sections, check_migration_needed, migrate_column_rename_credits_to_classes_per_week, check_credits_column_migration_needed
 from sqlalchemy.exc import SQLAlchemyError
@@ -150,24 +150,8 @@ def insert_courses_professors(file, db_path):
         migrate_column_rename_credits_to_classes_per_week(db_path)
         print("Credits column migration completed.")
 
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                # Check if Courses table exists by querying it
-                session.execute(text("SELECT 1 FROM \"Courses\" LIMIT 1"))
-        else:
-            with get_db_session(db_path) as session:
-                # Check if Courses table exists by querying it
-                session.execute(text("SELECT 1 FROM Courses LIMIT 1"))
-    except Exception:
-        # If table doesn't exist, create all tables
-        logger.info("Courses table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
 
     # Determine which session to use
     if is_postgresql() and org_name:
@@ -1,7 +1,6 @@
-from .dbconnection import get_db_session, create_tables
+from .dbconnection import get_db_session, ensure_tables_exist
 from .models import Slot
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text
 import pandas as pd
 from dotenv import load_dotenv
 import os
@@ -41,21 +40,8 @@ def insert_time_slots(input_data, db_path):
 
     print(f"Prepared {len(slots_to_insert)} time slots for bulk insertion")
 
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                session.execute(text("SELECT 1 FROM \"Slots\" LIMIT 1"))
-        else:
-            with get_db_session(db_path) as session:
-                session.execute(text("SELECT 1 FROM Slots LIMIT 1"))
-    except Exception:
-        logger.info("Slots table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
 
     # Determine which session to use
     if is_postgresql() and org_name:
@@ -236,6 +222,21 @@ def fix_corrupted_time_slots(db_path):
             raise
 
 
+def has_corrupted_time_slots(slots):
+    """
+    Check time slots for the corruption fix_corrupted_time_slots repairs.
+    
+    :param slots: (SlotID, Day, StartTime, EndTime) tuples, as returned by fetch_slots
+    :return: True if any slot is corrupted
+    """
+    for slot_id, day, start_time, end_time in slots:
+        if (start_time == end_time or 
+            start_time in ['22:01', '23:01', '12:01', '13:01'] or
+            ':01' in start_time):
+            return True
+    return False
+
+
 def ensure_default_time_slots(db_path):
     """
     Ensure that default time slots exist in the database.
@@ -254,16 +255,7 @@ def ensure_default_time_slots(db_path):
     else:
         print(f"Found {len(slots)} existing time slots.")
         
-        # Check if any of them are corrupted
-        corrupted = False
-        for slot_id, day, start_time, end_time in slots:
-            if (start_time == end_time or 
-                start_time in ['22:01', '23:01', '12:01', '13:01'] or
-                ':01' in start_time):
-                corrupted = True
-                break
-                
-        if corrupted:
+        if has_corrupted_time_slots(slots):
             print("⚠️  Detected corrupted time slots in database!")
             fix_corrupted_time_slots(db_path)
         else:
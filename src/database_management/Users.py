@@ -1,8 +1,7 @@
 import pandas as pd
-from .dbconnection import get_db_session, create_tables, is_postgresql, get_organization_database_url
+from .dbconnection import get_db_session, ensure_tables_exist, is_postgresql, get_organization_database_url
 from .models import User
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text
 import logging
 
 logger = logging.getLogger(__name__)
@@ -81,21 +80,8 @@ def insert_user_data(list_files, db_path):
     all_users = prof_data + stud_data
     print(f"Prepared {len(all_users)} users for bulk insertion ({len(prof_data)} professors, {len(stud_data)} students)")
 
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                session.execute(text("SELECT 1 FROM \"Users\" LIMIT 1"))
-        else:
-            with get_db_session(db_path) as session:
-                session.execute(text("SELECT 1 FROM Users LIMIT 1"))
-    except Exception:
-        logger.info("Users table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
 
     # Determine which session to use
     if is_postgresql() and org_name:
@@ -1,4 +1,4 @@
-from .dbconnection import get_db_session, create_tables, is_postgresql, get_organization_database_url
+from .dbconnection import get_db_session, ensure_tables_exist, is_postgresql, get_organization_database_url
 from .models import User, Slot, ProfessorBusySlot
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import text
@@ -25,24 +25,8 @@ def insert_professor_busy_slots(file, db_path):
         if schema_name.startswith("org_"):
             org_name = schema_name[4:]  # Remove 'org_' prefix
 
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                # Check if Professor_BusySlots table exists by querying it
-                session.execute(text("SELECT 1 FROM \"Professor_BusySlots\" LIMIT 1"))
-        else:
-            with get_db_session(db_path) as session:
-                # Check if Professor_BusySlots table exists by querying it
-                session.execute(text("SELECT 1 FROM Professor_BusySlots LIMIT 1"))
-    except Exception:
-        # If table doesn't exist, create all tables
-        logger.info("Professor_BusySlots table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
 
     # Determine which session to use
     if is_postgresql() and org_name:
@@ -145,24 +129,8 @@ def empty_professor_busy_slots(db_path):
         if schema_name.startswith("org_"):
             org_name = schema_name[4:]  # Remove 'org_' prefix
     
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                # Check if Professor_BusySlots table exists by querying it
-                session.execute(text("SELECT 1 FROM \"Professor_BusySlots\" LIMIT 1"))
-        else:
-            with get_db_session(db_path) as session:
-                # Check if Professor_BusySlots table exists by querying it
-                session.execute(text("SELECT 1 FROM Professor_BusySlots LIMIT 1"))
-    except Exception:
-        # If table doesn't exist, create all tables
-        logger.info("Professor_BusySlots table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
 
     # Determine which session to use
     if is_postgresql() and org_name:
@@ -196,24 +164,8 @@ def fetch_professor_busy_slots(db_path):
         if schema_name.startswith("org_"):
             org_name = schema_name[4:]  # Remove 'org_' prefix
     
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                # Check if Professor_BusySlots table exists by querying it
-                session.execute(text("SELECT 1 FROM \"Professor_BusySlots\" LIMIT 1"))
-        else:
-            with get_db_session(db_path) as session:
-                # Check if Professor_BusySlots table exists by querying it
-                session.execute(text("SELECT 1 FROM Professor_BusySlots LIMIT 1"))
-    except Exception:
-        # If table doesn't exist, create all tables
-        logger.info("Professor_BusySlots table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
 
     # Determine which session to use
     if is_postgresql() and org_name:
@@ -247,24 +199,8 @@ def insert_professor_busy_slots_from_ui(slots, professor_id, db_path):
         if schema_name.startswith("org_"):
             org_name = schema_name[4:]  # Remove 'org_' prefix
     
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                # Check if Professor_BusySlots table exists by querying it
-                session.execute(text("SELECT 1 FROM \"Professor_BusySlots\" LIMIT 1"))
-        else:
-            with get_db_session(db_path) as session:
-                # Check if Professor_BusySlots table exists by querying it
-                session.execute(text("SELECT 1 FROM Professor_BusySlots LIMIT 1"))
-    except Exception:
-        # If table doesn't exist, create all tables
-        logger.info("Professor_BusySlots table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
 
     # Determine which session to use
     if is_postgresql() and org_name:
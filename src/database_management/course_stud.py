@@ -1,9 +1,8 @@
-from .dbconnection import get_db_session, create_tables
+from .dbconnection import get_db_session, ensure_tables_exist
 from .models import User, Course, CourseStud
 from .section_allocation import run_section_allocation, print_detailed_section_mapping, export_section_mapping_to_csv, print_section_allocation_summary
 from .migration import migrate_database_for_sections, check_migration_needed
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text
 import pandas as pd
 import numpy as np
 import logging
@@ -43,6 +42,43 @@ def find_matching_course_pattern(individual_course, course_dict):
     return None
 
 
+def parse_enrollment_code(g_code):
+    """
+    Split a registration G CODE into the course code and the section it names.
+
+    Accepted section formats are "COURSE123(Sec1)", "COURSE123(A)" and "DATA201-A".
+
+    :param g_code: G CODE from the student registration file
+    :return: (course code, section number) tuple; the section number is None when the code names none
+    """
+    section_number = None
+
+    if "(" in g_code and ")" in g_code:
+        # Extract course code and section from format like "COURSE123(Sec1)"
+        course = g_code.split("(")[0].strip()
+        section_info = g_code.split("(")[1].replace(")", "").strip()
+
+        # Extract section number if it's in format "Sec1", "Sec2", etc.
+        if section_info.startswith("Sec"):
+            try:
+                section_number = int(section_info.replace("Sec", ""))
+            except ValueError:
+                section_number = None
+        # Handle letter format like "A", "B", "C"
+        elif len(section_info) == 1 and section_info.isalpha():
+            section_number = ord(section_info.upper()) - ord('A') + 1  # Convert A->1, B->2, etc.
+    elif "-" in g_code and g_code.split("-")[-1].isalpha() and len(g_code.split("-")[-1]) == 1:
+        # Handle dash-separated format like "DATA201-A", "DATA201-B"
+        parts = g_code.split("-")
+        course = "-".join(parts[:-1])  # Everything except the last part
+        section_number = ord(parts[-1].upper()) - ord('A') + 1  # Convert section letter to number (A=1, B=2, etc.)
+    else:
+        # No section info in G CODE, use course as-is
+        course = g_code.strip()
+
+    return course, section_number
+
+
 def insert_course_students(file, db_path):
     """
     Inserts student course enrollments using bulk operations.
@@ -69,24 +105,8 @@ def insert_course_students(file, db_path):
         migrate_database_for_sections(db_path)
         print("Database migration completed.")
 
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                # Check if Course_Stud table exists by querying it
-                session.execute(text("SELECT 1 FROM \"Course_Stud\" LIMIT 1"))
-        else:
-            with get_db_session(db_path) as session:
-                # Check if Course_Stud table exists by querying it
-                session.execute(text("SELECT 1 FROM Course_Stud LIMIT 1"))
-    except Exception:
-        # If table doesn't exist, create all tables
-        logger.info("Course_Stud table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
 
     # Determine which session to use
     if is_postgresql() and org_name:
@@ -130,40 +150,8 @@ def insert_course_students(file, db_path):
                     if not student_id:
                         continue
 
-                    section_number = 1  # Default section
-
-                    # Handle section information in G CODE
-                    if "(" in g_code and ")" in g_code:
-                        # Extract course code and section from format like "COURSE123(Sec1)"
-                        course = g_code.split("(")[0].strip()
-                        section_info = g_code.split("(")[1].replace(")", "").strip()
-                        
-                        # Extract section number if it's in format "Sec1", "Sec2", etc.
-                        if section_info.startswith("Sec"):
-                            try:
-                                section_number = int(section_info.replace("Sec", ""))
-                            except ValueError:
-                                section_number = 1
-                        # Handle letter format like "A", "B", "C"
-                        elif len(section_info) == 1 and section_info.isalpha():
-                            try:
-                                section_number = ord(section_info.upper()) - ord('A') + 1  # Convert A->1, B->2, etc.
-                            except ValueError:
-                                section_number = 1
-                    elif "-" in g_code and g_code.split("-")[-1].isalpha() and len(g_code.split("-")[-1]) == 1:
-                        # Handle dash-separated format like "DATA201-A", "DATA201-B"
-                        parts = g_code.split("-")
-                        course = "-".join(parts[:-1])  # Everything except the last part
-                        section_letter = parts[-1].upper()
-                        
-                        # Convert section letter to number (A=1, B=2, etc.)
-                        try:
-                            section_number = ord(section_letter) - ord('A') + 1
-                        except ValueError:
-                            section_number = 1
-                    else:
-                        # No section info in G CODE, use course as-is
-                        course = g_code.strip()
+                    course, section_number = parse_enrollment_code(g_code)
+                    section_number = section_number or 1  # Default section
 
                     # Find matching complex course pattern in database
                     course_match = find_matching_course_pattern(course, course_dict)
@@ -391,4 +379,103 @@ def get_section_mapping_dataframe(db_path):
             
         except SQLAlchemyError as e:
             logger.error(f"Error fetching section mapping dataframe: {e}")
-            return pd.DataFrame()
\ No newline at end of file
+            return pd.DataFrame()
+
+
+def sync_course_students(file, db_path):
+    """
+    Bring Course_Stud in line with a full student registration file without touching
+    anything else, for late registrations after a timetable exists.
+
+    Enrollments missing from the file are removed and new ones are added. Students who
+    keep a course keep their section; a new enrollment goes to the section named in its
+    G CODE, or else to the emptiest section of the course. Section allocation is not
+    re-run, so existing section assignments (and the timetable built on them) stay stable.
+
+    :param file: DataFrame with 'Roll No.' and 'G CODE' columns; students must already exist in Users
+    :param db_path: Path to the database file or schema identifier
+    :return: Dictionary with "added" and "removed" lists of (roll number, course identifier), where
+             the identifier carries a section letter for multi-section courses as in the timetable
+    """
+    from .dbconnection import is_postgresql, get_organization_database_url
+
+    # Auto-detect org_name from db_path if it's a schema path
+    org_name = None
+    if db_path and db_path.startswith("schema:"):
+        schema_name = db_path.replace("schema:", "")
+        if schema_name.startswith("org_"):
+            org_name = schema_name[4:]  # Remove 'org_' prefix
+
+    # Determine which session to use
+    if is_postgresql() and org_name:
+        session_context = get_db_session(get_organization_database_url(), org_name)
+    else:
+        session_context = get_db_session(db_path)
+
+    with session_context as session:
+        try:
+            students = session.query(User).filter_by(Role='Student').all()
+            student_dict = {student.Email: student.UserID for student in students}
+            roll_numbers = {student.UserID: student.Email for student in students}
+            courses = session.query(Course).all()
+            course_dict = {course.CourseName: course.CourseID for course in courses}
+            course_by_id = {course.CourseID: course for course in courses}
+
+            def identifier(course_id, section_number):
+                course = course_by_id[course_id]
+                if (course.NumberOfSections or 1) == 1:
+                    return course.CourseName
+                return f"{course.CourseName}-{chr(ord('A') + section_number - 1)}"
+
+            # (StudentID, CourseID) -> requested section (None = any)
+            wanted = {}
+            for _, row in file[['G CODE', 'Roll No.']].dropna().iterrows():
+                student_id = student_dict.get(row['Roll No.'])
+                if not student_id:
+                    logger.warning(f"Student {row['Roll No.']} not found, enrollment skipped")
+                    continue
+                course, section_number = parse_enrollment_code(str(row['G CODE']))
+                course_match = find_matching_course_pattern(course, course_dict)
+                if not course_match:
+                    logger.warning(f"Course {course} not found in any database pattern")
+                    continue
+                wanted[(student_id, course_match[1])] = section_number
+
+            existing = {(enrollment.StudentID, enrollment.CourseID): enrollment
+                        for enrollment in session.query(CourseStud).all()}
+            section_sizes = {}
+            for (_, course_id), enrollment in existing.items():
+                key = (course_id, enrollment.SectionNumber or 1)
+                section_sizes[key] = section_sizes.get(key, 0) + 1
+
+            added, removed = [], []
+            for key, enrollment in existing.items():
+                requested = wanted.get(key, 0)
+                if key in wanted and requested in (None, enrollment.SectionNumber):
+                    continue
+                # Dropped, or moved to another section (re-added below)
+                removed.append((roll_numbers.get(key[0]), identifier(key[1], enrollment.SectionNumber or 1)))
+                section_sizes[(key[1], enrollment.SectionNumber or 1)] -= 1
+                session.delete(enrollment)
+
+            for (student_id, course_id), section_number in sorted(wanted.items()):
+                enrollment = existing.get((student_id, course_id))
+                if enrollment is not None and section_number in (None, enrollment.SectionNumber):
+                    continue
+                if section_number is None:
+                    num_sections = course_by_id[course_id].NumberOfSections or 1
+                    section_number = min(range(1, num_sections + 1),
+                                         key=lambda number: (section_sizes.get((course_id, number), 0), number))
+                section_sizes[(course_id, section_number)] = section_sizes.get((course_id, section_number), 0) + 1
+                session.flush()
+                session.add(CourseStud(StudentID=student_id, CourseID=course_id, SectionNumber=section_number))
+                added.append((roll_numbers[student_id], identifier(course_id, section_number)))
+
+            session.commit()
+            logger.info(f"Enrollment sync: {len(added)} added, {len(removed)} removed")
+            return {"added": added, "removed": removed}
+
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error syncing course-student data: {e}")
+            raise
@@ -104,6 +104,9 @@ def registration_data_with_sections(db_path):
              .filter(User.Role == 'Student')\
              .order_by(User.Email, Course.CourseName, CourseStud.SectionNumber)
             
+            # Professors of every course in one query, instead of one lookup per enrollment
+            course_professors = get_professors_by_course(session)
+            
             results = []
             for row in query.all():
                 # Create course identifier based on number of sections
@@ -120,7 +123,7 @@ def registration_data_with_sections(db_path):
                     course_identifier = f"{base_course}-{section_letter}"
                 
                 # Get professor for this specific section
-                section_prof = get_professor_for_section(session, base_course, section_num)
+                section_prof = assign_section_professor(course_professors.get(base_course, []), section_num)
                 
                 results.append({
                     'Roll No.': row._asdict()['Roll No.'],
@@ -139,6 +142,37 @@ def registration_data_with_sections(db_path):
             logger.error(f"Error fetching registration data with sections: {e}")
             return pd.DataFrame()
 
+def get_professors_by_course(session):
+    """
+    Get the professors of every course, ordered by email as get_professor_for_section orders them.
+    
+    :param session: Database session
+    :return: Dictionary mapping course names to lists of professor emails
+    """
+    query = session.query(Course.CourseName, User.Email)\
+                  .select_from(CourseProfessor)\
+                  .join(User, User.UserID == CourseProfessor.ProfessorID)\
+                  .join(Course, CourseProfessor.CourseID == Course.CourseID)\
+                  .filter(User.Role == 'Professor')\
+                  .order_by(Course.CourseName, User.Email)
+    
+    course_professors = {}
+    for row in query.all():
+        course_professors.setdefault(row.CourseName, []).append(row.Email)
+    return course_professors
+
+def assign_section_professor(professors, section_number):
+    """
+    Pick the professor of a section round-robin: section 1 -> professor 0, section 2 -> professor 1, etc.
+    
+    :param professors: Professor emails of the course, ordered by email
+    :param section_number: Section number
+    :return: Professor email or None if the course has no professors
+    """
+    if not professors:
+        return None
+    return professors[(section_number - 1) % len(professors)]
+
 def get_professor_for_section(session, course_name, section_number):
     """
     Get the professor assigned to a specific section of a course using round-robin logic.
@@ -158,13 +192,7 @@ def get_professor_for_section(session, course_name, section_number):
                       .order_by(User.Email)  # Ensure consistent ordering
         
         professors = [prof.Email for prof in query.all()]
-        
-        if not professors:
-            return None
-        
-        # Use round-robin assignment: section 1 -> prof 0, section 2 -> prof 1, etc.
-        prof_index = (section_number - 1) % len(professors)
-        return professors[prof_index]
+        return assign_section_professor(professors, section_number)
         
     except Exception as e:
         logger.error(f"Error getting professor for section {section_number} of {course_name}: {e}")
@@ -293,6 +321,7 @@ def get_all_time_slots(db_path):
             logger.error(f"Error fetching time slots: {e}")
             return []
 
+
 def get_course_professor_mapping(db_path):
     """
     Create a mapping from course to professor using SQLAlchemy.
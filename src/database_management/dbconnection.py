@@ -1,5 +1,7 @@
 import os
-from sqlalchemy import create_engine, text, MetaData
+import threading
+from collections import OrderedDict
+from sqlalchemy import create_engine, event, text, MetaData
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
 from .models import Base, MetaBase, Organization
@@ -9,6 +11,18 @@ from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+# Engines (with their connection pools) kept alive at once; the least recently used idle one is disposed beyond this
+ENGINE_REGISTRY_SIZE = int(os.getenv("DB_ENGINE_REGISTRY_SIZE", "16"))
+
+# Database URL -> engine, most recently used last; every schema of a database shares its engine
+_engine_registry = OrderedDict()
+# (database URL, schema) -> sessionmaker routed to that schema
+_session_factories = {}
+_engine_registry_lock = threading.RLock()
+
+# (database URL, schema) of the databases whose tables are known to exist in this process
+_verified_schemas = set()
+
 
 def get_database_url() -> str:
     """
@@ -147,6 +161,136 @@ def create_database_engine(db_path_or_url: str, **kwargs):
     return engine
 
 
+def _normalize_url(db_path_or_url: str) -> str:
+    if not db_path_or_url.startswith(('sqlite://', 'postgresql+psycopg2://', 'postgresql://', 'postgres://')):
+        db_path_or_url = f'sqlite:///{db_path_or_url}'
+    return db_path_or_url
+
+
+def _sync_search_path(connection):
+    """
+    Keep a pooled PostgreSQL connection's search_path on the schema its session is
+    routed to. Mapped tables are routed by schema_translate_map alone; this is for
+    raw SQL naming tables unqualified, and only costs a round trip when the pooled
+    connection last served a different schema.
+    """
+    schema_name = (connection.get_execution_options().get("schema_translate_map") or {}).get(None)
+    pooled = connection.connection
+    if pooled.info.get("search_path") == schema_name:
+        return
+    cursor = pooled.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"SET search_path TO {schema_name}, public" if schema_name else "SET search_path TO DEFAULT")
+    finally:
+        cursor.close()
+    # Commit so a later rollback does not undo the SET
+    pooled.dbapi_connection.commit()
+    pooled.info["search_path"] = schema_name
+
+
+def _registry_engine(database_url: str):
+    """
+    Shared engine for a database URL, created on first use. Creating one beyond
+    ENGINE_REGISTRY_SIZE disposes the least recently used engine that has no
+    connection checked out, together with its session factories.
+    """
+    with _engine_registry_lock:
+        engine = _engine_registry.get(database_url)
+        if engine is not None:
+            _engine_registry.move_to_end(database_url)
+            return engine
+
+        engine = create_database_engine(database_url)
+        if not database_url.startswith('sqlite://'):
+            event.listen(engine, "engine_connect", _sync_search_path)
+        _engine_registry[database_url] = engine
+
+        for old_url in list(_engine_registry):
+            if len(_engine_registry) <= ENGINE_REGISTRY_SIZE:
+                break
+            old_engine = _engine_registry[old_url]
+            if old_url == database_url or getattr(old_engine.pool, "checkedout", lambda: 0)() > 0:
+                continue
+            del _engine_registry[old_url]
+            for key in [key for key in _session_factories if key[0] == old_url]:
+                del _session_factories[key]
+            old_engine.dispose()
+            logger.info(f"Disposed idle engine for {old_url}")
+        return engine
+
+
+def get_engine(db_path_or_url: str, schema_name: str = None):
+    """
+    Get the shared engine for a database, so its connection pool survives between
+    sessions. With a schema, the engine is a view of the shared one that routes
+    unqualified tables to that schema (schema_translate_map); all schemas of a
+    database share one connection pool.
+    
+    :param db_path_or_url: Path to SQLite database file or database URL
+    :param schema_name: Schema to route tables to (None for the default)
+    :return: SQLAlchemy engine
+    """
+    engine = _registry_engine(_normalize_url(db_path_or_url))
+    if schema_name:
+        return engine.execution_options(schema_translate_map={None: schema_name})
+    return engine
+
+
+def get_session_factory(db_path_or_url: str, schema_name: str = None):
+    """
+    Get the shared sessionmaker bound to get_engine(db_path_or_url, schema_name).
+    
+    :param db_path_or_url: Path to SQLite database file or database URL
+    :param schema_name: Schema to route tables to (None for the default)
+    :return: sessionmaker
+    """
+    key = (_normalize_url(db_path_or_url), schema_name)
+    with _engine_registry_lock:
+        # Also counts as a use of the engine for LRU eviction
+        engine = get_engine(db_path_or_url, schema_name)
+        factory = _session_factories.get(key)
+        if factory is None:
+            factory = _session_factories[key] = sessionmaker(bind=engine)
+        return factory
+
+
+def dispose_engine(db_path_or_url: str, schema_name: str = None):
+    """
+    Release the pooled connections of a database, e.g. before its SQLite file is
+    deleted. With a schema (e.g. a dropped organization schema) only that schema's
+    session factory is dropped, since the pool is shared with the other schemas.
+    
+    :param db_path_or_url: Path to SQLite database file or database URL
+    :param schema_name: Schema whose session factory to drop
+    """
+    database_url = _normalize_url(db_path_or_url)
+    with _engine_registry_lock:
+        if schema_name:
+            _session_factories.pop((database_url, schema_name), None)
+            _verified_schemas.discard((database_url, schema_name))
+            return
+        engine = _engine_registry.pop(database_url, None)
+        for key in [key for key in _session_factories if key[0] == database_url]:
+            del _session_factories[key]
+        _verified_schemas.difference_update([key for key in _verified_schemas if key[0] == database_url])
+    if engine is not None:
+        engine.dispose()
+
+
+def dispose_all_engines():
+    """
+    Dispose every shared engine and close its pooled connections. Call on application shutdown.
+    """
+    with _engine_registry_lock:
+        engines = list(_engine_registry.values())
+        _engine_registry.clear()
+        _session_factories.clear()
+        _verified_schemas.clear()
+    for engine in engines:
+        engine.dispose()
+    logger.info(f"Disposed {len(engines)} database engine(s)")
+
+
 def create_schema_if_not_exists(engine, schema_name: str):
     """
     Create a schema if it doesn't exist (PostgreSQL only).
@@ -177,7 +321,7 @@ def create_tables(db_path_or_url: str, org_name: str = None):
     """
     if is_postgresql() and org_name:
         # PostgreSQL with organization schema
-        engine = create_database_engine(get_organization_database_url())
+        engine = get_engine(get_organization_database_url())
         schema_name = get_schema_for_organization(org_name)
         
         # Create schema if it doesn't exist
@@ -207,7 +351,7 @@ def create_tables(db_path_or_url: str, org_name: str = None):
                     raise
     else:
         # SQLite or PostgreSQL without organization schema
-        engine = create_database_engine(db_path_or_url)
+        engine = get_engine(db_path_or_url)
         
         max_retries = 3
         for attempt in range(max_retries):
@@ -222,8 +366,6 @@ def create_tables(db_path_or_url: str, org_name: str = None):
                 else:
                     logger.error(f"Failed to create tables after {max_retries} attempts: {e}")
                     raise
-    
-    engine.dispose()
 
 
 def create_meta_tables(meta_db_url: str = None):
@@ -235,7 +377,7 @@ def create_meta_tables(meta_db_url: str = None):
     if meta_db_url is None:
         meta_db_url = get_database_url()
     
-    engine = create_database_engine(meta_db_url)
+    engine = get_engine(meta_db_url)
     
     if is_postgresql():
         # For PostgreSQL, create a dedicated schema for meta tables
@@ -248,48 +390,75 @@ def create_meta_tables(meta_db_url: str = None):
         for table in MetaBase.metadata.tables.values():
             table.to_metadata(meta_schema_metadata, schema="meta")
         
-        try:
-            meta_schema_metadata.create_all(engine)
-            logger.info(f"Created meta-database tables: {meta_db_url}")
-        finally:
-            engine.dispose()
+        meta_schema_metadata.create_all(engine)
+        logger.info(f"Created meta-database tables: {meta_db_url}")
     else:
-        try:
-            MetaBase.metadata.create_all(engine)
-            logger.info(f"Created meta-database tables: {meta_db_url}")
-        finally:
-            engine.dispose()
+        MetaBase.metadata.create_all(engine)
+        logger.info(f"Created meta-database tables: {meta_db_url}")
+
+
+def _schema_key(db_path: str, org_name: str = None):
+    """Registry key of an organization database: (database URL, schema)."""
+    if org_name is None:
+        org_name = extract_org_name_from_db_path(db_path)
+    if is_postgresql() and org_name:
+        return _normalize_url(get_organization_database_url()), get_schema_for_organization(org_name)
+    return _normalize_url(db_path), None
+
+
+def ensure_tables_exist(db_path: str, org_name: str = None):
+    """
+    Make sure all model tables exist in an organization database. The first call
+    per database in a process runs create_tables (which only creates missing
+    tables); later calls return at once without touching the database, until
+    invalidate_schema_verification is called (e.g. by a migration).
+    
+    :param db_path: Path to the database file or schema identifier
+    :param org_name: Organization name (detected from a "schema:org_" path if None)
+    """
+    if org_name is None:
+        org_name = extract_org_name_from_db_path(db_path)
+    key = _schema_key(db_path, org_name)
+    if key in _verified_schemas:
+        return
+    if is_postgresql() and org_name:
+        create_tables(get_organization_database_url(), org_name)
+    else:
+        create_tables(db_path)
+    with _engine_registry_lock:
+        _verified_schemas.add(key)
+
+
+def invalidate_schema_verification(db_path: str, org_name: str = None):
+    """
+    Forget that a database's tables were verified, so the next ensure_tables_exist
+    checks them again. Call when tables are dropped or altered.
+    
+    :param db_path: Path to the database file or schema identifier
+    :param org_name: Organization name (detected from a "schema:org_" path if None)
+    """
+    with _engine_registry_lock:
+        _verified_schemas.discard(_schema_key(db_path, org_name))
 
 
 @contextmanager
 def get_db_session(db_path_or_url: str, org_name: str = None) -> Session:
     """
     Context manager that provides a SQLAlchemy session for the given database.
-    Automatically handles session cleanup and rollback on errors.
+    Automatically handles session cleanup and rollback on errors. Sessions come
+    from the shared engine registry, so pooled connections are reused.
     
     :param db_path_or_url: Path to SQLite database file or database URL
     :param org_name: Organization name (used for schema in PostgreSQL)
     :yield: SQLAlchemy session
     """
     if is_postgresql() and org_name:
-        # PostgreSQL with schema
-        engine = create_database_engine(get_organization_database_url())
-        schema_name = get_schema_for_organization(org_name)
-        
-        # Set the search path to include the organization schema
-        SessionLocal = sessionmaker(bind=engine)
-        session = SessionLocal()
-        
-        if schema_name:
-            try:
-                session.execute(text(f"SET search_path TO {schema_name}, public"))
-            except Exception as e:
-                logger.warning(f"Could not set search path to {schema_name}: {e}")
+        # PostgreSQL with schema: the shared engine routes tables to the organization's schema
+        SessionLocal = get_session_factory(get_organization_database_url(), get_schema_for_organization(org_name))
     else:
         # SQLite or PostgreSQL without schema
-        engine = create_database_engine(db_path_or_url)
-        SessionLocal = sessionmaker(bind=engine)
-        session = SessionLocal()
+        SessionLocal = get_session_factory(db_path_or_url)
+    session = SessionLocal()
     
     try:
         yield session
@@ -299,7 +468,6 @@ def get_db_session(db_path_or_url: str, org_name: str = None) -> Session:
         raise
     finally:
         session.close()
-        engine.dispose()
 
 
 @contextmanager
@@ -313,16 +481,8 @@ def get_meta_db_session(meta_db_url: str = None) -> Session:
     if meta_db_url is None:
         meta_db_url = get_database_url()
     
-    engine = create_database_engine(meta_db_url)
-    SessionLocal = sessionmaker(bind=engine)
-    session = SessionLocal()
-    
-    if is_postgresql():
-        # Set search path to meta schema
-        try:
-            session.execute(text("SET search_path TO meta, public"))
-        except Exception as e:
-            logger.warning(f"Could not set search path to meta schema: {e}")
+    # For PostgreSQL, tables are routed to the meta schema
+    session = get_session_factory(meta_db_url, "meta" if is_postgresql() else None)()
     
     try:
         yield session
@@ -332,7 +492,6 @@ def get_meta_db_session(meta_db_url: str = None) -> Session:
         raise
     finally:
         session.close()
-        engine.dispose()
 
 
 def get_organization_by_domain(email_domain: str, meta_db_url: str = None):
@@ -395,8 +554,9 @@ class DatabaseManager:
     def __init__(self, db_path_or_url: str, org_name: str = None):
         self.db_path_or_url = db_path_or_url
         self.org_name = org_name
-        self.engine = create_database_engine(db_path_or_url)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        schema_name = get_schema_for_organization(org_name) if is_postgresql() and org_name else None
+        self.engine = get_engine(db_path_or_url)
+        self.SessionLocal = get_session_factory(db_path_or_url, schema_name)
     
     def create_tables(self):
         """Create all tables defined in the models."""
@@ -419,17 +579,7 @@ class DatabaseManager:
     
     def get_session(self) -> Session:
         """Get a new database session."""
-        session = self.SessionLocal()
-        
-        if is_postgresql() and self.org_name:
-            schema_name = get_schema_for_organization(self.org_name)
-            if schema_name:
-                try:
-                    session.execute(text(f"SET search_path TO {schema_name}, public"))
-                except Exception as e:
-                    logger.warning(f"Could not set search path to {schema_name}: {e}")
-        
-        return session
+        return self.SessionLocal()
     
     @contextmanager
     def session_scope(self):
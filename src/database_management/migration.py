@@ -1,6 +1,6 @@
 import sqlite3
 import logging
-from .dbconnection import get_db_session, is_postgresql, get_organization_database_url
+from .dbconnection import get_db_session, is_postgresql, get_organization_database_url, invalidate_schema_verification
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -21,6 +21,9 @@ def migrate_database_for_sections(db_path):
         if schema_name.startswith("org_"):
             org_name = schema_name[4:]  # Remove 'org_' prefix
     
+    # The tables change shape, so they are verified again on next use
+    invalidate_schema_verification(db_path, org_name)
+    
     # For PostgreSQL, we need to handle migrations differently
     if is_postgresql():
         logger.info(f"Starting PostgreSQL migration for schema: {db_path}")
@@ -451,6 +454,9 @@ def migrate_column_rename_credits_to_classes_per_week(db_path):
         if schema_name.startswith("org_"):
             org_name = schema_name[4:]  # Remove 'org_' prefix
     
+    # The tables change shape, so they are verified again on next use
+    invalidate_schema_verification(db_path, org_name)
+    
     # For PostgreSQL, we need to handle migrations differently
     if is_postgresql():
         logger.info(f"Starting PostgreSQL column rename migration for schema: {db_path}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, Float, String, Text, ForeignKey, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -130,4 +130,14 @@ class Settings(Base):
     
     __table_args__ = (
         UniqueConstraint('SettingKey'),
-    ) 
\ No newline at end of file
+    )
+
+
+class ScheduleCache(Base):
+    __tablename__ = 'Schedule_Cache'
+
+    CacheKey = Column(String(64), primary_key=True)  # SHA-256 of the canonical problem instance
+    Payload = Column(Text, nullable=False)  # JSON: schedule, conflicts, message and metrics
+    CreatedAt = Column(Float, nullable=False)  # Unix time the result was stored
+    LastUsedAt = Column(Float, nullable=False)  # Unix time of the last hit, for LRU eviction
+    HitCount = Column(Integer, default=0)
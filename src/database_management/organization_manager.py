@@ -4,7 +4,8 @@ from .dbconnection import (
     create_tables,
     is_postgresql,
     get_organization_database_url,
-    get_schema_for_organization
+    get_schema_for_organization,
+    dispose_engine
 )
 from .models import Organization, User
 from sqlalchemy.exc import SQLAlchemyError
@@ -332,8 +333,10 @@ def delete_organization(org_name, admin_email, confirmation_token=None):
             with get_db_session(get_organization_database_url()) as session:
                 session.execute(text(f'DROP SCHEMA IF EXISTS "{schema_name}" CASCADE'))
                 session.commit()
+            dispose_engine(get_organization_database_url(), schema_name)
         else:
-            # For SQLite, delete the database file
+            # For SQLite, close the pooled connections and delete the database file
+            dispose_engine(org.DatabasePath)
             if os.path.exists(org.DatabasePath):
                 os.remove(org.DatabasePath)
         
@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.orm import aliased
+
+from .dbconnection import get_db_session, is_postgresql, get_organization_database_url
+from .models import User, Course, CourseStud, CourseProfessor, Slot, ProfessorBusySlot, Settings
+from .database_retrieval import assign_section_professor
+from .settings_manager import parse_setting_value, solver_settings_from_values
+from .Slot_info import has_corrupted_time_slots
+from ..slot_catalog import SlotCatalog
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def section_identifier(course_name, section_number, number_of_sections):
+    """
+    Course identifier the solver uses: the course name for single-section courses,
+    course-A, course-B, ... for the sections of multi-section courses.
+
+    :param course_name: Name of the course
+    :param section_number: Section number (1-based)
+    :param number_of_sections: Number of sections of the course
+    :return: Course identifier
+    """
+    if number_of_sections == 1:
+        return course_name
+    return f"{course_name}-{chr(ord('A') + section_number - 1)}"
+
+
+@dataclass(frozen=True)
+class ProblemSnapshot:
+    """
+    Immutable copy of every table row timetable generation reads, taken in one
+    session and one read transaction (see load_problem_snapshot), so the solver
+    pipeline works on a consistent view without further database round trips.
+
+    The registration_data*, faculty_pref and get_course_section_professor_mapping
+    methods return what the database_retrieval functions of the same name return.
+
+    Attributes:
+        settings (tuple): (SettingKey, parsed value) pairs.
+        courses (tuple): (CourseID, CourseName, CourseType, ClassesPerWeek, NumberOfSections) rows.
+        course_professors (tuple): (CourseID, professor email, SectionNumber) rows.
+        enrollments (tuple): (student email, CourseID, SectionNumber) rows.
+        busy_slots (tuple): (professor email, "Day StartTime") rows.
+        slots (tuple): (SlotID, Day, StartTime, EndTime) rows, ordered by day and start time.
+        slot_catalog (SlotCatalog): Integer-indexed view of the slots.
+    """
+    settings: Tuple[Tuple[str, object], ...]
+    courses: Tuple[Tuple[int, str, Optional[str], Optional[int], Optional[int]], ...]
+    course_professors: Tuple[Tuple[int, str, int], ...]
+    enrollments: Tuple[Tuple[str, int, int], ...]
+    busy_slots: Tuple[Tuple[str, str], ...]
+    slots: Tuple[Tuple[int, str, str, str], ...]
+    slot_catalog: SlotCatalog
+
+    def setting(self, setting_key, default_value=None):
+        """Parsed value of a setting, or default_value if it is not stored."""
+        return dict(self.settings).get(setting_key, default_value)
+
+    @property
+    def max_classes_per_slot(self):
+        return self.setting("max_classes_per_slot", 24)
+
+    def solver_settings(self):
+        """CP-SAT search parameters, as get_solver_settings returns them."""
+        return solver_settings_from_values(dict(self.settings))
+
+    @property
+    def needs_default_time_slots(self):
+        """True if ensure_default_time_slots would insert or repair time slots."""
+        return not self.slots or has_corrupted_time_slots(self.slots)
+
+    @property
+    def has_multi_section_courses(self):
+        return any((number_of_sections or 1) > 1 for _, _, _, _, number_of_sections in self.courses)
+
+    def _course_professor_emails(self):
+        """CourseID -> professor emails, one per Course_Professor row, sorted."""
+        emails = {}
+        for course_id, email, _ in self.course_professors:
+            emails.setdefault(course_id, []).append(email)
+        return {course_id: sorted(course_emails) for course_id, course_emails in emails.items()}
+
+    def registration_data(self):
+        """Student enrollments with the comma-separated professors of each course."""
+        courses = {row[0]: row for row in self.courses}
+        professors = self._course_professor_emails()
+        rows = []
+        for email, course_id, _ in sorted(self.enrollments, key=lambda row: (row[0], courses[row[1]][1])):
+            if course_id not in professors:
+                continue
+            _, course_name, course_type, classes_per_week, _ = courses[course_id]
+            rows.append({'Roll No.': email, 'G CODE': course_name,
+                         'Professor': ",".join(dict.fromkeys(professors[course_id])),
+                         'Type': course_type, 'Classes Per Week': classes_per_week})
+        return pd.DataFrame(rows)
+
+    def registration_data_with_sections(self):
+        """Student enrollments per course section, with the section's round-robin professor."""
+        courses = {row[0]: row for row in self.courses}
+        professors = self._course_professor_emails()
+        rows = []
+        for email, course_id, section_number in sorted(
+                self.enrollments, key=lambda row: (row[0], courses[row[1]][1], row[2])):
+            _, course_name, course_type, classes_per_week, number_of_sections = courses[course_id]
+            rows.append({
+                'Roll No.': email,
+                'G CODE': section_identifier(course_name, section_number, number_of_sections),
+                'BaseCourse': course_name,
+                'SectionNumber': section_number,
+                'Professor': assign_section_professor(professors.get(course_id), section_number),
+                'Type': course_type,
+                'Classes Per Week': classes_per_week,
+                'NumberOfSections': number_of_sections
+            })
+        return pd.DataFrame(rows)
+
+    def faculty_pref(self):
+        """Professor busy slots as a DataFrame with 'Name' and 'Busy Slot' columns (also when there are none)."""
+        return pd.DataFrame(list(self.busy_slots), columns=['Name', 'Busy Slot'])
+
+    def get_course_section_professor_mapping(self):
+        """Course-section identifier -> professor email."""
+        courses = {row[0]: row for row in self.courses}
+        mapping = {}
+        for course_id, email, section_number in sorted(
+                self.course_professors, key=lambda row: (courses[row[0]][1], row[2], row[1])):
+            _, course_name, _, _, number_of_sections = courses[course_id]
+            mapping[section_identifier(course_name, section_number, number_of_sections)] = email
+        return mapping
+
+
+def load_problem_snapshot(db_path):
+    """
+    Read everything timetable generation needs in one session and one read
+    transaction: settings, courses with their professors and sections, student
+    enrollments, professor busy slots and time slots. PostgreSQL reads run in a
+    REPEATABLE READ transaction; SQLite holds its shared lock across the reads.
+
+    :param db_path: Path to the database file or schema identifier
+    :return: ProblemSnapshot
+    """
+    # Auto-detect org_name from db_path if it's a schema path
+    org_name = None
+    if db_path and db_path.startswith("schema:"):
+        schema_name = db_path.replace("schema:", "")
+        if schema_name.startswith("org_"):
+            org_name = schema_name[4:]  # Remove 'org_' prefix
+
+    # Determine which session to use
+    if is_postgresql() and org_name:
+        session_context = get_db_session(get_organization_database_url(), org_name)
+    else:
+        session_context = get_db_session(db_path)
+
+    with session_context as session:
+        # Every read below sees the same committed state
+        if is_postgresql():
+            session.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"))
+        else:
+            session.execute(text("BEGIN"))
+
+        Student = aliased(User)
+        Professor = aliased(User)
+        settings = tuple((row.SettingKey, parse_setting_value(row.SettingValue))
+                         for row in session.query(Settings.SettingKey, Settings.SettingValue))
+        courses = tuple((row.CourseID, row.CourseName, row.CourseType, row.ClassesPerWeek, row.NumberOfSections)
+                        for row in session.query(Course.CourseID, Course.CourseName, Course.CourseType,
+                                                 Course.ClassesPerWeek, Course.NumberOfSections))
+        course_professors = tuple(
+            (row.CourseID, row.Email, row.SectionNumber)
+            for row in session.query(CourseProfessor.CourseID, Professor.Email, CourseProfessor.SectionNumber)
+                              .join(Professor, CourseProfessor.ProfessorID == Professor.UserID)
+                              .filter(Professor.Role == 'Professor'))
+        enrollments = tuple(
+            (row.Email, row.CourseID, row.SectionNumber)
+            for row in session.query(Student.Email, CourseStud.CourseID, CourseStud.SectionNumber)
+                              .join(Student, CourseStud.StudentID == Student.UserID)
+                              .filter(Student.Role == 'Student'))
+        busy_slots = tuple(
+            (row.Email, f"{row.Day} {row.StartTime}")
+            for row in session.query(Professor.Email, Slot.Day, Slot.StartTime)
+                              .select_from(ProfessorBusySlot)
+                              .join(Professor, ProfessorBusySlot.ProfessorID == Professor.UserID)
+                              .join(Slot, ProfessorBusySlot.SlotID == Slot.SlotID)
+                              .filter(Professor.Role == 'Professor')
+                              .order_by(Professor.Email, Slot.Day, Slot.StartTime))
+        slot_rows = session.query(Slot).order_by(Slot.Day, Slot.StartTime).all()
+        slots = tuple((slot.SlotID, slot.Day, slot.StartTime, slot.EndTime) for slot in slot_rows)
+        slot_catalog = SlotCatalog.from_slot_rows(slot_rows)
+
+    logger.info(f"Loaded problem snapshot: {len(courses)} courses, {len(enrollments)} enrollments, "
+                f"{len(slots)} time slots")
+    return ProblemSnapshot(settings, courses, course_professors, enrollments, busy_slots, slots, slot_catalog)
@@ -0,0 +1,160 @@
+from .dbconnection import (
+    get_db_session,
+    ensure_tables_exist,
+    is_postgresql,
+    get_organization_database_url
+)
+from .models import ScheduleCache
+from .settings_manager import get_org_name_from_path
+from sqlalchemy.exc import SQLAlchemyError
+import hashlib
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Cached timetables kept per organization; the least recently used go first
+RESULT_CACHE_MAX_ENTRIES = 20
+
+# Cached timetables older than this are never reused
+RESULT_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+
+def _canonical(value):
+    """
+    Canonical JSON-ready form of a problem instance: dictionary keys are sorted
+    and every list, tuple or set is sorted too, since no sequence in a
+    timetabling instance (enrolled courses, professors, time slots) is ordered.
+    """
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in sorted(value.items(), key=lambda pair: str(pair[0]))}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canonical(item) for item in value]
+        return sorted(items, key=lambda item: json.dumps(item, sort_keys=True))
+    if hasattr(value, "item"):
+        # numpy / pandas scalars
+        return value.item()
+    return value
+
+
+def problem_fingerprint(problem):
+    """
+    SHA-256 of the canonical form of a problem instance. Two instances get the
+    same fingerprint exactly when they hold the same data, whatever the order
+    it was loaded in.
+
+    :param problem: JSON-compatible description of the instance and its settings
+    :return: 64-character hex digest
+    """
+    canonical = json.dumps(_canonical(problem), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _cache_session(db_path, org_name=None):
+    """
+    Session for the organization database, creating the tables first if the
+    cache table is missing (databases created before the cache existed).
+    """
+    if org_name is None:
+        org_name = get_org_name_from_path(db_path)
+
+    ensure_tables_exist(db_path, org_name)
+
+    if is_postgresql() and org_name:
+        return get_db_session(get_organization_database_url(), org_name)
+    return get_db_session(db_path)
+
+
+def get_cached_result(db_path, cache_key, ttl_seconds=RESULT_CACHE_TTL_SECONDS, org_name=None):
+    """
+    Look up a cached timetable and mark it as recently used.
+
+    :param db_path: Path to the database file or schema identifier
+    :param cache_key: Fingerprint from problem_fingerprint
+    :param ttl_seconds: Entries older than this are dropped instead of returned
+    :param org_name: Organization name (required for PostgreSQL)
+    :return: The stored payload dictionary, or None on a miss
+    """
+    with _cache_session(db_path, org_name) as session:
+        try:
+            entry = session.query(ScheduleCache).filter_by(CacheKey=cache_key).first()
+            if entry is None:
+                return None
+            now = time.time()
+            if now - entry.CreatedAt > ttl_seconds:
+                session.delete(entry)
+                session.commit()
+                logger.info(f"Cached timetable {cache_key[:12]} expired")
+                return None
+            entry.LastUsedAt = now
+            entry.HitCount = (entry.HitCount or 0) + 1
+            payload = json.loads(entry.Payload)
+            session.commit()
+            return payload
+        except (SQLAlchemyError, ValueError) as e:
+            session.rollback()
+            logger.error(f"Error reading cached timetable {cache_key[:12]}: {e}")
+            return None
+
+
+def store_cached_result(db_path, cache_key, payload, max_entries=RESULT_CACHE_MAX_ENTRIES,
+                        ttl_seconds=RESULT_CACHE_TTL_SECONDS, org_name=None):
+    """
+    Store a timetable under its fingerprint, then evict expired entries and the
+    least recently used ones beyond max_entries. A failure only logs an error;
+    the cache is never allowed to break timetable generation.
+
+    :param db_path: Path to the database file or schema identifier
+    :param cache_key: Fingerprint from problem_fingerprint
+    :param payload: JSON-serializable result (schedule, conflicts, message, metrics)
+    :param max_entries: Maximum number of cached timetables to keep
+    :param ttl_seconds: Entries older than this are evicted
+    :param org_name: Organization name (required for PostgreSQL)
+    """
+    with _cache_session(db_path, org_name) as session:
+        try:
+            now = time.time()
+            entry = session.query(ScheduleCache).filter_by(CacheKey=cache_key).first()
+            if entry is None:
+                session.add(ScheduleCache(CacheKey=cache_key, Payload=json.dumps(payload),
+                                          CreatedAt=now, LastUsedAt=now, HitCount=0))
+            else:
+                entry.Payload = json.dumps(payload)
+                entry.CreatedAt = now
+                entry.LastUsedAt = now
+            session.flush()
+
+            evicted = session.query(ScheduleCache).filter(ScheduleCache.CreatedAt < now - ttl_seconds).delete()
+            stale = (session.query(ScheduleCache.CacheKey)
+                     .order_by(ScheduleCache.LastUsedAt.desc())
+                     .offset(max_entries).all())
+            if stale:
+                evicted += (session.query(ScheduleCache)
+                            .filter(ScheduleCache.CacheKey.in_([key for key, in stale]))
+                            .delete(synchronize_session=False))
+            session.commit()
+            if evicted:
+                logger.info(f"Evicted {evicted} cached timetable(s)")
+        except (SQLAlchemyError, TypeError, ValueError) as e:
+            session.rollback()
+            logger.error(f"Error caching timetable {cache_key[:12]}: {e}")
+
+
+def clear_result_cache(db_path, org_name=None):
+    """
+    Remove every cached timetable of the organization.
+
+    :param db_path: Path to the database file or schema identifier
+    :param org_name: Organization name (required for PostgreSQL)
+    :return: Number of entries removed
+    """
+    with _cache_session(db_path, org_name) as session:
+        try:
+            removed = session.query(ScheduleCache).delete()
+            session.commit()
+            return removed
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Error clearing timetable cache: {e}")
+            return 0
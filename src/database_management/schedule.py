@@ -1,8 +1,8 @@
-from .dbconnection import get_db_session, create_tables
+from .dbconnection import get_db_session, ensure_tables_exist
 from .models import Course, Slot, Schedule, User, CourseStud, CourseProfessor
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
-from sqlalchemy import func, case, text
+from sqlalchemy import func, case
 import pandas as pd
 import datetime
 import logging
@@ -26,12 +26,14 @@ def remove_seconds(time_str):
         return time_str
 
 
-def schedule(schedule_df, db_path):
+def schedule(schedule_df, db_path, slot_catalog=None):
     """
     Insert schedule data into the database using SQLAlchemy.
     
     :param schedule_df: DataFrame containing schedule information
     :param db_path: Path to the database file or schema identifier
+    :param slot_catalog: Optional SlotCatalog the schedule was built with; its SlotIDs
+                         are used directly instead of re-reading and re-parsing the slots
     """
     print("Inserting schedule data:")
     print(schedule_df)
@@ -45,24 +47,8 @@ def schedule(schedule_df, db_path):
         if schema_name.startswith("org_"):
             org_name = schema_name[4:]  # Remove 'org_' prefix
     
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                # Check if Schedule table exists by querying it
-                session.execute(text("SELECT 1 FROM \"Schedule\" LIMIT 1"))
-        else:
-            with get_db_session(db_path) as session:
-                # Check if Schedule table exists by querying it
-                session.execute(text("SELECT 1 FROM Schedule LIMIT 1"))
-    except Exception:
-        # If table doesn't exist, create all tables
-        logger.info("Schedule table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
     
     # Determine which session to use
     if is_postgresql() and org_name:
@@ -77,18 +63,25 @@ def schedule(schedule_df, db_path):
             course_id_map = {course.CourseName: course.CourseID for course in courses}
 
             # Fetch time slots - create mapping for "Day HH:MM" format
-            slots = session.query(Slot).all()
             slot_id_map = {}
-            for slot in slots:
-                time_key = f"{slot.Day} {slot.StartTime}"
-                slot_id_map[time_key] = slot.SlotID
-            
-            print("Available time slots in database:", list(slot_id_map.keys()))
+            if slot_catalog is None:
+                slots = session.query(Slot).all()
+                for slot in slots:
+                    time_key = f"{slot.Day} {slot.StartTime}"
+                    slot_id_map[time_key] = slot.SlotID
+                
+                print("Available time slots in database:", list(slot_id_map.keys()))
             
             for index, row in schedule_df.iterrows():
-                # Remove seconds using our helper function
-                formatted_time = remove_seconds(row['Scheduled Time'])
-                print(f"Row {index}: original='{row['Scheduled Time']}', formatted='{formatted_time}'")
+                if slot_catalog is not None:
+                    # Labels come straight from the catalog, which already knows their SlotIDs
+                    formatted_time = row['Scheduled Time']
+                    slot_id = slot_catalog.db_id_of(formatted_time)
+                else:
+                    # Remove seconds using our helper function
+                    formatted_time = remove_seconds(row['Scheduled Time'])
+                    print(f"Row {index}: original='{row['Scheduled Time']}', formatted='{formatted_time}'")
+                    slot_id = slot_id_map.get(formatted_time)
 
                 # Parse course identifier to extract base course and section number
                 course_identifier = row['Course ID']
@@ -109,7 +102,6 @@ def schedule(schedule_df, db_path):
                     section_number = 1
                 
                 course_id = course_id_map.get(base_course_name)
-                slot_id = slot_id_map.get(formatted_time)
                 
                 if course_id and slot_id:
                     # Check if schedule entry already exists
@@ -159,25 +151,8 @@ def timetable_made(db_path):
         if schema_name.startswith("org_"):
             org_name = schema_name[4:]  # Remove 'org_' prefix
     
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                # Check if Schedule table exists by querying it
-                session.execute(text("SELECT 1 FROM \"Schedule\" LIMIT 1"))
-        else:
-            with get_db_session(db_path) as session:
-                # Check if Schedule table exists by querying it
-                session.execute(text("SELECT 1 FROM Schedule LIMIT 1"))
-    except Exception:
-        # If table doesn't exist, create all tables
-        logger.info("Schedule table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-            create_tables(db_path)
-        logger.info("Tables created successfully")
-        return False  # No timetable exists yet
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
     
     # Check if there are any schedule entries
     if is_postgresql() and org_name:
@@ -419,6 +394,24 @@ def get_student_schedule(roll_number, db_path):
     schedule_data = get_schedule_for_courses(course_ids, db_path)
     return schedule_data
 
+def parse_course_identifier(identifier):
+    """
+    Split a course identifier such as "DATA201-A" into its base course name and section number.
+
+    :param identifier: Course name, optionally followed by "-" and a section letter
+    :return: Tuple of (base course name, section number)
+    """
+    section_number = 1
+    base_name = identifier
+    if "-" in identifier and identifier.split("-")[-1].isalpha():
+        parts = identifier.split("-")
+        base_name = "-".join(parts[:-1])
+        letter = parts[-1]
+        if len(letter) == 1 and letter.isalpha():
+            section_number = ord(letter.upper()) - ord("A") + 1
+    return base_name, section_number
+
+
 def update_course_slot(course_identifier, from_day, from_start, from_end,
                        to_day, to_start, to_end, db_path):
     """Move a course from one slot to another."""
@@ -437,20 +430,9 @@ def update_course_slot(course_identifier, from_day, from_start, from_end,
     else:
         session_context = get_db_session(db_path)
 
-    def parse_course(identifier: str):
-        section_number = 1
-        base_name = identifier
-        if "-" in identifier and identifier.split("-")[-1].isalpha():
-            parts = identifier.split("-")
-            base_name = "-".join(parts[:-1])
-            letter = parts[-1]
-            if len(letter) == 1 and letter.isalpha():
-                section_number = ord(letter.upper()) - ord("A") + 1
-        return base_name, section_number
-
     with session_context as session:
         try:
-            base_course, section_number = parse_course(course_identifier)
+            base_course, section_number = parse_course_identifier(course_identifier)
 
             course = session.query(Course).filter_by(CourseName=base_course).first()
             if not course:
@@ -489,4 +471,98 @@ def update_course_slot(course_identifier, from_day, from_start, from_end,
         except Exception as e:
             session.rollback()
             logger.error(f"Error updating course slot: {e}")
-            raise 
\ No newline at end of file
+            raise 
+
+
+def get_scheduled_slots(db_path):
+    """
+    Read the saved timetable as course identifier -> time slots.
+
+    :param db_path: Path to the database file or schema identifier
+    :return: Dictionary mapping course identifiers (with a section letter for
+             multi-section courses) to lists of "Day HH:MM" labels
+    """
+    from .dbconnection import is_postgresql, get_organization_database_url
+
+    # Auto-detect org_name from db_path if it's a schema path
+    org_name = None
+    if db_path and db_path.startswith("schema:"):
+        schema_name = db_path.replace("schema:", "")
+        if schema_name.startswith("org_"):
+            org_name = schema_name[4:]  # Remove 'org_' prefix
+
+    # Determine which session to use
+    if is_postgresql() and org_name:
+        session_context = get_db_session(get_organization_database_url(), org_name)
+    else:
+        session_context = get_db_session(db_path)
+
+    with session_context as session:
+        try:
+            rows = session.query(
+                Course.CourseName,
+                Course.NumberOfSections,
+                Schedule.SectionNumber,
+                Slot.Day,
+                Slot.StartTime
+            ).select_from(Schedule)\
+             .join(Course, Schedule.CourseID == Course.CourseID)\
+             .join(Slot, Schedule.SlotID == Slot.SlotID).all()
+
+            scheduled = {}
+            for row in rows:
+                if (row.NumberOfSections or 1) == 1:
+                    course_identifier = row.CourseName
+                else:
+                    course_identifier = f"{row.CourseName}-{chr(ord('A') + row.SectionNumber - 1)}"
+                scheduled.setdefault(course_identifier, []).append(remove_seconds(f"{row.Day} {row.StartTime}"))
+            return scheduled
+        except SQLAlchemyError as e:
+            logger.error(f"Error fetching scheduled slots: {e}")
+            return {}
+
+
+def replace_course_schedule(course_slots, db_path, slot_catalog):
+    """
+    Replace the saved time slots of the given courses in one transaction,
+    leaving every other course untouched.
+
+    :param course_slots: Dictionary mapping course identifiers to their new "Day HH:MM" labels
+    :param db_path: Path to the database file or schema identifier
+    :param slot_catalog: SlotCatalog used to find the SlotIDs of the labels
+    """
+    from .dbconnection import is_postgresql, get_organization_database_url
+
+    # Auto-detect org_name from db_path if it's a schema path
+    org_name = None
+    if db_path and db_path.startswith("schema:"):
+        schema_name = db_path.replace("schema:", "")
+        if schema_name.startswith("org_"):
+            org_name = schema_name[4:]  # Remove 'org_' prefix
+
+    # Determine which session to use
+    if is_postgresql() and org_name:
+        session_context = get_db_session(get_organization_database_url(), org_name)
+    else:
+        session_context = get_db_session(db_path)
+
+    with session_context as session:
+        try:
+            course_id_map = {course.CourseName: course.CourseID for course in session.query(Course).all()}
+            for course_identifier, labels in course_slots.items():
+                base_course, section_number = parse_course_identifier(course_identifier)
+                course_id = course_id_map.get(base_course)
+                if course_id is None:
+                    raise ValueError(f"Course not found: {course_identifier}")
+                session.query(Schedule).filter_by(CourseID=course_id, SectionNumber=section_number).delete()
+                for label in labels:
+                    slot_id = slot_catalog.db_id_of(label)
+                    if slot_id is None:
+                        raise ValueError(f"Unknown time slot: {label}")
+                    session.add(Schedule(CourseID=course_id, SlotID=slot_id, SectionNumber=section_number))
+            session.commit()
+            logger.info(f"Replaced the schedule of {len(course_slots)} course(s)")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error replacing course schedule: {e}")
+            raise
@@ -1,12 +1,11 @@
 from .dbconnection import (
     get_db_session, 
-    create_tables, 
+    ensure_tables_exist, 
     is_postgresql, 
     get_organization_database_url
 )
 from .models import Settings
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,6 +28,29 @@ def get_org_name_from_path(db_path):
     return None
 
 
+def parse_setting_value(value):
+    """
+    Convert a stored setting value to int or float where possible.
+    
+    :param value: SettingValue as stored in the Settings table
+    :return: int, float or the unchanged string
+    """
+    # Try to convert to int if possible
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    
+    # Try to convert to float if possible
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    
+    # Return as string
+    return value
+
+
 def get_setting(db_path, setting_key, default_value=None, org_name=None):
     """
     Get a setting value from the database.
@@ -43,23 +65,8 @@ def get_setting(db_path, setting_key, default_value=None, org_name=None):
     if org_name is None:
         org_name = get_org_name_from_path(db_path)
     
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                session.execute(text("SELECT 1 FROM \"Settings\" LIMIT 1"))
-        else:
-
-            with get_db_session(db_path) as session:
-                session.execute(text("SELECT 1 FROM Settings LIMIT 1"))
-    except Exception:
-        logger.info("Settings table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
     
     # Determine which session to use
     if is_postgresql() and org_name:
@@ -71,23 +78,7 @@ def get_setting(db_path, setting_key, default_value=None, org_name=None):
         try:
             setting = session.query(Settings).filter_by(SettingKey=setting_key).first()
             if setting:
-                # Try to convert to appropriate type
-                value = setting.SettingValue
-                
-                # Try to convert to int if possible
-                try:
-                    return int(value)
-                except ValueError:
-                    pass
-                
-                # Try to convert to float if possible
-                try:
-                    return float(value)
-                except ValueError:
-                    pass
-                
-                # Return as string
-                return value
+                return parse_setting_value(setting.SettingValue)
             else:
                 return default_value
         except SQLAlchemyError as e:
@@ -109,23 +100,8 @@ def set_setting(db_path, setting_key, setting_value, description=None, org_name=
     if org_name is None:
         org_name = get_org_name_from_path(db_path)
     
-    # First, ensure tables exist
-    try:
-        if is_postgresql() and org_name:
-            with get_db_session(get_organization_database_url(), org_name) as session:
-                session.execute(text("SELECT 1 FROM \"Settings\" LIMIT 1"))
-        else:
-
-            with get_db_session(db_path) as session:
-                session.execute(text("SELECT 1 FROM Settings LIMIT 1"))
-    except Exception:
-        logger.info("Settings table not found, creating tables...")
-        if is_postgresql() and org_name:
-            create_tables(get_organization_database_url(), org_name)
-        else:
-
-            create_tables(db_path)
-        logger.info("Tables created successfully")
+    # Create the tables on first use of this database in the process
+    ensure_tables_exist(db_path, org_name)
     
     # Determine which session to use
     if is_postgresql() and org_name:
@@ -184,6 +160,67 @@ def set_max_classes_per_slot(db_path, max_classes, org_name=None):
                 "Maximum number of classes allowed per time slot", org_name)
 
 
+# CP-SAT search parameters an admin can pin per organization.
+# Keys map to the solver parameter names used by schedule_courses.
+SOLVER_SETTING_KEYS = {
+    "solver_max_time_seconds": "max_time_in_seconds",
+    "solver_num_workers": "num_workers",
+    "solver_relative_gap_limit": "relative_gap_limit",
+    "solver_random_seed": "random_seed",
+    "solver_linearization_level": "linearization_level",
+    "solver_log_search_progress": "log_search_progress",
+}
+
+# Stored value meaning "let the solver auto-tune this parameter"
+SOLVER_SETTING_AUTO = "auto"
+
+
+def get_solver_settings(db_path, org_name=None):
+    """
+    Get the CP-SAT search parameters configured for the organization.
+    
+    :param db_path: Path to the database file or schema identifier
+    :param org_name: Organization name (required for PostgreSQL)
+    :return: Dictionary of solver parameter name -> value, None where auto-tuned
+    """
+    return solver_settings_from_values({setting_key: get_setting(db_path, setting_key, None, org_name)
+                                        for setting_key in SOLVER_SETTING_KEYS})
+
+
+def solver_settings_from_values(values):
+    """
+    Map stored solver setting values to CP-SAT parameter names.
+    
+    :param values: Dictionary of setting key -> parsed value (missing keys are auto-tuned)
+    :return: Dictionary of solver parameter name -> value, None where auto-tuned
+    """
+    solver_settings = {}
+    for setting_key, param_name in SOLVER_SETTING_KEYS.items():
+        value = values.get(setting_key)
+        if value == SOLVER_SETTING_AUTO or value == "":
+            value = None
+        solver_settings[param_name] = value
+    return solver_settings
+
+
+def set_solver_settings(db_path, solver_settings, org_name=None):
+    """
+    Store CP-SAT search parameters for the organization.
+    
+    :param db_path: Path to the database file or schema identifier
+    :param solver_settings: Dictionary of solver parameter name -> value (None to auto-tune)
+    :param org_name: Organization name (required for PostgreSQL)
+    """
+    for setting_key, param_name in SOLVER_SETTING_KEYS.items():
+        if param_name not in solver_settings:
+            continue
+        value = solver_settings[param_name]
+        set_setting(db_path, setting_key,
+                    SOLVER_SETTING_AUTO if value is None else value,
+                    f"CP-SAT parameter {param_name} ('{SOLVER_SETTING_AUTO}' = tuned from instance size)",
+                    org_name)
+
+
 def initialize_default_settings(db_path, org_name=None):
     """
     Initialize default settings in the database.
@@ -0,0 +1,162 @@
+import heapq
+import pandas as pd
+from typing import Dict, List, Union
+from collections import defaultdict
+from itertools import combinations
+
+from .slot_catalog import SlotCatalog, courses_to_slot_ids
+
+
+def dsatur_schedule(courses: Dict[str, Dict[str, list]],
+                    student_course_map: Dict[str, List[str]],
+                    course_professor_map: Dict[str, Union[str, List[str]]],
+                    course_classes_per_week: Dict[str, int],
+                    add_prof_constraints: bool = True,
+                    add_timeslot_capacity: bool = True,
+                    add_no_same_day: bool = True,
+                    max_classes_per_slot: int = 24,
+                    non_preferred_slots: List[str] = None,
+                    slot_catalog: SlotCatalog = None) -> dict:
+    """
+    Greedy DSatur-style timetable: course sessions are the vertices of a
+    conflict graph and time slots are the colours.
+
+    Courses that share a professor may never take the same slot, a full slot
+    is closed to everyone, and with add_no_same_day a placed session closes
+    the rest of its day to the course. The next session placed is always one
+    of the course with the least room left (free slots minus sessions still
+    to place), ties going to the course with the most conflicts, which is
+    DSatur's "most saturated vertex first" rule on a graph whose colour lists
+    differ per vertex. Each session takes the free slot that clashes with the
+    fewest co-enrolled students, then avoids non-preferred slots, then picks
+    the emptiest slot on the emptiest day.
+
+    It never backtracks, so it runs in well under a second on a full
+    timetable, but it can leave sessions unplaced where CP-SAT would still
+    find a schedule; those are listed in "unplaced".
+
+    Args:
+        courses (dict): Course ID -> {'time_slots': labels or slot ids}.
+        student_course_map (dict): Student -> list of course IDs.
+        course_professor_map (dict): Course ID -> professor or list of professors.
+        course_classes_per_week (dict): Course ID -> sessions per week (default 2).
+        add_prof_constraints (bool): Keep a professor's courses in different slots.
+        add_timeslot_capacity (bool): Enforce max_classes_per_slot.
+        add_no_same_day (bool): At most one session of a course per day.
+        max_classes_per_slot (int): Slot capacity.
+        non_preferred_slots (list): Slot labels or ids to avoid when there is a choice.
+        slot_catalog (SlotCatalog): Catalog for slot ids; built from the labels if None.
+
+    Returns:
+        dict: {"assignment": {course: [slot ids]}, "unplaced": {course: sessions missing},
+               "student_clashes": co-enrolled students sharing a slot, counted per course pair,
+               "schedule": DataFrame with "Course ID" and "Scheduled Time" labels}
+    """
+    slot_catalog, courses = courses_to_slot_ids(courses, slot_catalog)
+    non_preferred_ids = set(slot_catalog.to_ids(non_preferred_slots or []))
+
+    # Hard neighbours: courses sharing a professor
+    prof_neighbours = defaultdict(set)
+    if add_prof_constraints:
+        prof_courses = defaultdict(set)
+        for c_id, profs in course_professor_map.items():
+            if isinstance(profs, str):
+                profs = [profs]
+            elif profs is None:
+                profs = []
+            if c_id in courses:
+                for prof in profs:
+                    prof_courses[prof].add(c_id)
+        for c_list in prof_courses.values():
+            for c_id in c_list:
+                prof_neighbours[c_id].update(c_list - {c_id})
+
+    # Soft neighbours: courses sharing students, weighted by headcount
+    signatures = defaultdict(int)
+    for enrolled in student_course_map.values():
+        signature = frozenset(c_id for c_id in enrolled if c_id in courses)
+        if len(signature) > 1:
+            signatures[signature] += 1
+    coenrollment = defaultdict(lambda: defaultdict(int))
+    for signature, headcount in signatures.items():
+        for c_a, c_b in combinations(signature, 2):
+            coenrollment[c_a][c_b] += headcount
+            coenrollment[c_b][c_a] += headcount
+
+    remaining = {c_id: course_classes_per_week.get(c_id, 2) for c_id in courses}
+    domain = {c_id: set(info['time_slots']) for c_id, info in courses.items()}
+    slot_users = defaultdict(list)
+    for c_id, info in courses.items():
+        for s in info['time_slots']:
+            slot_users[s].append(c_id)
+    degree = {c_id: (len(prof_neighbours[c_id]), sum(coenrollment[c_id].values())) for c_id in courses}
+
+    assignment = {c_id: [] for c_id in courses}
+    unplaced = {}
+    slot_load = defaultdict(int)
+    day_load = defaultdict(int)
+    slot_courses = defaultdict(list)
+
+    # Lazy priority queue: an entry is stale once its course's version moves on
+    version = defaultdict(int)
+    queue = []
+
+    def push(c_id):
+        version[c_id] += 1
+        prof_degree, student_degree = degree[c_id]
+        heapq.heappush(queue, (len(domain[c_id]) - remaining[c_id], -prof_degree, -student_degree,
+                               c_id, version[c_id]))
+
+    def close_slot(c_id, s):
+        if s in domain[c_id]:
+            domain[c_id].discard(s)
+            if remaining[c_id] > 0:
+                push(c_id)
+
+    for c_id in sorted(courses):
+        if remaining[c_id] > 0:
+            push(c_id)
+
+    while queue:
+        _, _, _, c_id, entry_version = heapq.heappop(queue)
+        if entry_version != version[c_id] or remaining[c_id] == 0:
+            continue
+        if not domain[c_id]:
+            unplaced[c_id] = remaining[c_id]
+            remaining[c_id] = 0
+            continue
+
+        neighbours = coenrollment[c_id]
+        best = min(domain[c_id], key=lambda s: (sum(neighbours.get(other, 0) for other in slot_courses[s]),
+                                                s in non_preferred_ids, slot_load[s],
+                                                day_load[slot_catalog.day_index[s]], s))
+        assignment[c_id].append(best)
+        remaining[c_id] -= 1
+        slot_load[best] += 1
+        day_load[slot_catalog.day_index[best]] += 1
+        slot_courses[best].append(c_id)
+
+        domain[c_id].discard(best)
+        if add_no_same_day:
+            domain[c_id].difference_update(slot_catalog.slots_by_day[slot_catalog.day_index[best]])
+        if remaining[c_id] > 0:
+            push(c_id)
+        for other in prof_neighbours[c_id]:
+            close_slot(other, best)
+        if add_timeslot_capacity and slot_load[best] >= max_classes_per_slot:
+            for other in slot_users[best]:
+                close_slot(other, best)
+
+    student_clashes = 0
+    for c_list in slot_courses.values():
+        for c_a, c_b in combinations(c_list, 2):
+            student_clashes += coenrollment[c_a].get(c_b, 0)
+
+    rows = [{"Course ID": c_id, "Scheduled Time": slot_catalog.labels[s]}
+            for c_id, slots in assignment.items() for s in sorted(slots)]
+    return {
+        "assignment": {c_id: sorted(slots) for c_id, slots in assignment.items()},
+        "unplaced": unplaced,
+        "student_clashes": student_clashes,
+        "schedule": pd.DataFrame(rows, columns=["Course ID", "Scheduled Time"]),
+    }
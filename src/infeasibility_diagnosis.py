@@ -0,0 +1,250 @@
+import time
+
+from ortools.sat.python import cp_model
+from typing import Dict, List, Union
+from collections import defaultdict
+
+from .slot_catalog import SlotCatalog, courses_to_slot_ids
+
+
+def phase_failure_message(phase: int, max_classes_per_slot: int = 24, culprits: List[str] = None) -> str:
+    """
+    Human-readable explanation of why a scheduling phase is infeasible.
+
+    Args:
+        phase (int): Failing phase number (1-6).
+        max_classes_per_slot (int): Configured slot capacity, quoted in the PHASE 3 message.
+        culprits (list): Optional culprit descriptions from an unsat core, listed after the message.
+
+    Returns:
+        str: The error message.
+    """
+    messages = {
+        1: ("PHASE 1 FAILED: Basic 'classes per week' constraints cannot be satisfied.\n\n"
+            "This means one or more courses don't have enough available time slots "
+            "to meet their classes per week requirements.\n\n"
+            "Solutions:\n"
+            "• Add more time slots to the schedule\n"
+            "• Check if professor busy slots are too restrictive\n"
+            "• Verify course classes per week requirements are realistic"),
+        2: ("PHASE 2 FAILED: Professor scheduling conflicts detected.\n\n"
+            "One or more professors are assigned to teach multiple courses "
+            "at the same time, or their busy slots are too restrictive.\n\n"
+            "Solutions:\n"
+            "• Review professor assignments for overlapping courses\n"
+            "• Check professor busy slot selections\n"
+            "• Consider redistributing courses among professors\n"
+            "• Add more available time slots for overloaded professors"),
+        3: (f"PHASE 3 FAILED: Time slot capacity limit exceeded.\n\n"
+            f"The current limit of {max_classes_per_slot} classes per time slot "
+            f"is insufficient to accommodate all required course sessions.\n\n"
+            f"Solutions:\n"
+            f"• Increase max classes per slot from {max_classes_per_slot} in time slot settings\n"
+            f"• Add more time slots to spread out the course load\n"
+            f"• Reduce the number of courses or course sections\n"
+            f"• Consider splitting large courses into multiple sections"),
+        4: ("PHASE 4 FAILED: Student conflict constraints (rare).\n\n"
+            "The soft student conflict constraints are causing infeasibility, "
+            "which is unusual since they are designed to be flexible.\n\n"
+            "Solutions:\n"
+            "• This suggests a deeper scheduling problem\n"
+            "• Try regenerating with fewer constraint options enabled\n"
+            "• Review student course enrollments for unusual patterns\n"
+            "• Contact system administrator"),
+        5: ("PHASE 5 FAILED: 'No same course twice on the same day' constraint.\n\n"
+            "One or more courses require multiple sessions but only have "
+            "available time slots on the same day(s).\n\n"
+            "Solutions:\n"
+            "• Add time slots on different days\n"
+            "• Review professor busy slots - some may be blocking too many days\n"
+            "• Check if courses have realistic classes per week requirements\n"
+            "• Consider disabling the 'same day' constraint if appropriate"),
+        6: ("PHASE 6 FAILED: 'No consecutive days' constraint.\n\n"
+            "The requirement to avoid scheduling courses on consecutive days "
+            "cannot be satisfied with the current time slot configuration.\n\n"
+            "Solutions:\n"
+            "• Add more time slots spread across different days\n"
+            "• Consider disabling the 'consecutive days' constraint\n"
+            "• Review course classes per week requirements\n"
+            "• Check professor availability across different days"),
+    }
+    message = messages[phase]
+    if culprits:
+        message += "\n\nConstraints involved:\n" + "\n".join(f"• {culprit}" for culprit in culprits)
+    return message
+
+
+def diagnose_infeasibility(courses: Dict[str, Dict[str, list]],
+                           course_professor_map: Dict[str, Union[str, List[str]]],
+                           course_classes_per_week: Dict[str, int],
+                           add_prof_constraints: bool = True,
+                           add_timeslot_capacity: bool = True,
+                           add_no_same_day: bool = True,
+                           max_classes_per_slot: int = 24,
+                           slot_catalog: SlotCatalog = None,
+                           minimize: bool = True,
+                           num_workers: int = 8,
+                           max_time_in_seconds: float = 60.0,
+                           minimize_time_in_seconds: float = 10.0) -> dict:
+    """
+    Finds which hard constraint groups make the timetable infeasible with a
+    single assumption-based solve instead of re-solving phase by phase.
+
+    Every hard constraint group gets its own assumption literal: one per
+    course for 'classes per week' (PHASE 1), one per professor (PHASE 2), one
+    per slot for capacity (PHASE 3) and one per course for 'no same day'
+    (PHASE 5). Student conflicts and the consecutive-day rule are soft, so
+    they can never cause infeasibility and are left out. When the model is
+    infeasible, CP-SAT's SufficientAssumptionsForInfeasibility names a set of
+    groups that cannot hold together. With minimize set, groups that are not
+    needed for the contradiction are then dropped one at a time; each
+    infeasible trial replaces the core with that solve's own (smaller) core,
+    and all trials share one time budget, after which the current core is
+    reported as is.
+
+    Args:
+        courses (dict): Course ID -> {'time_slots': labels or slot ids}.
+        course_professor_map (dict): Course ID -> professor or list of professors.
+        course_classes_per_week (dict): Course ID -> sessions per week (default 2).
+        add_prof_constraints (bool): Include the professor groups.
+        add_timeslot_capacity (bool): Include the slot capacity groups.
+        add_no_same_day (bool): Include the same-day groups.
+        max_classes_per_slot (int): Slot capacity.
+        slot_catalog (SlotCatalog): Catalog for slot ids; built from the labels if None.
+        minimize (bool): Shrink the core to a minimal set of groups.
+        num_workers (int): CP-SAT workers for each solve.
+        max_time_in_seconds (float): Time limit for the feasibility solve.
+        minimize_time_in_seconds (float): Total time limit for shrinking the core.
+
+    Returns:
+        dict: {"feasible": True/False/None (unknown), "phase": failing phase or None,
+               "courses": [...], "professors": [...], "slots": [...],
+               "culprits": [human-readable lines], "message": phase error message or None}
+    """
+    slot_catalog, courses = courses_to_slot_ids(courses, slot_catalog)
+    model = cp_model.CpModel()
+
+    course_time_vars = {}
+    for c_id, info in courses.items():
+        course_time_vars[c_id] = {s: model.NewBoolVar(f'{c_id}_{s}') for s in info['time_slots']}
+
+    # group literal -> (phase, kind, key)
+    groups = {}
+
+    def group_literal(phase, kind, key):
+        lit = model.NewBoolVar(f'{kind}_{key}')
+        groups[lit.Index()] = (phase, kind, key, lit)
+        return lit
+
+    for c_id, slot_dict in course_time_vars.items():
+        lit = group_literal(1, "classes", c_id)
+        model.Add(sum(slot_dict.values()) == course_classes_per_week.get(c_id, 2)).OnlyEnforceIf(lit)
+
+    prof_courses = defaultdict(list)
+    if add_prof_constraints:
+        for c_id, profs in course_professor_map.items():
+            if isinstance(profs, str):
+                profs = [profs]
+            elif profs is None:
+                profs = []
+            for prof in profs:
+                if c_id in course_time_vars:
+                    prof_courses[prof].append(c_id)
+        for prof, c_list in prof_courses.items():
+            slot_map = defaultdict(list)
+            for c_id in c_list:
+                for s, var in course_time_vars[c_id].items():
+                    slot_map[s].append(var)
+            clashing = [var_list for var_list in slot_map.values() if len(var_list) > 1]
+            if clashing:
+                lit = group_literal(2, "professor", prof)
+                for var_list in clashing:
+                    model.Add(sum(var_list) <= 1).OnlyEnforceIf(lit)
+
+    if add_timeslot_capacity:
+        slot_usage = defaultdict(list)
+        for slot_dict in course_time_vars.values():
+            for s, var in slot_dict.items():
+                slot_usage[s].append(var)
+        for s, var_list in slot_usage.items():
+            if len(var_list) > max_classes_per_slot:
+                lit = group_literal(3, "slot", s)
+                model.Add(sum(var_list) <= max_classes_per_slot).OnlyEnforceIf(lit)
+
+    if add_no_same_day:
+        for c_id, slot_dict in course_time_vars.items():
+            day_map = defaultdict(list)
+            for s, var in slot_dict.items():
+                day_map[slot_catalog.day_index[s]].append(var)
+            same_day = [var_list for var_list in day_map.values() if len(var_list) > 1]
+            if same_day:
+                lit = group_literal(5, "same_day", c_id)
+                for var_list in same_day:
+                    model.Add(sum(var_list) <= 1).OnlyEnforceIf(lit)
+
+    def solve_with(literal_indices, time_limit):
+        model.ClearAssumptions()
+        model.AddAssumptions([groups[idx][3] for idx in literal_indices])
+        solver = cp_model.CpSolver()
+        solver.parameters.num_workers = num_workers
+        solver.parameters.max_time_in_seconds = time_limit
+        return solver, solver.Solve(model)
+
+    solver, status = solve_with(list(groups), max_time_in_seconds)
+    result = {"feasible": None, "phase": None, "courses": [], "professors": [], "slots": [],
+              "culprits": [], "message": None}
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        result["feasible"] = True
+        return result
+    if status != cp_model.INFEASIBLE:
+        print("[DIAGNOSIS] Could not decide feasibility within the time limit")
+        return result
+
+    core = list(solver.SufficientAssumptionsForInfeasibility())
+    print(f"[DIAGNOSIS] Unsat core has {len(core)} of {len(groups)} constraint groups")
+    if minimize:
+        deadline = time.time() + minimize_time_in_seconds
+        needed = set()
+        while True:
+            candidates = [idx for idx in core if idx not in needed]
+            remaining = deadline - time.time()
+            if not candidates or remaining <= 0:
+                break
+            trial = [other for other in core if other != candidates[0]]
+            trial_solver, trial_status = solve_with(trial, remaining)
+            if trial_status == cp_model.INFEASIBLE:
+                trial_core = set(trial_solver.SufficientAssumptionsForInfeasibility())
+                core = [other for other in trial if other in trial_core] or trial
+            elif trial_status == cp_model.UNKNOWN:
+                break
+            else:
+                needed.add(candidates[0])
+        if candidates:
+            print(f"[DIAGNOSIS] Core minimization stopped at its {minimize_time_in_seconds:g}s budget "
+                  f"with {len(core)} constraint groups")
+        else:
+            print(f"[DIAGNOSIS] Minimal core has {len(core)} constraint groups")
+
+    result["feasible"] = False
+    core_groups = sorted((groups[idx][:3] for idx in core), key=lambda group: (group[0], str(group[2])))
+    # The schedule first becomes infeasible once the latest family in the core is switched on
+    result["phase"] = max(phase for phase, _, _ in core_groups)
+    for phase, kind, key in core_groups:
+        if kind in ("classes", "same_day") and key not in result["courses"]:
+            result["courses"].append(key)
+        if kind == "classes":
+            result["culprits"].append(f"Course '{key}' needs {course_classes_per_week.get(key, 2)} session(s) "
+                                      f"in {len(courses[key]['time_slots'])} available slot(s)")
+        elif kind == "professor":
+            result["professors"].append(key)
+            result["culprits"].append(f"Professor '{key}' teaches {', '.join(sorted(prof_courses[key]))}")
+        elif kind == "slot":
+            label = slot_catalog.label_of(key)
+            result["slots"].append(label)
+            result["culprits"].append(f"Time slot '{label}' is limited to {max_classes_per_slot} classes")
+        else:
+            days = sorted({slot_catalog.day_of(s) for s in courses[key]['time_slots']})
+            result["culprits"].append(f"Course '{key}' needs {course_classes_per_week.get(key, 2)} session(s) "
+                                      f"on different days but can only meet on {', '.join(days)}")
+    result["message"] = phase_failure_message(result["phase"], max_classes_per_slot, result["culprits"])
+    return result
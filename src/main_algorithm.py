@@ -1,15 +1,23 @@
 from .data_preprocessing import merge_data, prepare_student_course_map, create_course_professor_map_all, prepare_student_course_section_map, expand_courses_with_sections
 from .utilities import faculty_busy_slots, create_course_dictionary
 from .schedule_model import schedule_courses
-from .database_management.schedule import schedule
+from .presolve_checks import find_presolve_problems, presolve_failure_message
+from .heuristic_scheduler import dsatur_schedule
+from .schedule_repair import repair_schedule
+from .database_management.schedule import schedule, get_scheduled_slots, replace_course_schedule
 from .database_management.Courses import fetch_course_data
+from .database_management.Users import insert_user_data
 from .conflict_checker import check_conflicts, find_courses_with_multiple_slots_on_same_day
-from .database_management.database_retrieval import registration_data, faculty_pref, get_all_time_slots, registration_data_with_sections, get_course_section_professor_mapping, create_course_classes_per_week_map, create_course_elective_map
+from .database_management.database_retrieval import create_course_classes_per_week_map, create_course_elective_map
 from .database_management.migration import migrate_database_for_sections, check_migration_needed
 from .database_management.Slot_info import ensure_default_time_slots
 from .database_management.settings_manager import get_max_classes_per_slot, initialize_default_settings
+from .database_management.result_cache import problem_fingerprint, get_cached_result, store_cached_result
+from .database_management.problem_snapshot import load_problem_snapshot
 import pandas as pd
 import random
+import re
+import time
 
 
 def gen_student_csv(student_list, course_list):
@@ -21,32 +29,333 @@ def gen_student_csv(student_list, course_list):
     df = pd.DataFrame(data)
     df.to_csv("Student Registration Data.csv", index=False)
 
-def diagnose_same_day_constraints(courses, course_classes_per_week):
+def prepare_problem_snapshot(db_path):
     """
-    Prints a diagnostic for each course that has fewer unique days than
-    required classes per week. If a course needs 'X' sessions (classes per week = X) but
-    only has Y < X distinct days, you'll never be able to schedule them
-    all on different days.
+    Bring the database up to date for timetable generation (section migration,
+    default settings, default time slots), writing only when something is missing,
+    and load the ProblemSnapshot the solver pipeline reads from.
+
+    :param db_path: Path to the database file or schema identifier
+    :return: ProblemSnapshot
+    """
+    if check_migration_needed(db_path):
+        print("Database migration needed for sections support...")
+        migrate_database_for_sections(db_path)
+        print("Database migration completed.")
+
+    snapshot = load_problem_snapshot(db_path)
+    if snapshot.setting("max_classes_per_slot") is None or snapshot.needs_default_time_slots:
+        initialize_default_settings(db_path)
+        ensure_default_time_slots(db_path)
+        snapshot = load_problem_snapshot(db_path)
+    return snapshot
+
+
+def load_scheduling_inputs(db_path, with_sections=False, snapshot=None):
+    """
+    Load everything schedule_courses needs from the database.
+
+    :param db_path: Path to the database file or schema identifier
+    :param with_sections: Treat every course section as a separate course
+    :param snapshot: ProblemSnapshot to build the inputs from (see prepare_problem_snapshot); loaded if None
+    :return: Dictionary with courses, student_course_map, course_professor_map, course_classes_per_week,
+             course_type and slot_catalog; None if with_sections is set and there is no section data
+    """
+    if snapshot is None:
+        snapshot = prepare_problem_snapshot(db_path)
+
+    if with_sections:
+        # Get section-aware registration data
+        df_merged = snapshot.registration_data_with_sections()
+        if df_merged.empty:
+            return None
+        print(f"Found {len(df_merged)} student-course-section enrollments")
+
+        # Use section-specific course identifiers for mapping
+        student_course_map = prepare_student_course_section_map(df_merged)
+
+        # Get section-specific professor mapping in the format expected by the algorithm
+        course_professor_map = {course_section_id: [prof_email] for course_section_id, prof_email
+                                in snapshot.get_course_section_professor_mapping().items()}
+        professor_busy_slots = faculty_busy_slots(snapshot.faculty_pref())
+
+        # Create classes per week and type maps based on base courses
+        course_classes_per_week_map = {}
+        course_type_map = {}
+        for _, row in df_merged.iterrows():
+            course_section_id = row['G CODE']
+            course_classes_per_week_map[course_section_id] = row['Classes Per Week']
+            course_type_map[course_section_id] = row['Type']
+    else:
+        df_merged = snapshot.registration_data()
+        student_course_map = prepare_student_course_map(df_merged)
+        course_professor_map = create_course_professor_map_all(df_merged)
+        professor_busy_slots = snapshot.faculty_pref()
+        course_classes_per_week_map = create_course_classes_per_week_map(df_merged)
+        course_type_map = create_course_elective_map(df_merged)
+
+    slot_catalog = snapshot.slot_catalog
+
+    # Preprocess courses (on integer slot ids)
+    courses = create_course_dictionary(student_course_map, course_professor_map, professor_busy_slots, slot_catalog)
+    return {
+        "courses": courses,
+        "student_course_map": student_course_map,
+        "course_professor_map": course_professor_map,
+        "course_classes_per_week": course_classes_per_week_map,
+        "course_type": course_type_map,
+        "slot_catalog": slot_catalog,
+    }
+
+
+def load_timetable_inputs(db_path, snapshot=None):
+    """
+    Load the solver inputs the way gen_timetable_auto will see them: section-aware
+    when multi-section courses exist, per course otherwise.
+
+    :param db_path: Path to the database file or schema identifier
+    :param snapshot: ProblemSnapshot to build the inputs from; loaded if None
+    :return: Dictionary in the format of load_scheduling_inputs
+    """
+    if snapshot is None:
+        snapshot = prepare_problem_snapshot(db_path)
+    inputs = None
+    if snapshot.has_multi_section_courses:
+        inputs = load_scheduling_inputs(db_path, with_sections=True, snapshot=snapshot)
+    if inputs is None:
+        inputs = load_scheduling_inputs(db_path, snapshot=snapshot)
+    return inputs
+
+
+def precheck_timetable(db_path, max_classes_per_slot=None, add_prof_constraints=True,
+                       add_timeslot_capacity=True, add_no_same_day=True, inputs=None):
+    """
+    Run the combinatorial pre-solve checks on the stored data, without invoking the solver,
+    so that an upload that cannot possibly be scheduled is rejected straight away.
+
+    :param db_path: Path to the database file or schema identifier
+    :param max_classes_per_slot: Maximum number of classes per slot (if None, uses database setting)
+    :param add_prof_constraints: Whether professor conflicts will be enforced
+    :param add_timeslot_capacity: Whether time slot capacity will be enforced
+    :param add_no_same_day: Whether the same course is kept off a day it already meets
+    :param inputs: Already loaded solver inputs (see load_timetable_inputs); loaded if None
+    :return: Failure message, or None if no problem was found
+    """
+    if max_classes_per_slot is None:
+        initialize_default_settings(db_path)
+        max_classes_per_slot = get_max_classes_per_slot(db_path)
+
+    if inputs is None:
+        inputs = load_timetable_inputs(db_path)
+
+    problems = find_presolve_problems(inputs["courses"], inputs["course_professor_map"],
+                                      inputs["course_classes_per_week"], add_prof_constraints,
+                                      add_timeslot_capacity, add_no_same_day, max_classes_per_slot,
+                                      inputs["slot_catalog"])
+    return presolve_failure_message(problems) if problems else None
+
+
+def draft_timetable(db_path, max_classes_per_slot=None, add_prof_constraints=True,
+                    add_timeslot_capacity=True, add_no_same_day=True, inputs=None):
     """
-    for course_id, info in courses.items():
-        # Extract days from each time slot
-        slot_days = set()
-        for slot in info["time_slots"]:
-            day = slot.split()[0]  # or your get_day_from_time_slot(slot)
-            slot_days.add(day)
+    Build a draft timetable with the greedy DSatur heuristic so admins can preview a
+    schedule straight after an upload while the exact solve runs. Nothing is saved.
+
+    :param db_path: Path to the database file or schema identifier
+    :param max_classes_per_slot: Maximum number of classes per slot (if None, uses database setting)
+    :param add_prof_constraints: Whether professor conflicts are respected
+    :param add_timeslot_capacity: Whether time slot capacity is respected
+    :param add_no_same_day: Whether the same course is kept off a day it already meets
+    :param inputs: Already loaded solver inputs (see load_timetable_inputs); loaded if None
+    :return: Dictionary with the draft "schedule" DataFrame, "unplaced" sessions per course and
+             the number of "student_clashes"
+    """
+    if max_classes_per_slot is None:
+        initialize_default_settings(db_path)
+        max_classes_per_slot = get_max_classes_per_slot(db_path)
 
-        needed = course_classes_per_week.get(course_id, 2)  # default if missing
-        day_count = len(slot_days)
+    if inputs is None:
+        inputs = load_timetable_inputs(db_path)
+
+    draft = dsatur_schedule(inputs["courses"], inputs["student_course_map"], inputs["course_professor_map"],
+                            inputs["course_classes_per_week"], add_prof_constraints, add_timeslot_capacity,
+                            add_no_same_day, max_classes_per_slot, slot_catalog=inputs["slot_catalog"])
+    return {"schedule": draft["schedule"], "unplaced": draft["unplaced"],
+            "student_clashes": draft["student_clashes"]}
+
+
+def repair_timetable(db_path, course, to_slot, max_classes_per_slot=None, add_prof_constraints=True,
+                     add_timeslot_capacity=True, add_no_same_day=True, max_time_in_seconds=1.0):
+    """
+    Re-optimise the saved timetable around a manual edit. The edited course keeps its new
+    slot, courses sharing a professor or students with it are re-solved, and everything
+    else stays where it is. Only the re-solved courses are written back.
+
+    :param db_path: Path to the database file or schema identifier
+    :param course: Identifier of the edited course (with section letter for multi-section courses)
+    :param to_slot: "Day HH:MM" label the course was moved to
+    :param max_classes_per_slot: Maximum number of classes per slot (if None, uses database setting)
+    :param add_prof_constraints: Whether professor conflicts are enforced
+    :param add_timeslot_capacity: Whether time slot capacity is enforced
+    :param add_no_same_day: Whether the same course is kept off a day it already meets
+    :param max_time_in_seconds: Time limit for the repair solve
+    :return: Dictionary from repair_schedule
+    """
+    snapshot = prepare_problem_snapshot(db_path)
+    if max_classes_per_slot is None:
+        max_classes_per_slot = snapshot.max_classes_per_slot
+
+    inputs = load_timetable_inputs(db_path, snapshot)
+    result = repair_schedule(inputs["courses"], inputs["student_course_map"], inputs["course_professor_map"],
+                             inputs["course_classes_per_week"], get_scheduled_slots(db_path), {course: [to_slot]},
+                             add_prof_constraints, add_timeslot_capacity, add_no_same_day, max_classes_per_slot,
+                             inputs["slot_catalog"], max_time_in_seconds)
+    print(f"[REPAIR] {result['status']}: {result['message']} ({result['solve_seconds']:.2f}s)")
+    if result["status"] == "repaired" and result["moves"]:
+        replace_course_schedule({move["Course ID"]: result["schedule"][move["Course ID"]]
+                                 for move in result["moves"]}, db_path, inputs["slot_catalog"])
+    return result
+
+
+def reschedule_enrollment_changes(db_path, student_course_data, max_classes_per_slot=None, add_prof_constraints=True,
+                                  add_timeslot_capacity=True, add_no_same_day=True, max_time_in_seconds=5.0):
+    """
+    Apply a new student registration file to an existing timetable without regenerating it.
+    Enrollments are diffed against the database; the courses (and sections) that gained or
+    lost students are re-solved warm-started from their current slots, together with the
+    courses they now collide with, and every other course keeps its slots.
+
+    :param db_path: Path to the database file or schema identifier
+    :param student_course_data: DataFrame with 'Roll No.' and 'G CODE' columns (the full registration list)
+    :param max_classes_per_slot: Maximum number of classes per slot (if None, uses database setting)
+    :param add_prof_constraints: Whether professor conflicts are enforced
+    :param add_timeslot_capacity: Whether time slot capacity is enforced
+    :param add_no_same_day: Whether the same course is kept off a day it already meets
+    :param max_time_in_seconds: Time limit for the repair solve
+    :return: Dictionary from repair_schedule plus "added" and "removed" enrollments;
+             status is "unchanged" when the file matches the database
+    """
+    from .database_management.course_stud import sync_course_students
+
+    # New students need a Users row before they can be enrolled
+    insert_user_data([pd.DataFrame(columns=['Faculty Name']), student_course_data], db_path)
+    changes = sync_course_students(student_course_data, db_path)
+    affected = sorted({identifier for _, identifier in changes["added"] + changes["removed"]})
+    if not affected:
+        return {"status": "unchanged", "message": "Enrollments match the saved timetable.", "neighbourhood": [],
+                "schedule": {}, "moves": [], "student_clashes_before": 0, "student_clashes_after": 0,
+                "solve_seconds": 0.0, **changes}
+
+    # Read after the sync so the snapshot includes the new enrollments
+    snapshot = prepare_problem_snapshot(db_path)
+    if max_classes_per_slot is None:
+        max_classes_per_slot = snapshot.max_classes_per_slot
+
+    inputs = load_timetable_inputs(db_path, snapshot)
+    result = repair_schedule(inputs["courses"], inputs["student_course_map"], inputs["course_professor_map"],
+                             inputs["course_classes_per_week"], get_scheduled_slots(db_path), {},
+                             add_prof_constraints, add_timeslot_capacity, add_no_same_day, max_classes_per_slot,
+                             inputs["slot_catalog"], max_time_in_seconds,
+                             free=[c_id for c_id in affected if c_id in inputs["courses"]])
+    print(f"[RESCHEDULE] {len(changes['added'])} enrollment(s) added, {len(changes['removed'])} removed; "
+          f"{result['status']}: {result['message']} ({result['solve_seconds']:.2f}s)")
+    if result["status"] == "repaired" and result["moves"]:
+        replace_course_schedule({move["Course ID"]: result["schedule"][move["Course ID"]]
+                                 for move in result["moves"]}, db_path, inputs["slot_catalog"])
+    result.update(changes)
+    return result
+
+
+# Bump when a solver change makes previously cached timetables stale
+TIMETABLE_CACHE_VERSION = 1
+
+
+def timetable_cache_key(inputs, **options):
+    """
+    Fingerprint of everything that determines a generated timetable: courses with
+    their free time slots (busy slots already removed), enrollments, professors,
+    classes per week, course types, the time slot grid and the generation options.
+
+    :param inputs: Solver inputs from load_scheduling_inputs
+    :param options: Settings and constraint toggles passed to schedule_courses
+    :return: Cache key (SHA-256 hex digest)
+    """
+    slot_catalog = inputs["slot_catalog"]
+    return problem_fingerprint({
+        "version": TIMETABLE_CACHE_VERSION,
+        "courses": {c_id: [slot_catalog.labels[s] for s in info["time_slots"]]
+                    for c_id, info in inputs["courses"].items()},
+        "student_course_map": inputs["student_course_map"],
+        "course_professor_map": inputs["course_professor_map"],
+        "course_classes_per_week": inputs["course_classes_per_week"],
+        "course_type": inputs["course_type"],
+        "time_slots": dict(zip(slot_catalog.labels, slot_catalog.end_minutes)),
+        "options": options,
+    })
+
+
+def _frame_to_json(df):
+    return {"columns": list(df.columns), "rows": df.values.tolist()}
+
+
+def _frame_from_json(data):
+    return pd.DataFrame(data["rows"], columns=data["columns"])
+
+
+def load_cached_timetable(db_path, cache_key, progress_callback=None):
+    """
+    Return a timetable stored for an identical earlier run.
+
+    :param db_path: Path to the database file or schema identifier
+    :param cache_key: Key from timetable_cache_key
+    :param progress_callback: Optional function told about a cache hit
+    :return: (schedule_data, conflicts, infeasibility_reason), or None on a miss
+    """
+    payload = get_cached_result(db_path, cache_key)
+    if payload is None:
+        print(f"[CACHE] Miss for {cache_key[:12]}")
+        return None
+    print(f"[CACHE] Hit for {cache_key[:12]}: originally solved in {payload['metrics']['solve_seconds']:.2f}s")
+    if progress_callback:
+        progress_callback({"phase": "CACHE", "cached": True, "cache_key": cache_key,
+                           "metrics": payload["metrics"]})
+    return _frame_from_json(payload["schedule"]), _frame_from_json(payload["conflicts"]), payload["message"]
+
+
+def store_timetable(db_path, cache_key, schedule_data, conflicts, infeasibility_reason, solve_seconds):
+    """
+    Cache a generated timetable (or an infeasibility verdict) under its key.
+    Runs cut short by a stop request or a time limit are not cached, since a
+    later run may well find a schedule.
+
+    :param db_path: Path to the database file or schema identifier
+    :param cache_key: Key from timetable_cache_key
+    :param schedule_data: Schedule DataFrame returned by schedule_courses
+    :param conflicts: Student conflicts DataFrame
+    :param infeasibility_reason: Message returned by schedule_courses
+    :param solve_seconds: Wall time the solve took
+    """
+    if infeasibility_reason.startswith("STOPPED EARLY"):
+        return
+    # An empty schedule is only worth caching as a proven verdict ("PHASE n FAILED" / "PHASE n PRE-CHECK FAILED")
+    if schedule_data.empty and not re.match(r"PHASE \d+ (PRE-CHECK )?FAILED", infeasibility_reason):
+        return
+    store_cached_result(db_path, cache_key, {
+        "schedule": _frame_to_json(schedule_data),
+        "conflicts": _frame_to_json(conflicts),
+        "message": infeasibility_reason,
+        "metrics": {"solve_seconds": solve_seconds,
+                    "scheduled_sessions": len(schedule_data),
+                    "student_conflicts": len(conflicts)},
+    })
 
-        if day_count < needed:
-            print(f"[DIAGNOSTIC] Course '{course_id}' needs {needed} sessions, "
-                  f"but only has {day_count} unique day(s): {sorted(slot_days)}")
-    print("[DIAGNOSTIC] Done checking same-day constraints.")
 
 def gen_timetable(db_path, max_classes_per_slot=24, 
                    add_prof_constraints=True, add_timeslot_capacity=True, 
                    add_student_conflicts=True, add_no_same_day=True, 
-                   add_no_consec_days=False):
+                   add_no_consec_days=False, conflict_mode="student",
+                   solver_params=None, progress_callback=None, stop_event=None,
+                   diagnosis_mode="phases", use_cache=True, export_dir=None, metrics=None, snapshot=None):
     """
     Generate timetable using the original algorithm (backward compatibility).
     
@@ -57,23 +366,46 @@ def gen_timetable(db_path, max_classes_per_slot=24,
     :param add_student_conflicts: Whether to add student conflict constraints
     :param add_no_same_day: Whether to prevent same course multiple times per day
     :param add_no_consec_days: Whether to prevent courses on consecutive days
+    :param conflict_mode: Student-conflict formulation, "student" or "course_pair"
+    :param solver_params: CP-SAT search parameters (None entries are auto-tuned)
+    :param progress_callback: Optional function called with solver progress for every improving solution
+    :param stop_event: Optional threading.Event; once set, the search stops and the best schedule so far is kept
+    :param diagnosis_mode: "phases" (solve phase by phase) or "core" (one unsat-core solve names the culprits)
+    :param use_cache: Reuse the stored result of an identical earlier run; False forces a fresh solve
+    :param export_dir: Directory to write the solved CP-SAT models to for offline replay (see model_export)
+    :param metrics: Optional dictionary filled with the solver metrics of the run (see schedule_courses)
+    :param snapshot: ProblemSnapshot to schedule (see prepare_problem_snapshot); loaded if None
     """
-    # Ensure default time slots exist
-    ensure_default_time_slots(db_path)
-    
-    df_merged = registration_data(db_path)
-    student_course_map = prepare_student_course_map(df_merged)
-    course_professor_map = create_course_professor_map_all(df_merged)
-    professor_busy_slots = faculty_pref(db_path)
-    course_classes_per_week_map = create_course_classes_per_week_map(df_merged)
-    course_type_map = create_course_elective_map(df_merged)
-    time_slots = get_all_time_slots(db_path)
-    # Preprocess courses and schedule
-    courses = create_course_dictionary(student_course_map, course_professor_map, professor_busy_slots, time_slots)
-    diagnose_same_day_constraints(courses, course_classes_per_week_map)
-    schedule_data, infeasibility_reason = schedule_courses(courses, student_course_map, course_professor_map, course_classes_per_week_map, course_type_map, [], 
+    inputs = load_scheduling_inputs(db_path, snapshot=snapshot)
+    student_course_map = inputs["student_course_map"]
+    slot_catalog = inputs["slot_catalog"]
+    cache_key = timetable_cache_key(inputs, max_classes_per_slot=max_classes_per_slot,
+                                    add_prof_constraints=add_prof_constraints,
+                                    add_timeslot_capacity=add_timeslot_capacity,
+                                    add_student_conflicts=add_student_conflicts,
+                                    add_no_same_day=add_no_same_day, add_no_consec_days=add_no_consec_days,
+                                    conflict_mode=conflict_mode, solver_params=solver_params,
+                                    diagnosis_mode=diagnosis_mode)
+    cached = load_cached_timetable(db_path, cache_key, progress_callback) if use_cache else None
+    if cached is not None:
+        schedule_data, conflicts, infeasibility_reason = cached
+        if metrics is not None:
+            metrics.update(model=None, phases=[], total_seconds=0.0, cached=True)
+        if not schedule_data.empty:
+            schedule(schedule_data, db_path, slot_catalog)
+        return schedule_data, conflicts, infeasibility_reason
+    solve_started = time.time()
+
+    # schedule_courses runs the pre-solve checks before building the model
+    schedule_data, infeasibility_reason, solve_metrics = schedule_courses(inputs["courses"], student_course_map, inputs["course_professor_map"], inputs["course_classes_per_week"], inputs["course_type"], [], 
                                    add_prof_constraints, add_timeslot_capacity, add_student_conflicts, 
-                                   add_no_same_day, add_no_consec_days, max_classes_per_slot)
+                                   add_no_same_day, add_no_consec_days, max_classes_per_slot,
+                                   conflict_mode=conflict_mode, solver_params=solver_params,
+                                   progress_callback=progress_callback, stop_event=stop_event,
+                                   slot_catalog=slot_catalog, diagnosis_mode=diagnosis_mode,
+                                   export_dir=export_dir, return_metrics=True)
+    if metrics is not None:
+        metrics.update(solve_metrics)
 
     print("Schedule Data")
     print(schedule_data)
@@ -81,6 +413,8 @@ def gen_timetable(db_path, max_classes_per_slot=24,
     
     # If the schedule is empty, return the infeasibility reason
     if schedule_data.empty:
+        store_timetable(db_path, cache_key, schedule_data, pd.DataFrame(), infeasibility_reason,
+                        time.time() - solve_started)
         return schedule_data, pd.DataFrame(), infeasibility_reason
     
     print()
@@ -89,14 +423,19 @@ def gen_timetable(db_path, max_classes_per_slot=24,
     print("Conflicts")
     conflicts = check_conflicts(schedule_data, student_course_map)
     print(conflicts)
-    schedule(schedule_data, db_path)
+    store_timetable(db_path, cache_key, schedule_data, conflicts, infeasibility_reason,
+                    time.time() - solve_started)
+    schedule(schedule_data, db_path, slot_catalog)
     return schedule_data, conflicts, infeasibility_reason
 
 
 def gen_timetable_with_sections(db_path, max_classes_per_slot=24,
                                  add_prof_constraints=True, add_timeslot_capacity=True, 
                                  add_student_conflicts=True, add_no_same_day=True, 
-                                 add_no_consec_days=False):
+                                 add_no_consec_days=False, conflict_mode="student",
+                                 solver_params=None, progress_callback=None, stop_event=None,
+                                 diagnosis_mode="phases", use_cache=True, export_dir=None, metrics=None,
+                                 snapshot=None):
     """
     Generate timetable with section support using the new section-aware algorithm.
     
@@ -107,47 +446,34 @@ def gen_timetable_with_sections(db_path, max_classes_per_slot=24,
     :param add_student_conflicts: Whether to add student conflict constraints
     :param add_no_same_day: Whether to prevent same course multiple times per day
     :param add_no_consec_days: Whether to prevent courses on consecutive days
+    :param conflict_mode: Student-conflict formulation, "student" or "course_pair"
+    :param solver_params: CP-SAT search parameters (None entries are auto-tuned)
+    :param progress_callback: Optional function called with solver progress for every improving solution
+    :param stop_event: Optional threading.Event; once set, the search stops and the best schedule so far is kept
+    :param diagnosis_mode: "phases" (solve phase by phase) or "core" (one unsat-core solve names the culprits)
+    :param use_cache: Reuse the stored result of an identical earlier run; False forces a fresh solve
+    :param export_dir: Directory to write the solved CP-SAT models to for offline replay (see model_export)
+    :param metrics: Optional dictionary filled with the solver metrics of the run (see schedule_courses)
+    :param snapshot: ProblemSnapshot to schedule (see prepare_problem_snapshot); loaded if None
     """
     print("Generating timetable with section support...")
+    if snapshot is None:
+        snapshot = prepare_problem_snapshot(db_path)
     
-    # Get section-aware registration data
-    df_merged = registration_data_with_sections(db_path)
+    # Load section-aware data (each section is treated as a separate course)
+    inputs = load_scheduling_inputs(db_path, with_sections=True, snapshot=snapshot)
     
-    if df_merged.empty:
+    if inputs is None:
         print("No registration data found, falling back to original algorithm")
         return gen_timetable(db_path, max_classes_per_slot, add_prof_constraints, 
                            add_timeslot_capacity, add_student_conflicts, 
-                           add_no_same_day, add_no_consec_days)
-    
-    print(f"Found {len(df_merged)} student-course-section enrollments")
-    
-    # Use section-specific course identifiers for mapping
-    student_course_map = prepare_student_course_section_map(df_merged)
-    
-    # Get section-specific professor mapping
-    course_professor_map = get_course_section_professor_mapping(db_path)
-    
-    # Convert to the format expected by the algorithm
-    course_professor_map_all = {}
-    for course_section_id, prof_email in course_professor_map.items():
-        course_professor_map_all[course_section_id] = [prof_email]
-    
-    # Get other required data
-    df_faculty_pref = faculty_pref(db_path)
-    professor_busy_slots = faculty_busy_slots(df_faculty_pref)
+                           add_no_same_day, add_no_consec_days, conflict_mode,
+                           solver_params, progress_callback, stop_event,
+                           diagnosis_mode, use_cache, export_dir, metrics, snapshot)
     
-    # Create classes per week and type maps based on base courses
-    course_classes_per_week_map = {}
-    course_type_map = {}
-    for _, row in df_merged.iterrows():
-        course_section_id = row['G CODE']
-        course_classes_per_week_map[course_section_id] = row['Classes Per Week']
-        course_type_map[course_section_id] = row['Type']
-    
-    # Ensure default time slots exist
-    ensure_default_time_slots(db_path)
-    
-    time_slots = get_all_time_slots(db_path)
+    student_course_map = inputs["student_course_map"]
+    slot_catalog = inputs["slot_catalog"]
+    time_slots = slot_catalog.labels
     
     # DEBUG: Print time slot information
     print(f"🕐 DEBUG: Found {len(time_slots)} time slots in database")
@@ -165,18 +491,35 @@ def gen_timetable_with_sections(db_path, max_classes_per_slot=24,
     
     print(f"📊 Max classes per slot configured: {max_classes_per_slot}")
     
-    # Preprocess courses and schedule (treating each section as a separate course)
-    courses = create_course_dictionary(student_course_map, course_professor_map_all, professor_busy_slots, time_slots)
-    
-    print(f"Processing {len(courses)} course sections")
-    
-    # Diagnose constraints
-    diagnose_same_day_constraints(courses, course_classes_per_week_map)
-    
-    # Generate schedule
-    schedule_data, infeasibility_reason = schedule_courses(courses, student_course_map, course_professor_map_all, course_classes_per_week_map, course_type_map, [], 
+    print(f"Processing {len(inputs['courses'])} course sections")
+    
+    cache_key = timetable_cache_key(inputs, max_classes_per_slot=max_classes_per_slot,
+                                    add_prof_constraints=add_prof_constraints,
+                                    add_timeslot_capacity=add_timeslot_capacity,
+                                    add_student_conflicts=add_student_conflicts,
+                                    add_no_same_day=add_no_same_day, add_no_consec_days=add_no_consec_days,
+                                    conflict_mode=conflict_mode, solver_params=solver_params,
+                                    diagnosis_mode=diagnosis_mode)
+    cached = load_cached_timetable(db_path, cache_key, progress_callback) if use_cache else None
+    if cached is not None:
+        schedule_data, conflicts, infeasibility_reason = cached
+        if metrics is not None:
+            metrics.update(model=None, phases=[], total_seconds=0.0, cached=True)
+        if not schedule_data.empty:
+            schedule(schedule_data, db_path, slot_catalog)
+        return schedule_data, conflicts, infeasibility_reason
+    solve_started = time.time()
+
+    # Generate schedule (schedule_courses runs the pre-solve checks first)
+    schedule_data, infeasibility_reason, solve_metrics = schedule_courses(inputs["courses"], student_course_map, inputs["course_professor_map"], inputs["course_classes_per_week"], inputs["course_type"], [], 
                                    add_prof_constraints, add_timeslot_capacity, add_student_conflicts, 
-                                   add_no_same_day, add_no_consec_days, max_classes_per_slot)
+                                   add_no_same_day, add_no_consec_days, max_classes_per_slot,
+                                   conflict_mode=conflict_mode, solver_params=solver_params,
+                                   progress_callback=progress_callback, stop_event=stop_event,
+                                   slot_catalog=slot_catalog, diagnosis_mode=diagnosis_mode,
+                                   export_dir=export_dir, return_metrics=True)
+    if metrics is not None:
+        metrics.update(solve_metrics)
 
     print("Schedule Data (Section-aware)")
     print(schedule_data)
@@ -184,6 +527,8 @@ def gen_timetable_with_sections(db_path, max_classes_per_slot=24,
     
     # If the schedule is empty, return the infeasibility reason
     if schedule_data.empty:
+        store_timetable(db_path, cache_key, schedule_data, pd.DataFrame(), infeasibility_reason,
+                        time.time() - solve_started)
         return schedule_data, pd.DataFrame(), infeasibility_reason
     
     print()
@@ -192,55 +537,21 @@ def gen_timetable_with_sections(db_path, max_classes_per_slot=24,
     print("Conflicts")
     conflicts = check_conflicts(schedule_data, student_course_map)
     print(conflicts)
+    store_timetable(db_path, cache_key, schedule_data, conflicts, infeasibility_reason,
+                    time.time() - solve_started)
     
     # Save schedule to database
-    schedule(schedule_data, db_path)
+    schedule(schedule_data, db_path, slot_catalog)
     
     return schedule_data, conflicts, infeasibility_reason
 
 
-def has_multi_section_courses(db_path):
-    """
-    Check if the database has any courses with multiple sections.
-    
-    :param db_path: Path to the database
-    :return: True if multi-section courses exist, False otherwise
-    """
-    try:
-        # Ensure migration is done before checking
-        if check_migration_needed(db_path):
-            migrate_database_for_sections(db_path)
-        
-        # First check if there are any multi-section courses in the Courses table
-        from .database_management.section_allocation import get_multi_section_courses
-        multi_section_courses = get_multi_section_courses(db_path)
-        
-        print(f"🔍 Multi-section courses found in database: {multi_section_courses}")
-        
-        if multi_section_courses:
-            print(f"✅ Found {len(multi_section_courses)} multi-section courses")
-            return True
-        
-        # Fallback to checking registration data
-        df_merged = registration_data_with_sections(db_path)
-        has_multi_sections = not df_merged.empty and df_merged['NumberOfSections'].max() > 1
-        
-        if has_multi_sections:
-            print(f"✅ Multi-section courses detected in registration data")
-        else:
-            print(f"❌ No multi-section courses detected")
-        
-        return has_multi_sections
-        
-    except Exception as e:
-        print(f"Error checking for multi-section courses: {e}")
-        return False
-
-
 def gen_timetable_auto(db_path, max_classes_per_slot=None, 
                        add_prof_constraints=True, add_timeslot_capacity=True, 
                        add_student_conflicts=True, add_no_same_day=True, 
-                       add_no_consec_days=False):
+                       add_no_consec_days=False, conflict_mode="student",
+                       solver_params=None, progress_callback=None, stop_event=None,
+                       diagnosis_mode="phases", use_cache=True, export_dir=None, metrics=None):
     """
     Automatically choose between section-aware and original timetable generation
     based on whether multi-section courses exist.
@@ -252,34 +563,44 @@ def gen_timetable_auto(db_path, max_classes_per_slot=None,
     :param add_student_conflicts: Whether to add student conflict constraints
     :param add_no_same_day: Whether to prevent same course multiple times per day
     :param add_no_consec_days: Whether to prevent courses on consecutive days
+    :param conflict_mode: Student-conflict formulation, "student" or "course_pair"
+    :param solver_params: CP-SAT search parameters (None entries are auto-tuned)
+    :param progress_callback: Optional function called with solver progress for every improving solution
+    :param stop_event: Optional threading.Event; once set, the search stops and the best schedule so far is kept
+    :param diagnosis_mode: "phases" (solve phase by phase) or "core" (one unsat-core solve names the culprits)
+    :param use_cache: Reuse the stored result of an identical earlier run; False forces a fresh solve
+    :param export_dir: Directory to write the solved CP-SAT models to for offline replay (see model_export)
+    :param metrics: Optional dictionary filled with the solver metrics of the run (see schedule_courses)
     :return: Schedule data and conflicts
     """
     print(f"🚀 Starting auto timetable generation...")
     print(f"   📁 Database path: {db_path}")
     
-    # Initialize default settings if they don't exist
-    initialize_default_settings(db_path)
+    # Migrate, add default settings and time slots if needed, then read every table in one transaction
+    snapshot = prepare_problem_snapshot(db_path)
     
     # Get max classes per slot from database if not provided
     if max_classes_per_slot is None:
-        max_classes_per_slot = get_max_classes_per_slot(db_path)
+        max_classes_per_slot = snapshot.max_classes_per_slot
     
     print(f"📊 Using max classes per slot: {max_classes_per_slot}")
-    
-    # Ensure database is migrated for sections support
-    if check_migration_needed(db_path):
-        print("Database migration needed for sections support...")
-        migrate_database_for_sections(db_path)
-        print("Database migration completed.")
+
+    # Get CP-SAT search parameters configured for this organization
+    if solver_params is None:
+        solver_params = snapshot.solver_settings()
     
     print(f"🔍 Checking for multi-section courses...")
-    if has_multi_section_courses(db_path):
+    if snapshot.has_multi_section_courses:
         print("✅ Multi-section courses detected, using section-aware algorithm")
         return gen_timetable_with_sections(db_path, max_classes_per_slot, 
                                          add_prof_constraints, add_timeslot_capacity,
-                                         add_student_conflicts, add_no_same_day, add_no_consec_days)
+                                         add_student_conflicts, add_no_same_day, add_no_consec_days,
+                                         conflict_mode, solver_params, progress_callback, stop_event,
+                                         diagnosis_mode, use_cache, export_dir, metrics, snapshot)
     else:
         print("❌ No multi-section courses detected, using original algorithm")
         return gen_timetable(db_path, max_classes_per_slot,
                            add_prof_constraints, add_timeslot_capacity,
-                           add_student_conflicts, add_no_same_day, add_no_consec_days)
\ No newline at end of file
+                           add_student_conflicts, add_no_same_day, add_no_consec_days,
+                           conflict_mode, solver_params, progress_callback, stop_event,
+                           diagnosis_mode, use_cache, export_dir, metrics, snapshot)
\ No newline at end of file
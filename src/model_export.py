@@ -0,0 +1,150 @@
+from ortools.sat.python import cp_model
+from typing import Dict, List
+import json
+import os
+import re
+import time
+
+from .slot_catalog import SlotCatalog
+
+MANIFEST_FILE = "manifest.json"
+
+
+def _phase_stem(phase: str) -> str:
+    """File name stem of a phase: "PHASE 5" -> "phase_5"."""
+    return re.sub(r"\W+", "_", phase.strip().lower())
+
+
+def write_model_manifest(export_dir: str, course_time_vars: Dict[str, dict], phase_lits: Dict[str, object],
+                         slot_catalog: SlotCatalog, solver_params: dict) -> str:
+    """
+    Starts an export directory with a manifest mapping the model's variable
+    indices back to the timetable: every (course, slot) decision variable and
+    every phase literal. Phases are appended by export_phase as they are solved.
+
+    Args:
+        export_dir (str): Directory to write to (created if missing).
+        course_time_vars (dict): Course ID -> {slot id: BoolVar}.
+        phase_lits (dict): Constraint family -> phase literal.
+        slot_catalog (SlotCatalog): Catalog the slot ids refer to.
+        solver_params (dict): Resolved solver parameters (see resolve_solver_parameters).
+
+    Returns:
+        str: Path of the manifest.
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    manifest = {
+        "created_at": time.time(),
+        "solver_params": solver_params,
+        "variables": [{"index": var.Index(), "course": c_id, "slot": slot_catalog.labels[s]}
+                      for c_id, slot_dict in course_time_vars.items() for s, var in slot_dict.items()],
+        "phase_literals": {family: lit.Index() for family, lit in phase_lits.items()},
+        "phases": [],
+    }
+    path = os.path.join(export_dir, MANIFEST_FILE)
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+def export_phase(export_dir: str, phase: str, model: cp_model.CpModel, solver: cp_model.CpSolver, status: int):
+    """
+    Writes one solved phase: the model proto (with that phase's assumptions
+    and hints), the solver parameters and the final response, all in protobuf
+    text format, and records the phase in the manifest.
+
+    Args:
+        export_dir (str): Directory started by write_model_manifest.
+        phase (str): Phase name, e.g. "PHASE 5".
+        model (cp_model.CpModel): The model exactly as it was solved.
+        solver (cp_model.CpSolver): The solver after Solve returned.
+        status (int): Status returned by Solve.
+    """
+    stem = _phase_stem(phase)
+    files = {"model": f"{stem}.model.pbtxt", "params": f"{stem}.params.pbtxt", "response": f"{stem}.response.pbtxt"}
+    model.ExportToFile(os.path.join(export_dir, files["model"]))
+    with open(os.path.join(export_dir, files["params"]), "w") as f:
+        f.write(str(solver.parameters))
+    with open(os.path.join(export_dir, files["response"]), "w") as f:
+        f.write(str(solver.ResponseProto()))
+
+    path = os.path.join(export_dir, MANIFEST_FILE)
+    with open(path) as f:
+        manifest = json.load(f)
+    solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    manifest["phases"].append({
+        "phase": phase,
+        "files": files,
+        "status": solver.StatusName(status),
+        "objective": solver.ObjectiveValue() if solved else None,
+        "best_bound": solver.BestObjectiveBound() if solved else None,
+        "wall_time": solver.WallTime(),
+    })
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"[EXPORT] {phase} model written to {os.path.join(export_dir, files['model'])}")
+
+
+def load_manifest(export_dir: str) -> dict:
+    """Reads the manifest of an export directory."""
+    with open(os.path.join(export_dir, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def replay_exported_model(export_dir: str, phase: str = None, param_overrides: List[str] = None,
+                          repeats: int = 1) -> dict:
+    """
+    Re-solves an exported phase, optionally with different solver parameters,
+    and reports the timing next to the recorded run.
+
+    Args:
+        export_dir (str): Directory written by schedule_courses(export_dir=...).
+        phase (str): Phase to replay; the last exported phase if None.
+        param_overrides (list): SatParameters in text format applied over the
+            exported parameters, e.g. ["num_workers: 8", "linearization_level: 2"].
+        repeats (int): Number of solves; each is timed.
+
+    Returns:
+        dict: {"phase", "params" (text format), "recorded": manifest entry of the phase,
+               "runs": [{"status", "objective", "best_bound", "wall_time"}],
+               "schedule": DataFrame-ready rows {"Course ID", "Scheduled Time"} of the last run}
+    """
+    manifest = load_manifest(export_dir)
+    if not manifest["phases"]:
+        raise ValueError(f"No exported phases in {export_dir}")
+    if phase is None:
+        recorded = manifest["phases"][-1]
+    else:
+        matching = [entry for entry in manifest["phases"] if entry["phase"] == phase]
+        if not matching:
+            raise ValueError(f"Phase '{phase}' not exported; available: "
+                             f"{', '.join(entry['phase'] for entry in manifest['phases'])}")
+        recorded = matching[-1]
+
+    model = cp_model.CpModel()
+    with open(os.path.join(export_dir, recorded["files"]["model"])) as f:
+        model.Proto().parse_text_format(f.read())
+    with open(os.path.join(export_dir, recorded["files"]["params"])) as f:
+        exported_params = f.read()
+
+    runs = []
+    for _ in range(max(1, repeats)):
+        solver = cp_model.CpSolver()
+        solver.parameters.parse_text_format(exported_params)
+        for override in param_overrides or []:
+            solver.parameters.merge_text_format(override)
+        status = solver.Solve(model)
+        solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        runs.append({
+            "status": solver.StatusName(status),
+            "objective": solver.ObjectiveValue() if solved else None,
+            "best_bound": solver.BestObjectiveBound() if solved else None,
+            "wall_time": solver.WallTime(),
+        })
+
+    rows = []
+    if runs[-1]["objective"] is not None:
+        rows = [{"Course ID": entry["course"], "Scheduled Time": entry["slot"]}
+                for entry in manifest["variables"] if solver.Value(model.GetBoolVarFromProtoIndex(entry["index"]))]
+    return {"phase": recorded["phase"], "params": str(solver.parameters), "recorded": recorded,
+            "runs": runs, "schedule": rows}
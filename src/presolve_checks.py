@@ -0,0 +1,169 @@
+from typing import Dict, List, Union
+from collections import defaultdict
+
+from .slot_catalog import SlotCatalog, courses_to_slot_ids
+
+
+def _professor_hall_violation(sessions: List[tuple], course_slots: Dict[str, List[int]]):
+    """
+    Matches every session of one professor to a distinct free slot
+    (augmenting paths). If some session cannot be matched, Hall's condition
+    fails: returns the courses of a session set S together with its slot
+    neighbourhood N(S), where |N(S)| < |S|. Returns None when all sessions fit.
+    """
+    slot_owner = {}
+
+    def augment(session, seen):
+        for s in course_slots[session[0]]:
+            if s in seen:
+                continue
+            seen.add(s)
+            if s not in slot_owner or augment(slot_owner[s], seen):
+                slot_owner[s] = session
+                return True
+        return False
+
+    for session in sessions:
+        if augment(session, set()):
+            continue
+        # Everything reachable from the unmatched session along alternating
+        # paths is the deficient set.
+        reached_sessions, reached_slots = {session}, set()
+        frontier = [session]
+        while frontier:
+            current = frontier.pop()
+            for s in course_slots[current[0]]:
+                if s not in reached_slots:
+                    reached_slots.add(s)
+                    owner = slot_owner.get(s)
+                    if owner is not None and owner not in reached_sessions:
+                        reached_sessions.add(owner)
+                        frontier.append(owner)
+        return sorted({c_id for c_id, _ in reached_sessions}), len(reached_sessions), len(reached_slots)
+    return None
+
+
+def find_presolve_problems(courses: Dict[str, Dict[str, list]],
+                           course_professor_map: Dict[str, Union[str, List[str]]],
+                           course_classes_per_week: Dict[str, int],
+                           add_prof_constraints: bool = True,
+                           add_timeslot_capacity: bool = True,
+                           add_no_same_day: bool = True,
+                           max_classes_per_slot: int = 24,
+                           slot_catalog: SlotCatalog = None) -> List[dict]:
+    """
+    Combinatorial feasibility checks that run before CP-SAT is invoked.
+
+    - PHASE 1: a course needs more sessions than it has free slots.
+    - PHASE 2: a professor's sessions cannot be matched to distinct free
+      slots (Hall's condition on the course/slot bipartite graph).
+    - PHASE 3: total sessions exceed what the slots can hold, counting each
+      slot as min(max_classes_per_slot, courses that can use it).
+    - PHASE 5: a course needs more sessions than it has distinct free days.
+
+    Each check is necessary for feasibility, so a reported problem is always
+    real; passing them all does not guarantee a solution.
+
+    Args:
+        courses (dict): Course ID -> {'time_slots': labels or slot ids}.
+        course_professor_map (dict): Course ID -> professor or list of professors.
+        course_classes_per_week (dict): Course ID -> sessions per week (default 2).
+        add_prof_constraints (bool): Run the professor check.
+        add_timeslot_capacity (bool): Run the total capacity check.
+        add_no_same_day (bool): Run the distinct-days check.
+        max_classes_per_slot (int): Slot capacity.
+        slot_catalog (SlotCatalog): Catalog for slot ids; built from the labels if None.
+
+    Returns:
+        list: Problems ordered by phase, each {"phase": int, "summary": str, "solutions": [str]}.
+    """
+    slot_catalog, courses = courses_to_slot_ids(courses, slot_catalog)
+    problems = []
+
+    for c_id, info in courses.items():
+        needed = course_classes_per_week.get(c_id, 2)
+        possible = len(info['time_slots'])
+        if needed > possible:
+            problems.append({
+                "phase": 1,
+                "summary": f"Course '{c_id}' needs {needed} sessions but only has {possible} slot(s) available.",
+                "solutions": ["Add more time slots to the schedule",
+                              "Check if professor busy slots are too restrictive",
+                              "Verify course classes per week requirements are correct"],
+            })
+
+    if add_prof_constraints:
+        prof_courses = defaultdict(list)
+        for c_id, profs in course_professor_map.items():
+            if isinstance(profs, str):
+                profs = [profs]
+            elif profs is None:
+                profs = []
+            # Courses already reported under PHASE 1 would only repeat themselves here
+            if c_id in courses and course_classes_per_week.get(c_id, 2) <= len(courses[c_id]['time_slots']):
+                for prof in profs:
+                    prof_courses[prof].append(c_id)
+        course_slots = {c_id: info['time_slots'] for c_id, info in courses.items()}
+        for prof, c_list in prof_courses.items():
+            sessions = [(c_id, k) for c_id in c_list for k in range(course_classes_per_week.get(c_id, 2))]
+            violation = _professor_hall_violation(sessions, course_slots)
+            if violation:
+                deficient_courses, num_sessions, num_slots = violation
+                problems.append({
+                    "phase": 2,
+                    "summary": (f"Professor '{prof}' must teach {num_sessions} sessions of "
+                                f"{', '.join(deficient_courses)} but those courses only have "
+                                f"{num_slots} free slot(s) between them."),
+                    "solutions": ["Review professor busy slot selections",
+                                  "Consider redistributing courses among professors",
+                                  "Add more available time slots for this professor"],
+                })
+
+    if add_timeslot_capacity:
+        usage = defaultdict(int)
+        for info in courses.values():
+            for s in info['time_slots']:
+                usage[s] += 1
+        total_sessions = sum(course_classes_per_week.get(c_id, 2) for c_id in courses)
+        total_capacity = sum(min(count, max_classes_per_slot) for count in usage.values())
+        if total_sessions > total_capacity:
+            problems.append({
+                "phase": 3,
+                "summary": (f"{total_sessions} sessions must be scheduled but the time slots can hold at most "
+                            f"{total_capacity} classes with a limit of {max_classes_per_slot} per slot."),
+                "solutions": [f"Increase max classes per slot from {max_classes_per_slot} in time slot settings",
+                              "Add more time slots to spread out the course load",
+                              "Reduce the number of courses or course sections"],
+            })
+
+    if add_no_same_day:
+        for c_id, info in courses.items():
+            needed = course_classes_per_week.get(c_id, 2)
+            days = {slot_catalog.day_index[s] for s in info['time_slots']}
+            if len(info['time_slots']) >= needed > len(days):
+                day_names = sorted((slot_catalog.day_names[d_idx] for d_idx in days),
+                                   key=slot_catalog.day_names.index)
+                problems.append({
+                    "phase": 5,
+                    "summary": (f"Course '{c_id}' needs {needed} sessions on different days but its free "
+                                f"slots fall on {len(days)} day(s): {', '.join(day_names) or 'none'}."),
+                    "solutions": ["Add time slots on different days",
+                                  "Review professor busy slots - some may be blocking too many days",
+                                  "Consider disabling the 'same day' constraint if appropriate"],
+                })
+
+    return problems
+
+
+def presolve_failure_message(problems: List[dict]) -> str:
+    """
+    Formats find_presolve_problems output like the other phase errors:
+    the earliest problem in full, followed by a list of the others.
+    """
+    first = problems[0]
+    message = (f"PHASE {first['phase']} PRE-CHECK FAILED: {first['summary']}\n\n"
+               f"Solutions:\n" + "\n".join(f"• {solution}" for solution in first['solutions']))
+    if len(problems) > 1:
+        message += ("\n\nOther problems found:\n" +
+                    "\n".join(f"• PHASE {problem['phase']}: {problem['summary']}" for problem in problems[1:]))
+    return message
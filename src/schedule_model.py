@@ -2,14 +2,502 @@ from ortools.sat.python import cp_model
 import pandas as pd
 from typing import Dict, List, Union
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+import os
+import re
+import threading
+import time
 
+from .slot_catalog import SlotCatalog, courses_to_slot_ids
+from .infeasibility_diagnosis import diagnose_infeasibility, phase_failure_message
+from .presolve_checks import find_presolve_problems, presolve_failure_message
+from .heuristic_scheduler import dsatur_schedule
+from .model_export import write_model_manifest, export_phase
 
-def get_day_from_time_slot(time_slot: str) -> str:
+# Formulations available for the PHASE 4 student-conflict model
+STUDENT_CONFLICT_MODES = ("student", "course_pair")
+
+# How schedule_courses finds the failing constraint family
+DIAGNOSIS_MODES = ("phases", "core")
+
+# CP-SAT parameters that can be configured per organization, with their types
+SOLVER_PARAMETER_TYPES = {
+    "max_time_in_seconds": float,
+    "num_workers": int,
+    "relative_gap_limit": float,
+    "random_seed": int,
+    "linearization_level": int,
+    "log_search_progress": bool,
+}
+
+
+def default_solver_parameters(num_courses: int, num_slots: int, num_students: int) -> dict:
+    """
+    Auto-tunes the CP-SAT search parameters from the instance size
+    (courses x slots x students). Small terms get a short limit and an exact
+    optimum; large terms get every core and accept a small optimality gap.
+    """
+    size = num_courses * num_slots * max(num_students, 1)
+    cpu_count = os.cpu_count() or 1
+    if size < 100_000:
+        max_time, num_workers, gap = 10.0, min(cpu_count, 4), 0.0
+    elif size < 10_000_000:
+        max_time, num_workers, gap = 60.0, min(cpu_count, 8), 0.0
+    else:
+        max_time, num_workers, gap = 120.0, cpu_count, 0.01
+    return {
+        "max_time_in_seconds": max_time,
+        "num_workers": num_workers,
+        "relative_gap_limit": gap,
+        "random_seed": 0,
+        "linearization_level": 1,
+        "log_search_progress": False,
+    }
+
+
+def resolve_solver_parameters(overrides: dict, num_courses: int, num_slots: int, num_students: int) -> dict:
+    """
+    Merges configured solver parameters over the size-based defaults.
+
+    Args:
+        overrides (dict): Parameter name -> value; None values keep the auto-tuned default.
+        num_courses (int): Number of courses in the instance.
+        num_slots (int): Number of distinct time slots.
+        num_students (int): Number of students.
+
+    Returns:
+        dict: Complete, typed parameter set.
+    """
+    params = default_solver_parameters(num_courses, num_slots, num_students)
+    for name, value in (overrides or {}).items():
+        if value is None:
+            continue
+        if name not in SOLVER_PARAMETER_TYPES:
+            raise ValueError(f"Unknown solver parameter '{name}'")
+        if SOLVER_PARAMETER_TYPES[name] is bool:
+            params[name] = value if isinstance(value, bool) else str(value).strip().lower() in ("1", "true", "yes", "on")
+        else:
+            params[name] = SOLVER_PARAMETER_TYPES[name](value)
+    return params
+
+
+def apply_solver_parameters(solver: cp_model.CpSolver, params: dict):
+    """Copies a resolved parameter set onto a CpSolver."""
+    solver.parameters.max_time_in_seconds = params["max_time_in_seconds"]
+    solver.parameters.num_workers = params["num_workers"]
+    solver.parameters.relative_gap_limit = params["relative_gap_limit"]
+    solver.parameters.random_seed = params["random_seed"]
+    solver.parameters.linearization_level = params["linearization_level"]
+    solver.parameters.log_search_progress = params["log_search_progress"]
+    solver.parameters.cp_model_presolve = True
+
+
+class PhaseProgressCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Reports every improving solution of one phase to a progress function.
+
+    The function receives a dict with the phase name, objective value, best
+    bound, relative gap (as CP-SAT computes it for relative_gap_limit) and the
+    seconds elapsed in the phase. It is called from the solver thread.
+    """
+
+    def __init__(self, phase: str, on_progress):
+        super().__init__()
+        self.phase = phase
+        self.on_progress = on_progress
+        self.solutions = 0
+
+    def on_solution_callback(self):
+        self.solutions += 1
+        objective = self.ObjectiveValue()
+        best_bound = self.BestObjectiveBound()
+        self.on_progress({
+            "phase": self.phase,
+            "objective": objective,
+            "best_bound": best_bound,
+            "gap": abs(objective - best_bound) / max(1.0, abs(objective)),
+            "elapsed_seconds": round(self.WallTime(), 3),
+            "solutions": self.solutions,
+        })
+
+
+def phase_metrics(phase: str, solver: cp_model.CpSolver, status: int, num_variables: int) -> dict:
+    """
+    Structured statistics of one phase solve, taken from the solver response.
+
+    Args:
+        phase (str): Phase name.
+        solver (cp_model.CpSolver): The solver after Solve returned.
+        status (int): Status returned by Solve.
+        num_variables (int): Variables of the model as built, to measure presolve reductions.
+
+    Returns:
+        dict: Status, objective, bound and gap, wall and CPU time, search counters
+              (booleans, conflicts, branches, propagations) and presolve reductions.
+    """
+    response = solver.ResponseProto()
+    solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    objective = solver.ObjectiveValue() if solved else None
+    best_bound = solver.BestObjectiveBound() if solved else None
+    return {
+        "phase": phase,
+        "status": solver.StatusName(status),
+        "objective": objective,
+        "best_bound": best_bound,
+        "gap": abs(objective - best_bound) / max(1.0, abs(objective)) if solved else None,
+        "wall_seconds": round(solver.WallTime(), 3),
+        "cpu_seconds": round(solver.UserTime(), 3),
+        "deterministic_time": round(response.deterministic_time, 3),
+        "booleans": response.num_booleans,
+        "conflicts": response.num_conflicts,
+        "branches": response.num_branches,
+        "propagations": response.num_binary_propagations + response.num_integer_propagations,
+        # The response counts booleans and integers on the presolved model
+        "presolve": {"variables": num_variables,
+                     "presolved_booleans": response.num_booleans,
+                     "presolved_integers": response.num_integers,
+                     "fixed_booleans": response.num_fixed_booleans},
+    }
+
+
+def merge_component_metrics(component_metrics: List[dict], total_seconds: float) -> dict:
+    """
+    Combines the metrics of independently solved components: counters and CPU
+    time add up, wall time is that of the slowest component (they run in
+    parallel), and a phase takes the worst status of any component.
+    """
+    status_rank = ["OPTIMAL", "FEASIBLE", "UNKNOWN", "MODEL_INVALID", "INFEASIBLE"]
+    models = [metrics["model"] for metrics in component_metrics if metrics["model"]]
+    merged_model = None
+    if models:
+        merged_model = {"variables": sum(model["variables"] for model in models),
+                        "constraints": sum(model["constraints"] for model in models),
+                        "build_seconds": max(model["build_seconds"] for model in models)}
+
+    phases = {}
+    for metrics in component_metrics:
+        for entry in metrics["phases"]:
+            merged = phases.get(entry["phase"])
+            if merged is None:
+                phases[entry["phase"]] = dict(entry, presolve=dict(entry["presolve"]), hints=dict(entry["hints"]))
+                continue
+            for key in ("cpu_seconds", "deterministic_time", "booleans", "conflicts", "branches", "propagations"):
+                merged[key] = round(merged[key] + entry[key], 3)
+            for key in merged["presolve"]:
+                merged["presolve"][key] += entry["presolve"][key]
+            merged["hints"]["hinted"] += entry["hints"]["hinted"]
+            if merged["hints"]["kept"] is not None or entry["hints"]["kept"] is not None:
+                merged["hints"]["kept"] = (merged["hints"]["kept"] or 0) + (entry["hints"]["kept"] or 0)
+            merged["wall_seconds"] = max(merged["wall_seconds"], entry["wall_seconds"])
+            if status_rank.index(entry["status"]) > status_rank.index(merged["status"]):
+                merged["status"] = entry["status"]
+            if merged["objective"] is None or entry["objective"] is None:
+                merged["objective"] = merged["best_bound"] = merged["gap"] = None
+            else:
+                merged["objective"] += entry["objective"]
+                merged["best_bound"] += entry["best_bound"]
+                merged["gap"] = abs(merged["objective"] - merged["best_bound"]) / max(1.0, abs(merged["objective"]))
+    return {"model": merged_model, "phases": list(phases.values()), "components": component_metrics,
+            "total_seconds": round(total_seconds, 3)}
+
+
+def group_students_by_enrollment(student_course_map: Dict[str, List[str]],
+                                 course_filter=None) -> Dict[frozenset, int]:
     """
-    Example: "Monday 9am-10am" -> "Monday"
-    Adjust if your actual string format is different.
+    Groups students whose enrolled courses are identical.
+
+    Students with the same course list produce identical conflict constraints,
+    so the solver only needs one set of conflict variables per group, weighted
+    by the number of students in it.
+
+    Args:
+        student_course_map (dict): Mapping of student identifiers to lists of courses.
+        course_filter (callable, optional): Keeps only the courses for which it returns True.
+
+    Returns:
+        dict: Mapping of enrollment signature (frozenset of courses) to group size.
+              Signatures with fewer than two courses can never clash and are omitted.
     """
-    return time_slot.split()[0]
+    groups = defaultdict(int)
+    for enrolled in student_course_map.values():
+        signature = frozenset(c_id for c_id in enrolled
+                              if course_filter is None or course_filter(c_id))
+        if len(signature) > 1:
+            groups[signature] += 1
+    return dict(groups)
+
+
+def build_coenrollment_matrix(student_course_map: Dict[str, List[str]],
+                              course_filter=None) -> Dict[tuple, int]:
+    """
+    Builds the weighted course-pair graph: how many students take both courses.
+
+    Args:
+        student_course_map (dict): Mapping of student identifiers to lists of courses.
+        course_filter (callable, optional): Keeps only the courses for which it returns True.
+
+    Returns:
+        dict: Mapping of (course_a, course_b) with course_a < course_b to the shared headcount.
+    """
+    coenrollment = defaultdict(int)
+    for signature, group_size in group_students_by_enrollment(student_course_map, course_filter).items():
+        ordered = sorted(signature)
+        for i in range(len(ordered)):
+            for j in range(i + 1, len(ordered)):
+                coenrollment[(ordered[i], ordered[j])] += group_size
+    return dict(coenrollment)
+
+
+def find_course_components(courses: Dict[str, Dict[str, List[str]]],
+                           student_course_map: Dict[str, List[str]],
+                           course_professor_map: Dict[str, Union[str, List[str]]]) -> List[set]:
+    """
+    Splits the courses into independent groups. Two courses are connected
+    when they share a student or a professor; courses in different groups
+    never interact unless slot capacity is binding.
+
+    Args:
+        courses (dict): Course dictionary as produced by create_course_dictionary.
+        student_course_map (dict): Mapping of student identifiers to lists of courses.
+        course_professor_map (dict): Mapping of courses to a professor or list of professors.
+
+    Returns:
+        list: Sets of course ids, largest component first.
+    """
+    parent = {c_id: c_id for c_id in courses}
+
+    def find(c_id):
+        while parent[c_id] != c_id:
+            parent[c_id] = parent[parent[c_id]]
+            c_id = parent[c_id]
+        return c_id
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    for enrolled in student_course_map.values():
+        present = [c_id for c_id in enrolled if c_id in parent]
+        for c_id in present[1:]:
+            union(present[0], c_id)
+
+    first_course_of_prof = {}
+    for c_id, profs in course_professor_map.items():
+        if c_id not in parent:
+            continue
+        if isinstance(profs, str):
+            profs = [profs]
+        elif profs is None:
+            profs = []
+        for prof in profs:
+            if prof in first_course_of_prof:
+                union(first_course_of_prof[prof], c_id)
+            else:
+                first_course_of_prof[prof] = c_id
+
+    components = defaultdict(set)
+    for c_id in parent:
+        components[find(c_id)].add(c_id)
+    return sorted(components.values(), key=len, reverse=True)
+
+
+def add_consecutive_day_penalties(model: cp_model.CpModel, course_time_vars: Dict[str, dict],
+                                  slot_catalog: SlotCatalog, consec_lit) -> list:
+    """
+    Adds the PHASE 6 consecutive-day penalty for every course.
+
+    Each course gets one "scheduled on this day" indicator per day that takes
+    part in an adjacent day pair, shared by both pairs it belongs to, and one
+    penalty variable per adjacent pair of days it can use. The penalty is
+    forced to 1 when the course meets on both days, but only while consec_lit
+    is assumed true.
+
+    Args:
+        model (cp_model.CpModel): Model to extend.
+        course_time_vars (dict): Course ID -> {slot id: BoolVar}.
+        slot_catalog (SlotCatalog): Catalog the slot ids belong to.
+        consec_lit: Phase 6 enforcement literal.
+
+    Returns:
+        list: The penalty variables, one per (course, adjacent day pair).
+    """
+    penalty_vars = []
+    paired_days = {day for pair in slot_catalog.adjacent_day_pairs for day in pair}
+    for c_id, slot_dict in course_time_vars.items():
+        day_vars = defaultdict(list)
+        for s, var in slot_dict.items():
+            d_idx = slot_catalog.day_index[s]
+            if d_idx in paired_days:
+                day_vars[d_idx].append(var)
+
+        # One indicator per (course, day): 1 if the course meets at any time that day
+        on_day = {}
+        for d_idx, var_list in day_vars.items():
+            on_day[d_idx] = model.NewBoolVar(f'{c_id}_on_{slot_catalog.day_names[d_idx]}')
+            model.AddMaxEquality(on_day[d_idx], var_list)
+
+        for d1, d2 in slot_catalog.adjacent_day_pairs:
+            if d1 in on_day and d2 in on_day:
+                cv = model.NewBoolVar(f'consec_{c_id}_{slot_catalog.day_names[d1]}_{slot_catalog.day_names[d2]}')
+                # cv => (on d1 AND on d2)
+                model.AddBoolAnd([on_day[d1], on_day[d2]]).OnlyEnforceIf(cv)
+                # not cv => (not on d1 OR not on d2), only while phase 6 is active
+                model.AddBoolOr([on_day[d1].Not(), on_day[d2].Not()]).OnlyEnforceIf([cv.Not(), consec_lit])
+                penalty_vars.append(cv)
+    return penalty_vars
+
+
+def slot_capacity_can_bind(courses: Dict[str, Dict[str, List[str]]], max_classes_per_slot: int) -> bool:
+    """
+    A course occupies a slot at most once, so the capacity limit can only
+    bind in a slot that more than max_classes_per_slot courses could use.
+    """
+    usage = defaultdict(int)
+    for info in courses.values():
+        for slot in info['time_slots']:
+            usage[slot] += 1
+    return any(count > max_classes_per_slot for count in usage.values())
+
+
+def _watch_stop_event(stop_event, done: threading.Event, on_stop, poll_seconds: float = 0.1):
+    """
+    Polls stop_event from a helper thread and calls on_stop once it is set.
+
+    Returns without calling on_stop when done is set first. stop_event can
+    be anything with is_set(), including a multiprocessing Manager event.
+    """
+    while not stop_event.is_set():
+        if done.wait(poll_seconds):
+            return
+    on_stop()
+
+
+def _solve_component(job):
+    """Process-pool entry point: solves one bucket of independent courses."""
+    return schedule_courses(**job)
+
+
+def _failed_phase(message: str) -> int:
+    """Phase number an infeasibility or early-stop message refers to (0 if none)."""
+    match = re.search(r"PHASE (\d)", message)
+    return int(match.group(1)) if match else 0
+
+
+def _collect_component_results(pool: ProcessPoolExecutor, jobs: List[dict], progress_callback=None) -> list:
+    """Runs the component jobs on the pool, reporting each finished bucket."""
+    results = []
+    for result in pool.map(_solve_component, jobs):
+        results.append(result)
+        if progress_callback:
+            progress_callback({"phase": f"COMPONENTS {len(results)}/{len(jobs)}"})
+    return results
+
+
+def solve_components_in_parallel(components: List[set], courses, student_course_map,
+                                 course_professor_map, max_workers: int = None, return_metrics: bool = False,
+                                 **schedule_kwargs) -> tuple:
+    """
+    Solves independent course components in separate processes and merges
+    the resulting schedules.
+
+    Components are packed into at most max_workers buckets (largest first,
+    each into the lightest bucket) so tiny components do not each pay for
+    a process round trip. Each bucket is solved with schedule_courses.
+
+    Returns:
+        tuple: (merged_schedule_dataframe, message), plus the merged metrics
+               (see merge_component_metrics) with return_metrics. If any bucket
+               fails, the failure from the earliest phase is returned with an
+               empty DataFrame, which is what the monolithic model would have reported.
+    """
+    started = time.time()
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(components)))
+
+    buckets = [set() for _ in range(workers)]
+    bucket_weights = [0] * workers
+    for component in sorted(components, key=lambda comp: sum(len(courses[c_id]['time_slots']) for c_id in comp),
+                            reverse=True):
+        lightest = bucket_weights.index(min(bucket_weights))
+        buckets[lightest].update(component)
+        bucket_weights[lightest] += sum(len(courses[c_id]['time_slots']) for c_id in component)
+
+    # Share the CP-SAT worker threads between the processes instead of
+    # letting every process claim the whole machine.
+    solver_params = schedule_kwargs.pop("solver_params", None)
+    if solver_params and solver_params.get("num_workers"):
+        solver_params = dict(solver_params, num_workers=max(1, solver_params["num_workers"] // workers))
+
+    # Solution callbacks cannot cross process boundaries, so pooled buckets
+    # only report when they finish.
+    progress_callback = schedule_kwargs.pop("progress_callback", None)
+    stop_event = schedule_kwargs.pop("stop_event", None)
+    export_dir = schedule_kwargs.pop("export_dir", None)
+
+    jobs = []
+    for bucket_idx, bucket in enumerate(buckets):
+        sub_students = {}
+        for student_id, enrolled in student_course_map.items():
+            in_bucket = [c_id for c_id in enrolled if c_id in bucket]
+            if in_bucket:
+                sub_students[student_id] = in_bucket
+        jobs.append(dict(courses={c_id: courses[c_id] for c_id in bucket},
+                         student_course_map=sub_students,
+                         course_professor_map={c_id: profs for c_id, profs in course_professor_map.items()
+                                               if c_id in bucket},
+                         decompose=False,
+                         solver_params=solver_params,
+                         progress_callback=progress_callback if workers == 1 else None,
+                         stop_event=stop_event,
+                         export_dir=os.path.join(export_dir, f"component_{bucket_idx}") if export_dir else None,
+                         return_metrics=True,
+                         **schedule_kwargs))
+
+    print(f"[INFO] Solving {len(components)} independent components in {workers} process(es)")
+    if workers == 1:
+        results = [_solve_component(job) for job in jobs]
+    elif stop_event is None:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = _collect_component_results(pool, jobs, progress_callback)
+    else:
+        # A threading.Event cannot be pickled; relay it to a Manager event
+        # that every worker process can poll.
+        with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+            shared_stop = manager.Event()
+            for job in jobs:
+                job["stop_event"] = shared_stop
+            relay_done = threading.Event()
+            threading.Thread(target=_watch_stop_event, args=(stop_event, relay_done, shared_stop.set),
+                             daemon=True).start()
+            try:
+                results = _collect_component_results(pool, jobs, progress_callback)
+            finally:
+                relay_done.set()
+
+    metrics = merge_component_metrics([component_metrics for _, _, component_metrics in results],
+                                      time.time() - started)
+    failures = [message for schedule_df, message, _ in results if schedule_df.empty]
+    if failures:
+        outcome = pd.DataFrame(columns=["Course ID", "Scheduled Time"]), min(failures, key=_failed_phase)
+    else:
+        merged = pd.concat([schedule_df for schedule_df, _, _ in results], ignore_index=True)
+        stopped = [message for _, message, _ in results if message.startswith("STOPPED EARLY")]
+        # Every bucket runs the same phases, so they all report the same final phase
+        outcome = merged, min(stopped, key=_failed_phase) if stopped else results[0][1]
+        stopped_components = [component_metrics["stopped_early"] for _, _, component_metrics in results
+                              if component_metrics.get("stopped_early")]
+        if stopped_components:
+            # The merged schedule is as good as its weakest component
+            metrics["stopped_early"] = {
+                "phase": min((entry["phase"] for entry in stopped_components), key=_failed_phase),
+                "stopped_early": True,
+                "schedule_phase": min((entry["schedule_phase"] for entry in stopped_components), key=_failed_phase),
+                "gap": max(entry["gap"] for entry in stopped_components)}
+            # A single bucket solved in this process has already reported it
+            if progress_callback and workers > 1:
+                progress_callback(dict(metrics["stopped_early"]))
+    return (*outcome, metrics) if return_metrics else outcome
 
 
 def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
@@ -23,7 +511,18 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
                      add_student_conflicts: bool = True,
                      add_no_same_day: bool = True,
                      add_no_consec_days: bool = False,                
-                     max_classes_per_slot: int = 24) -> tuple[pd.DataFrame, str]:
+                     max_classes_per_slot: int = 24,
+                     conflict_mode: str = "student",
+                     decompose: bool = True,
+                     max_workers: int = None,
+                     solver_params: dict = None,
+                     progress_callback=None,
+                     stop_event=None,
+                     slot_catalog: SlotCatalog = None,
+                     diagnosis_mode: str = "phases",
+                     heuristic_hints: bool = True,
+                     export_dir: str = None,
+                     return_metrics: bool = False) -> tuple:
     """
     Debug-friendly scheduling function with incremental constraint phases:
 
@@ -33,13 +532,86 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
       PHASE 4) Student conflicts (soft) -> penalize scheduling multiple courses for one student in the same slot.
                Additionally, a very soft extra penalty is added if a student's two required courses clash.
       PHASE 5) No same course twice on the same day (hard constraint).
+      PHASE 6) Consecutive-day penalty (soft, only when add_no_consec_days is set).
+
+    The CP-SAT model is built once. Every constraint family is guarded by a
+    phase enforcement literal and each phase is solved under assumptions that
+    switch the families of that phase on, so nothing is rebuilt between phases.
+
+    conflict_mode selects the PHASE 4 formulation:
+      "student"     -> one conflict variable per (enrollment signature, slot).
+      "course_pair" -> one conflict variable per (co-enrolled course pair, shared slot),
+                       weighted by the number of students taking both courses. A student
+                       with three courses in one slot counts as three pair clashes here.
+
+    When decompose is set and slot capacity cannot bind (disabled, or no slot
+    is usable by more than max_classes_per_slot courses), courses that share
+    no students and no professor are split into independent components that
+    are solved in a process pool of up to max_workers processes and merged.
+    Otherwise everything is solved as one coordinated model.
+
+    solver_params holds CP-SAT parameters (see SOLVER_PARAMETER_TYPES). Missing
+    or None entries are auto-tuned from the instance size.
+
+    progress_callback, if given, is called with a dict when a phase starts and
+    for every improving solution found in it (see PhaseProgressCallback).
+
+    stop_event (e.g. a threading.Event) stops the search once it is set. The
+    phase that is running is interrupted, no further phases are solved, and
+    the best schedule found so far is returned with a "STOPPED EARLY" message
+    naming the phase it satisfies and its optimality gap. Only a schedule from
+    a phase that enforces every enabled hard constraint family (professor
+    clashes, slot capacity, no same day) is returned; otherwise the schedule
+    is empty.
+
+    A phase that ends without a solution or an infeasibility proof (its time
+    limit ran out) stops the run with an empty schedule and a
+    "PHASE n TIMED OUT" message.
+
+    Course time slots may be "Day HH:MM" labels or integer ids of slot_catalog.
+    The model is built on integer slot ids; labels only appear in the returned
+    schedule. Without a catalog, one is built from the labels in courses.
+
+    diagnosis_mode selects how infeasibility is located:
+      "phases" -> solve the phases in order and report the first that fails.
+      "core"   -> one assumption-based solve over per-professor, per-slot and
+                  per-course constraint groups (see diagnose_infeasibility). An
+                  infeasible instance is reported with the culprits from the
+                  unsat core; a feasible one is solved in its final phase only.
+
+    With heuristic_hints, the greedy DSatur timetable (see dsatur_schedule)
+    is computed first and every course it placed completely is handed to the
+    first solve as a hint.
+
+    export_dir, if given, receives the model proto, solver parameters and
+    final response of every phase solve plus a manifest mapping variable
+    indices back to (course, slot), for offline replay (see model_export).
+    Independent components are exported to component_<n> subdirectories.
+
+    With return_metrics, a metrics dict is returned as a third element:
+    "model" (variables, constraints, build_seconds; None if no model was
+    built), "phases" (one phase_metrics entry per solve, with the number of
+    "hints" handed in and kept by the solution), "total_seconds",
+    for decomposed instances the per-component "components", and after an
+    early stop with a schedule the "stopped_early" progress update (for
+    decomposed instances: the weakest component's phase and largest gap).
 
     If a phase is infeasible, we return an empty DataFrame and an error message.
     If all phases succeed, we return the schedule and success message.
 
     Returns:
-        tuple: (schedule_dataframe, infeasibility_reason_or_success_message)
+        tuple: (schedule_dataframe, infeasibility_reason_or_success_message),
+               plus the metrics dict with return_metrics
     """
+    started = time.time()
+    metrics = {"model": None, "phases": [], "total_seconds": None}
+
+    def finish(schedule_df: pd.DataFrame, message: str) -> tuple:
+        """Return value of schedule_courses, with the metrics when they were asked for."""
+        if not return_metrics:
+            return schedule_df, message
+        metrics["total_seconds"] = round(time.time() - started, 3)
+        return schedule_df, message, metrics
 
     # ---------------------------------------------------------
     # Parameters you can tweak
@@ -50,6 +622,16 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
     NON_PREFERRED_SLOTS = 50
     CONSEC_CONFLICT_WEIGHT = 100
 
+    if conflict_mode not in STUDENT_CONFLICT_MODES:
+        raise ValueError(f"Unknown conflict_mode '{conflict_mode}', "
+                         f"expected one of {STUDENT_CONFLICT_MODES}")
+    if diagnosis_mode not in DIAGNOSIS_MODES:
+        raise ValueError(f"Unknown diagnosis_mode '{diagnosis_mode}', "
+                         f"expected one of {DIAGNOSIS_MODES}")
+
+    # Work on integer slot ids from here on; labels only come back in the output
+    slot_catalog, courses = courses_to_slot_ids(courses, slot_catalog)
+
     # ---------------------------------------------------------
     # Early validation: Check if we have any time slots at all
     # ---------------------------------------------------------
@@ -65,25 +647,285 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
                     "• Time slot data was not loaded properly\n\n"
                     "Please check the time slot configuration and try again.")
         print(f"[CRITICAL ERROR] {error_msg}")
-        return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg
+        return finish(pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg)
 
     print(f"[INFO] Found {len(all_available_slots)} unique time slots available for scheduling")
 
+    solver_params = resolve_solver_parameters(solver_params, len(courses), len(all_available_slots),
+                                              len(student_course_map))
+    print(f"[SOLVER] Parameters: {solver_params}")
+
+    # ---------------------------------------------------------
+    # Combinatorial pre-checks: catch the common infeasibilities
+    # (slots per course, professor load, total capacity, distinct days)
+    # without invoking the solver.
+    # ---------------------------------------------------------
+    presolve_problems = find_presolve_problems(courses, course_professor_map, course_classes_per_week,
+                                               add_prof_constraints, add_timeslot_capacity, add_no_same_day,
+                                               MAX_CLASSES_PER_SLOT, slot_catalog)
+    if presolve_problems:
+        error_msg = presolve_failure_message(presolve_problems)
+        print(f"[PRE-CHECK] {error_msg}")
+        return finish(pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg)
+
+    # ---------------------------------------------------------
+    # Independent sub-timetables: only safe while slot capacity cannot
+    # couple otherwise unrelated courses.
+    # ---------------------------------------------------------
+    if decompose:
+        if add_timeslot_capacity and slot_capacity_can_bind(courses, MAX_CLASSES_PER_SLOT):
+            print("[INFO] Slot capacity can bind; solving all courses as one coordinated model")
+        else:
+            components = find_course_components(courses, student_course_map,
+                                                course_professor_map if add_prof_constraints else {})
+            if len(components) > 1:
+                return solve_components_in_parallel(
+                    components, courses, student_course_map, course_professor_map,
+                    max_workers=max_workers,
+                    course_classes_per_week=course_classes_per_week,
+                    course_type=course_type,
+                    non_preferred_slots=non_preferred_slots,
+                    add_prof_constraints=add_prof_constraints,
+                    add_timeslot_capacity=add_timeslot_capacity,
+                    add_student_conflicts=add_student_conflicts,
+                    add_no_same_day=add_no_same_day,
+                    add_no_consec_days=add_no_consec_days,
+                    max_classes_per_slot=max_classes_per_slot,
+                    conflict_mode=conflict_mode,
+                    progress_callback=progress_callback,
+                    stop_event=stop_event,
+                    slot_catalog=slot_catalog,
+                    diagnosis_mode=diagnosis_mode,
+                    heuristic_hints=heuristic_hints,
+                    export_dir=export_dir,
+                    return_metrics=return_metrics,
+                    solver_params=solver_params)
+
+    # ---------------------------------------------------------
+    # Unsat-core diagnosis: locate the culprits in one solve instead of
+    # walking the phases.
     # ---------------------------------------------------------
-    # Quick Pre-Check for "classes per week > available slots" problems
+    diagnosed_feasible = False
+    if diagnosis_mode == "core":
+        diagnosis_started = time.time()
+        diagnosis = diagnose_infeasibility(courses, course_professor_map, course_classes_per_week,
+                                           add_prof_constraints, add_timeslot_capacity, add_no_same_day,
+                                           MAX_CLASSES_PER_SLOT, slot_catalog,
+                                           num_workers=solver_params["num_workers"],
+                                           max_time_in_seconds=solver_params["max_time_in_seconds"])
+        metrics["diagnosis_seconds"] = round(time.time() - diagnosis_started, 3)
+        if diagnosis["feasible"] is False:
+            print(f"[DEBUG] {diagnosis['message']}")
+            return finish(pd.DataFrame(columns=["Course ID", "Scheduled Time"]), diagnosis["message"])
+        diagnosed_feasible = bool(diagnosis["feasible"])
+
     # ---------------------------------------------------------
-    for c_id, info in courses.items():
-        needed = course_classes_per_week.get(c_id, 2)  # default if missing
-        possible = len(info["time_slots"])
-        if needed > possible:
-            error_msg = (f"PHASE 1 PRE-CHECK FAILED: Course '{c_id}' needs {needed} sessions "
-                        f"but only has {possible} slot(s) available.\n\n"
-                        f"Solutions:\n"
-                        f"• Add more time slots to the schedule\n"
-                        f"• Check if professor busy slots are too restrictive\n"
-                        f"• Verify course classes per week requirements are correct")
-            print(f"[PRE-CHECK] {error_msg}")
-            return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg
+    # Build ONE model for every phase. Each constraint family is
+    # guarded by a phase enforcement literal, and every phase is then
+    # solved under assumptions instead of rebuilding the model.
+    # ---------------------------------------------------------
+    build_started = time.time()
+    model = cp_model.CpModel()
+
+    conflict_vars          = []
+    conflict_required_vars = []
+    slot_penalty_vars      = []
+    consec_conflict_vars   = []
+
+    # Phase literals: only created for families that are toggled on.
+    # A family whose literal is missing is simply never enforced.
+    phase_lits = {}
+    for family, enabled in (("prof", add_prof_constraints),
+                            ("cap", add_timeslot_capacity),
+                            ("conf", add_student_conflicts),
+                            ("same", add_no_same_day),
+                            ("consec", add_no_consec_days)):
+        if enabled:
+            phase_lits[family] = model.NewBoolVar(f'phase_{family}')
+
+    # Create bool vars: course_time_vars[c][slot] = 1 if c is in slot
+    course_time_vars = {}
+    time_slot_count_vars = defaultdict(list)  # for capacity constraints
+
+    for c_id, c_info in courses.items():
+        slot_dict = {}
+        for slot in c_info['time_slots']:
+            var = model.NewBoolVar(f'{c_id}_{slot}')
+            slot_dict[slot] = var
+            time_slot_count_vars[slot].append(var)
+        course_time_vars[c_id] = slot_dict
+
+    # PHASE 1) Each course must appear exactly 'course_classes_per_week[c_id]' times
+    # (always active, so it is not guarded by a literal)
+    for c_id, slot_dict in course_time_vars.items():
+        needed = course_classes_per_week.get(c_id, 2)  # fallback if missing
+        model.Add(sum(slot_dict.values()) == needed)
+
+    # PHASE 2) Professor constraints
+    if "prof" in phase_lits:
+        prof_lit = phase_lits["prof"]
+        prof_dict = defaultdict(list)
+        for c_id, profs in course_professor_map.items():
+            # Handle both single professor (string) and multiple professors (list)
+            if isinstance(profs, str):
+                profs = [profs]
+            elif profs is None:
+                profs = []
+
+            # Add course to each professor's list
+            for prof in profs:
+                prof_dict[prof].append(c_id)
+
+        for prof, c_list in prof_dict.items():
+            # For each time slot, a professor cannot teach more than one course
+            slot_map = defaultdict(list)
+            for pc_id in c_list:
+                if pc_id in course_time_vars:
+                    for s, v in course_time_vars[pc_id].items():
+                        slot_map[s].append(v)
+            for s, var_list in slot_map.items():
+                if len(var_list) > 1:
+                    # AddAtMostOne cannot carry an enforcement literal
+                    model.Add(sum(var_list) <= 1).OnlyEnforceIf(prof_lit)
+
+    # PHASE 3) Time slot capacity
+    if "cap" in phase_lits:
+        cap_lit = phase_lits["cap"]
+        for slot, var_list in time_slot_count_vars.items():
+            model.Add(sum(var_list) <= MAX_CLASSES_PER_SLOT).OnlyEnforceIf(cap_lit)
+
+    # PHASE 4) Student conflicts (soft)
+    # In "student" mode students are grouped by their enrollment signature,
+    # so there is one conflict_var per (group, slot) weighted by group size.
+    # Either way a conflict var can only be 1 for a real clash; it is forced
+    # to 1 for a clash only while the phase literal is assumed true.
+    if "conf" in phase_lits and conflict_mode == "course_pair":
+        # Course-pair formulation: penalise each (co-enrolled pair, shared slot)
+        # overlap by the number of students the two courses have in common.
+        conf_lit = phase_lits["conf"]
+        coenrollment = build_coenrollment_matrix(
+            student_course_map, lambda c_id: c_id in course_time_vars)
+        print(f"[INFO] Student conflicts: {len(student_course_map)} students "
+              f"-> {len(coenrollment)} co-enrolled course pairs")
+        for (c_a, c_b), headcount in coenrollment.items():
+            slots_b = course_time_vars[c_b]
+            for s, v_a in course_time_vars[c_a].items():
+                if s in slots_b:
+                    v_b = slots_b[s]
+                    # pair_var = 1 exactly when both courses sit in slot s
+                    pair_var = model.NewBoolVar(f'pair_conflict_{c_a}_{c_b}_{s}')
+                    model.AddImplication(pair_var, v_a)
+                    model.AddImplication(pair_var, v_b)
+                    model.AddBoolOr([v_a.Not(), v_b.Not()]).OnlyEnforceIf([pair_var.Not(), conf_lit])
+                    conflict_vars.append((pair_var, headcount))
+    elif "conf" in phase_lits:
+        conf_lit = phase_lits["conf"]
+        student_groups = group_students_by_enrollment(
+            student_course_map, lambda c_id: c_id in course_time_vars)
+        print(f"[INFO] Student conflicts: {len(student_course_map)} students "
+              f"-> {len(student_groups)} enrollment signatures")
+        for group_idx, (signature, group_size) in enumerate(student_groups.items()):
+            # Build mapping: time slot -> list of booleans for this group's courses
+            slot_map = defaultdict(list)
+            for c_id in signature:
+                for s, v in course_time_vars[c_id].items():
+                    slot_map[s].append(v)
+            for s, var_list in slot_map.items():
+                if len(var_list) > 1:
+                    # conflict_var = 1 if sum(var_list) >= 2
+                    conflict_var = model.NewBoolVar(f'conflict_g{group_idx}_{s}')
+                    model.Add(sum(var_list) >= 2).OnlyEnforceIf(conflict_var)
+                    model.Add(sum(var_list) <= 1).OnlyEnforceIf([conflict_var.Not(), conf_lit])
+                    conflict_vars.append((conflict_var, group_size))
+
+    # Additional very soft constraint: Avoid conflict between two Required courses
+    if "same" in phase_lits:
+        same_lit = phase_lits["same"]
+        # Only the 'Required' courses matter here, so group on those alone
+        required_groups = group_students_by_enrollment(
+            student_course_map,
+            lambda c_id: c_id in course_time_vars and course_type.get(c_id, "Elective") == "Required")
+        for group_idx, (signature, group_size) in enumerate(required_groups.items()):
+            slot_map_req = defaultdict(list)
+            for c_id in signature:
+                for s, v in course_time_vars[c_id].items():
+                    slot_map_req[s].append(v)
+            for s, var_list in slot_map_req.items():
+                if len(var_list) > 1:
+                    conflict_req_var = model.NewBoolVar(f'req_conflict_g{group_idx}_{s}')
+                    model.Add(sum(var_list) >= 2).OnlyEnforceIf(conflict_req_var)
+                    model.Add(sum(var_list) <= 1).OnlyEnforceIf([conflict_req_var.Not(), same_lit])
+                    conflict_required_vars.append((conflict_req_var, group_size))
+
+    # PHASE 5) No same course twice on the same day (hard constraint)
+    if "same" in phase_lits:
+        same_lit = phase_lits["same"]
+        for c_id, slot_dict in course_time_vars.items():
+            # Group the course's slots by day
+            day_map = defaultdict(list)
+            for s, var in slot_dict.items():
+                day_map[slot_catalog.day_index[s]].append(var)
+            # Each day can have at most 1 session of this course
+            for day, var_list in day_map.items():
+                if len(var_list) > 1:
+                    model.Add(sum(var_list) <= 1).OnlyEnforceIf(same_lit)
+
+    # PHASE 6) No classes on consecutive days
+    if "consec" in phase_lits:
+        consec_lit = phase_lits["consec"]
+        consec_conflict_vars.extend(
+            add_consecutive_day_penalties(model, course_time_vars, slot_catalog, consec_lit))
+
+    # We retrieve the course_id and the dictionary
+    # with key as the timeslots and the values as the boolean decision variables
+    non_preferred_ids = set(slot_catalog.to_ids(non_preferred_slots))
+    for c_id, slot_dict in course_time_vars.items():
+        # We retieve the timeslot and the boolean associated with that
+        for s, var in slot_dict.items():
+            if s in non_preferred_ids:
+                slot_penalty_vars.append(var)
+
+    # Objective: minimize student conflicts (with additional required course penalty, if any).
+    # Penalty vars of inactive phases are free and therefore minimised to 0.
+    total_penalty = 0
+    if conflict_vars:
+        total_penalty += STUDENT_CONFLICT_WEIGHT * sum(size * v for v, size in conflict_vars)
+    if conflict_required_vars:
+        total_penalty += REQUIRED_CONFLICT_WEIGHT * sum(size * v for v, size in conflict_required_vars)
+    if slot_penalty_vars:
+        total_penalty += NON_PREFERRED_SLOTS * sum(slot_penalty_vars)
+    if consec_conflict_vars:
+        total_penalty += CONSEC_CONFLICT_WEIGHT * sum(consec_conflict_vars)
+    model.Minimize(total_penalty)
+
+    metrics["model"] = {"variables": len(model.Proto().variables), "constraints": len(model.Proto().constraints),
+                        "build_seconds": round(time.time() - build_started, 3)}
+    print(f"[MODEL] {metrics['model']['variables']} variables, {metrics['model']['constraints']} constraints, "
+          f"built in {metrics['model']['build_seconds']:.2f}s")
+
+    # Phases are strictly nested, so the assignment found by one phase is a
+    # good starting point for the next. Values are kept here between solves.
+    phase_hints = {}
+
+    # The first solve starts from the greedy timetable instead of from scratch
+    if heuristic_hints:
+        draft = dsatur_schedule(courses, student_course_map, course_professor_map, course_classes_per_week,
+                                add_prof_constraints, add_timeslot_capacity, add_no_same_day,
+                                MAX_CLASSES_PER_SLOT, non_preferred_slots, slot_catalog)
+        for c_id, slot_dict in course_time_vars.items():
+            if c_id in draft["unplaced"]:
+                continue
+            chosen = set(draft["assignment"][c_id])
+            for s, var in slot_dict.items():
+                phase_hints[var] = int(s in chosen)
+        print(f"[HEURISTIC] Greedy timetable: {len(draft['unplaced'])} course(s) not fully placed, "
+              f"{draft['student_clashes']} student clashes")
+
+    if export_dir:
+        write_model_manifest(export_dir, course_time_vars, phase_lits, slot_catalog, solver_params)
+
+    # Latest feasible phase, kept so an early stop can return it
+    best_so_far = {"phase": None, "df": None, "gap": None}
 
     def solve_phase(
         phase: str,
@@ -94,194 +936,63 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
         add_consec: bool):
 
         """
-        Builds and solves a new model with specified constraints included.
+        Solves the shared model with the requested constraint families
+        switched on through assumptions on their phase literals, warm-started
+        from the previous feasible phase through solution hints.
         Returns (status, schedule_df).
         """
-        #testing
-        conflict_vars          = []
-        conflict_required_vars = []
-        slot_penalty_vars      = []
-        consec_conflict_vars   = []
-
-        model = cp_model.CpModel()
-
-        # Collect all distinct time slots globally
-        all_time_slots = set()
-        for c_info in courses.values():
-            all_time_slots.update(c_info['time_slots'])
-        all_time_slots = sorted(all_time_slots)
-
-        # Create bool vars: course_time_vars[c][slot] = 1 if c is in slot
-        course_time_vars = {}
-        time_slot_count_vars = defaultdict(list)  # for capacity constraints
-
-        for c_id, c_info in courses.items():
-            slot_dict = {}
-            for slot in c_info['time_slots']:
-                var = model.NewBoolVar(f'{c_id}_{slot}')
-                slot_dict[slot] = var
-                time_slot_count_vars[slot].append(var)
-            course_time_vars[c_id] = slot_dict
-
-        # PHASE 1) Each course must appear exactly 'course_classes_per_week[c_id]' times
-        for c_id, slot_dict in course_time_vars.items():
-            needed = course_classes_per_week.get(c_id, 2)  # fallback if missing
-            model.Add(sum(slot_dict.values()) == needed)
-
-        # PHASE 2) Professor constraints
-        if add_prof:
-            prof_dict = defaultdict(list)
-            for c_id, profs in course_professor_map.items():
-                # Handle both single professor (string) and multiple professors (list)
-                if isinstance(profs, str):
-                    profs = [profs]
-                elif profs is None:
-                    profs = []
-                
-                # Add course to each professor's list
-                for prof in profs:
-                    prof_dict[prof].append(c_id)
-
-            for prof, c_list in prof_dict.items():
-                # For each time slot, a professor cannot teach more than one course
-                slot_map = defaultdict(list)
-                for pc_id in c_list:
-                    if pc_id in course_time_vars:
-                        for s, v in course_time_vars[pc_id].items():
-                            slot_map[s].append(v)
-                for s, var_list in slot_map.items():
-                    if len(var_list) > 1:
-                        model.AddAtMostOne(var_list)
-
-        # PHASE 3) Time slot capacity
-        if add_cap:
-            for slot, var_list in time_slot_count_vars.items():
-                model.Add(sum(var_list) <= MAX_CLASSES_PER_SLOT)
-
-        # PHASE 4) Student conflicts (soft)
-        conflict_vars = []
-        if add_conf:
-            for student_id, enrolled in student_course_map.items():
-                # Build mapping: time slot -> list of booleans for this student's courses
-                slot_map = defaultdict(list)
-                for c_id in enrolled:
-                    if c_id in course_time_vars:
-                        for s, v in course_time_vars[c_id].items():
-                            slot_map[s].append(v)
-                for s, var_list in slot_map.items():
-                    if len(var_list) > 1:
-                        # conflict_var = 1 if sum(var_list) >= 2
-                        conflict_var = model.NewBoolVar(f'conflict_{student_id}_{s}')
-                        model.Add(sum(var_list) >= 2).OnlyEnforceIf(conflict_var)
-                        model.Add(sum(var_list) <= 1).OnlyEnforceIf(conflict_var.Not())
-                        conflict_vars.append(conflict_var)
-
-        # Additional very soft constraint: Avoid conflict between two Required courses
-        conflict_required_vars = []
-        if add_same:
-            for student_id, enrolled in student_course_map.items():
-                # Filter only the courses that are marked as 'Required'
-                required_courses = [c_id for c_id in enrolled if course_type.get(c_id, "Elective") == "Required"]
-                slot_map_req = defaultdict(list)
-                for c_id in required_courses:
-                    if c_id in course_time_vars:
-                        for s, v in course_time_vars[c_id].items():
-                            slot_map_req[s].append(v)
-                for s, var_list in slot_map_req.items():
-                    if len(var_list) > 1:
-                        conflict_req_var = model.NewBoolVar(f'req_conflict_{student_id}_{s}')
-                        model.Add(sum(var_list) >= 2).OnlyEnforceIf(conflict_req_var)
-                        model.Add(sum(var_list) <= 1).OnlyEnforceIf(conflict_req_var.Not())
-                        conflict_required_vars.append(conflict_req_var)
-
-        # PHASE 5) No same course twice on the same day (hard constraint)
-        if add_same:
-            for c_id, slot_dict in course_time_vars.items():
-                # Group the course's slots by day
-                day_map = defaultdict(list)
-                for s, var in slot_dict.items():
-                    day = get_day_from_time_slot(s)
-                    day_map[day].append(var)
-                # Each day can have at most 1 session of this course
-                for day, var_list in day_map.items():
-                    if len(var_list) > 1:
-                        model.Add(sum(var_list) <= 1)
-        
-        # PHASE 6) No classes on consecutive days
-        if add_consec:
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            day_to_index = {day: idx for idx, day in enumerate(day_order)}
-            
-            for c_id, slot_dict in course_time_vars.items():
-                day_vars = defaultdict(list) # empty-list as keys; can use append
-                for s, var in slot_dict.items(): # Fetches from the slot dictionary of the given course c_id. (s -> slot, var -> CP-SAT BOOL VAR) 
-                    day = get_day_from_time_slot(s)
-                    day_vars[day].append(var)
-                # Instead, turn it into a penalty
-                    print("USING NEW LOGIC!!!!!!!!!!!!!!!!!!!!!!")
-                    
-                    for i in range(len(day_order)-1):
-                        d1, d2 = day_order[i], day_order[i+1]
-                        if d1 in day_vars and d2 in day_vars:
-                            # indicator if the course is scheduled ANY time on day1 or day2
-                            d1_var = model.NewBoolVar(f'{c_id}_on_{d1}')
-                            d2_var = model.NewBoolVar(f'{c_id}_on_{d2}')
-                            model.AddMaxEquality(d1_var, day_vars[d1])
-                            model.AddMaxEquality(d2_var, day_vars[d2])
-
-                            # build a flag that is 1 exactly when both d1_var & d2_var are 1
-                            cv = model.NewBoolVar(f'consec_{c_id}_{d1}_{d2}')
-                            # cv ⇒ (d1_var AND d2_var)
-                            model.AddBoolAnd([d1_var, d2_var]).OnlyEnforceIf(cv)
-                            # ¬cv ⇒ (¬d1_var OR ¬d2_var)
-                            model.AddBoolOr([d1_var.Not(), d2_var.Not()]).OnlyEnforceIf(cv.Not())
-                            consec_conflict_vars.append(cv)
-            '''
-            for i in range(6): 
-                d1, d2 = day_order[i], day_order[i+1] # Fetches consective days 
-                if d1 in day_vars and d2 in day_vars:
-                    d1_var = model.NewBoolVar(f'{c_id}_on_{d1}')
-                    d2_var = model.NewBoolVar(f'{c_id}_on_{d2}')
-                    model.AddMaxEquality(d1_var, day_vars[d1]) # Binds each *_var to the list of time slots on that day.
-                    model.AddMaxEquality(d2_var, day_vars[d2]) # Same here 
-                    #model.Add(d1_var + d2_var <= 1) # The constraint itsel - course can be scheduled on d1 or d2, but not both.'''
-                
-        slot_penalty_vars = []
-        # We retrieve the course_id and the dictionary 
-        # with key as the timeslots and the values as the boolean decision variables 
-        for c_id, slot_dict in course_time_vars.items(): 
-            # We retieve the timeslot and the boolean associated with that
-            for s, var in slot_dict.items(): 
-                if s in non_preferred_slots: 
-                    slot_penalty_vars.append(var)
-
-        # Objective: minimize student conflicts (with additional required course penalty, if any)
-        total_penalty = 0
-        if conflict_vars:
-            total_penalty += STUDENT_CONFLICT_WEIGHT * sum(conflict_vars)
-        if conflict_required_vars:
-            total_penalty += REQUIRED_CONFLICT_WEIGHT * sum(conflict_required_vars)
-        if slot_penalty_vars: 
-            total_penalty += NON_PREFERRED_SLOTS * sum(slot_penalty_vars)
-        if consec_conflict_vars:
-            total_penalty += CONSEC_CONFLICT_WEIGHT * sum(consec_conflict_vars)
-        model.Minimize(total_penalty)
+        active = {"prof": add_prof, "cap": add_cap, "conf": add_conf,
+                  "same": add_same, "consec": add_consec}
+        model.ClearAssumptions()
+        model.AddAssumptions([lit if active[family] else lit.Not()
+                              for family, lit in phase_lits.items()])
+
+        model.ClearHints()
+        for var, value in phase_hints.items():
+            model.AddHint(var, value)
 
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 60.0  # 1 minute per phase
-        solver.parameters.cp_model_presolve = True
-        solver.parameters.linearization_level = 1
-        status = solver.Solve(model)
+        apply_solver_parameters(solver, solver_params)
+        solve_done = threading.Event()
+        if stop_event is not None:
+            threading.Thread(target=_watch_stop_event, args=(stop_event, solve_done, solver.StopSearch),
+                             daemon=True).start()
+        try:
+            if progress_callback:
+                progress_callback({"phase": phase})
+                status = solver.Solve(model, PhaseProgressCallback(phase, progress_callback))
+            else:
+                status = solver.Solve(model)
+        finally:
+            solve_done.set()
+        if export_dir:
+            export_phase(export_dir, phase, model, solver, status)
+        metrics["phases"].append(phase_metrics(phase, solver, status, metrics["model"]["variables"]))
+        # Values handed in as hints and how many of them the solution kept (None if it found none)
+        metrics["phases"][-1]["hints"] = {"hinted": len(phase_hints), "kept": None}
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             # Count how many violation vars triggered
             consec_violations = sum(int(solver.Value(cv)) for cv in consec_conflict_vars)
-            student_violations = sum(int(solver.Value(v)) for v in conflict_vars)
-            required_violations = sum(int(solver.Value(v)) for v in conflict_required_vars)
+            # Group variables count once per student in the group
+            student_violations = sum(size * int(solver.Value(v)) for v, size in conflict_vars)
+            required_violations = sum(size * int(solver.Value(v)) for v, size in conflict_required_vars)
             nonpref_uses  = sum(int(solver.Value(v)) for v in slot_penalty_vars)
             total_obj     = solver.ObjectiveValue()
-            print(f"[METRICS] consec={consec_violations}, student={student_violations},"
+            print(f"[METRICS] {phase}: consec={consec_violations}, student={student_violations},"
                 f" required={required_violations}, nonpref={nonpref_uses}, obj={total_obj}")
 
+            # Report how much of the warm start survived, then carry this
+            # phase's assignment forward as the hint for the next phase.
+            new_hints = {var: int(solver.Value(var))
+                         for slot_dict in course_time_vars.values()
+                         for var in slot_dict.values()}
+            if phase_hints:
+                kept = sum(1 for var, value in phase_hints.items() if new_hints[var] == value)
+                metrics["phases"][-1]["hints"]["kept"] = kept
+                print(f"[HINTS] {phase}: {kept}/{len(phase_hints)} hinted values kept")
+            phase_hints.clear()
+            phase_hints.update(new_hints)
+
 
         schedule_df = pd.DataFrame(columns=["Course ID", "Scheduled Time"])
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
@@ -289,11 +1000,71 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
             for c_id, slot_dict in course_time_vars.items():
                 for s, var in slot_dict.items():
                     if solver.Value(var) == 1:
-                        rows.append({"Course ID": c_id, "Scheduled Time": s})
+                        rows.append({"Course ID": c_id, "Scheduled Time": slot_catalog.labels[s]})
             schedule_df = pd.DataFrame(rows)
+            objective, bound = solver.ObjectiveValue(), solver.BestObjectiveBound()
+            best_so_far.update(phase=phase, df=schedule_df,
+                               gap=abs(objective - bound) / max(1.0, abs(objective)))
 
         return status, schedule_df
 
+    def stop_requested(phase: str) -> bool:
+        """True once stop_event is set; logs which phase was interrupted."""
+        if stop_event is None or not stop_event.is_set():
+            return False
+        print(f"[SOLVER] Stop requested during {phase}")
+        return True
+
+    # Earliest phase whose schedules respect every enabled hard constraint family
+    complete_phase = max([1] + [number for number, enabled in ((2, add_prof_constraints),
+                                                               (3, add_timeslot_capacity),
+                                                               (5, add_no_same_day)) if enabled])
+
+    def stopped_early(phase: str):
+        """Best schedule found before the stop request, with a STOPPED EARLY message."""
+        if best_so_far["df"] is None:
+            message = f"STOPPED EARLY during {phase}: no feasible schedule was found before the stop request."
+            return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), message
+        if _failed_phase(best_so_far["phase"]) < complete_phase:
+            message = (f"STOPPED EARLY during {phase}: the best schedule found only satisfies "
+                       f"{best_so_far['phase']} constraints, so it was discarded. Let the run finish "
+                       f"to get a schedule that meets every hard constraint.")
+            return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), message
+        message = (f"STOPPED EARLY during {phase}: best schedule found satisfies {best_so_far['phase']} "
+                   f"constraints (gap {best_so_far['gap']:.1%}).")
+        # Kept in the metrics too, so a decomposed solve can report it for its components
+        metrics["stopped_early"] = {"phase": phase, "stopped_early": True, "schedule_phase": best_so_far["phase"],
+                                    "gap": best_so_far["gap"]}
+        if progress_callback:
+            progress_callback(dict(metrics["stopped_early"]))
+        return best_so_far["df"], message
+
+    def timed_out(phase: str):
+        """Empty schedule with a TIMED OUT message, for a phase that ended without a solution or a proof."""
+        message = (f"{phase} TIMED OUT: the solver found no schedule within its "
+                   f"{solver_params['max_time_in_seconds']:g}s time limit. Increase the solver time limit "
+                   f"or relax the constraints, then try again.")
+        print(f"[DEBUG] {message}")
+        return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), message
+
+    # ---------------------------------------------------------
+    # Known feasible: go straight to the final phase. Anything short of a
+    # solution (e.g. a timeout) falls back to the phase-by-phase walk.
+    # ---------------------------------------------------------
+    if diagnosed_feasible:
+        final_phase = "PHASE 6" if add_no_consec_days else "PHASE 5"
+        final_status, final_df = solve_phase(final_phase,
+                                             add_prof=add_prof_constraints,
+                                             add_cap=add_timeslot_capacity,
+                                             add_conf=add_student_conflicts,
+                                             add_same=add_no_same_day,
+                                             add_consec=add_no_consec_days)
+        if stop_requested(final_phase):
+            return finish(*stopped_early(final_phase))
+        if final_status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            print(f"[DEBUG] Schedule found through {final_phase} constraints.")
+            return finish(final_df, f"Schedule found through {final_phase} constraints.")
+
     # ---------------------------------------------------------
     # Phase-by-phase approach
     # ---------------------------------------------------------
@@ -306,15 +1077,13 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
                                    add_same=False,
                                    add_consec=False)
     if p1_status == cp_model.INFEASIBLE:
-        error_msg = ("PHASE 1 FAILED: Basic 'classes per week' constraints cannot be satisfied.\n\n"
-                    "This means one or more courses don't have enough available time slots "
-                    "to meet their classes per week requirements.\n\n"
-                    "Solutions:\n"
-                    "• Add more time slots to the schedule\n"
-                    "• Check if professor busy slots are too restrictive\n"
-                    "• Verify course classes per week requirements are realistic")
+        error_msg = phase_failure_message(1, MAX_CLASSES_PER_SLOT)
         print(f"[DEBUG] {error_msg}")
-        return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg
+        return finish(pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg)
+    if stop_requested("PHASE 1"):
+        return finish(*stopped_early("PHASE 1"))
+    if p1_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return finish(*timed_out("PHASE 1"))
 
     # PHASE 2
     p2_status, p2_df = solve_phase("PHASE 2",
@@ -324,16 +1093,13 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
                                    add_same=False,
                                    add_consec=False)
     if p2_status == cp_model.INFEASIBLE:
-        error_msg = ("PHASE 2 FAILED: Professor scheduling conflicts detected.\n\n"
-                    "One or more professors are assigned to teach multiple courses "
-                    "at the same time, or their busy slots are too restrictive.\n\n"
-                    "Solutions:\n"
-                    "• Review professor assignments for overlapping courses\n"
-                    "• Check professor busy slot selections\n"
-                    "• Consider redistributing courses among professors\n"
-                    "• Add more available time slots for overloaded professors")
+        error_msg = phase_failure_message(2, MAX_CLASSES_PER_SLOT)
         print(f"[DEBUG] {error_msg}")
-        return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg
+        return finish(pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg)
+    if stop_requested("PHASE 2"):
+        return finish(*stopped_early("PHASE 2"))
+    if p2_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return finish(*timed_out("PHASE 2"))
 
     # PHASE 3
     p3_status, p3_df = solve_phase("PHASE 3",
@@ -343,16 +1109,13 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
                                    add_same=False,
                                    add_consec=False)
     if p3_status == cp_model.INFEASIBLE:
-        error_msg = (f"PHASE 3 FAILED: Time slot capacity limit exceeded.\n\n"
-                    f"The current limit of {MAX_CLASSES_PER_SLOT} classes per time slot "
-                    f"is insufficient to accommodate all required course sessions.\n\n"
-                    f"Solutions:\n"
-                    f"• Increase max classes per slot from {MAX_CLASSES_PER_SLOT} in time slot settings\n"
-                    f"• Add more time slots to spread out the course load\n"
-                    f"• Reduce the number of courses or course sections\n"
-                    f"• Consider splitting large courses into multiple sections")
+        error_msg = phase_failure_message(3, MAX_CLASSES_PER_SLOT)
         print(f"[DEBUG] {error_msg}")
-        return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg
+        return finish(pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg)
+    if stop_requested("PHASE 3"):
+        return finish(*stopped_early("PHASE 3"))
+    if p3_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return finish(*timed_out("PHASE 3"))
 
     # PHASE 4
     p4_status, p4_df = solve_phase("PHASE 4",
@@ -362,16 +1125,13 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
                                    add_same=False,
                                    add_consec=False)
     if p4_status == cp_model.INFEASIBLE:
-        error_msg = ("PHASE 4 FAILED: Student conflict constraints (rare).\n\n"
-                    "The soft student conflict constraints are causing infeasibility, "
-                    "which is unusual since they are designed to be flexible.\n\n"
-                    "Solutions:\n"
-                    "• This suggests a deeper scheduling problem\n"
-                    "• Try regenerating with fewer constraint options enabled\n"
-                    "• Review student course enrollments for unusual patterns\n"
-                    "• Contact system administrator")
+        error_msg = phase_failure_message(4, MAX_CLASSES_PER_SLOT)
         print(f"[DEBUG] {error_msg}")
-        return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg
+        return finish(pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg)
+    if stop_requested("PHASE 4"):
+        return finish(*stopped_early("PHASE 4"))
+    if p4_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return finish(*timed_out("PHASE 4"))
 
     # PHASE 5: No same course twice on the same day
     p5_status, p5_df = solve_phase("PHASE 5",
@@ -381,16 +1141,13 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
                                    add_same=add_no_same_day,
                                    add_consec=False)
     if p5_status == cp_model.INFEASIBLE:
-        error_msg = ("PHASE 5 FAILED: 'No same course twice on the same day' constraint.\n\n"
-                    "One or more courses require multiple sessions but only have "
-                    "available time slots on the same day(s).\n\n"
-                    "Solutions:\n"
-                    "• Add time slots on different days\n"
-                    "• Review professor busy slots - some may be blocking too many days\n"
-                    "• Check if courses have realistic classes per week requirements\n"
-                    "• Consider disabling the 'same day' constraint if appropriate")
+        error_msg = phase_failure_message(5, MAX_CLASSES_PER_SLOT)
         print(f"[DEBUG] {error_msg}")
-        return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg
+        return finish(pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg)
+    if stop_requested("PHASE 5"):
+        return finish(*stopped_early("PHASE 5"))
+    if p5_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return finish(*timed_out("PHASE 5"))
 
     print("[DEBUG] Schedule found through PHASE 5 constraints.")
     # PHASE 6: No consecutive days (toggleable)
@@ -402,17 +1159,14 @@ def schedule_courses(courses: Dict[str, Dict[str, List[str]]],
                                        add_same=add_no_same_day,
                                        add_consec=add_no_consec_days)
         if p6_status == cp_model.INFEASIBLE:
-            error_msg = ("PHASE 6 FAILED: 'No consecutive days' constraint.\n\n"
-                        "The requirement to avoid scheduling courses on consecutive days "
-                        "cannot be satisfied with the current time slot configuration.\n\n"
-                        "Solutions:\n"
-                        "• Add more time slots spread across different days\n"
-                        "• Consider disabling the 'consecutive days' constraint\n"
-                        "• Review course classes per week requirements\n"
-                        "• Check professor availability across different days")
+            error_msg = phase_failure_message(6, MAX_CLASSES_PER_SLOT)
             print(f"[DEBUG] {error_msg}")
-            return pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg
+            return finish(pd.DataFrame(columns=["Course ID", "Scheduled Time"]), error_msg)
+        if stop_requested("PHASE 6"):
+            return finish(*stopped_early("PHASE 6"))
+        if p6_status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return finish(*timed_out("PHASE 6"))
         print("[DEBUG] Schedule found through PHASE 6 constraints.")
-        return p6_df, "Schedule found through PHASE 6 constraints."
+        return finish(p6_df, "Schedule found through PHASE 6 constraints.")
 
-    return p5_df, "Schedule found through PHASE 5 constraints."
+    return finish(p5_df, "Schedule found through PHASE 5 constraints.")
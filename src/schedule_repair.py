@@ -0,0 +1,228 @@
+from ortools.sat.python import cp_model
+from typing import Dict, List, Union
+from collections import defaultdict
+from itertools import combinations
+import time
+
+from .slot_catalog import SlotCatalog, courses_to_slot_ids
+
+# Objective weights of the repair model: clashes dominate, moves break ties
+REPAIR_CLASH_WEIGHT = 100
+REPAIR_MOVE_WEIGHT = 1
+
+
+def _professor_courses(course_professor_map: Dict[str, Union[str, List[str]]], course_ids) -> Dict[str, set]:
+    """Professor -> set of their courses (restricted to course_ids)."""
+    prof_courses = defaultdict(set)
+    for c_id, profs in course_professor_map.items():
+        if isinstance(profs, str):
+            profs = [profs]
+        elif profs is None:
+            profs = []
+        if c_id in course_ids:
+            for prof in profs:
+                prof_courses[prof].add(c_id)
+    return prof_courses
+
+
+def _coenrollment(student_course_map: Dict[str, List[str]], course_ids) -> Dict[str, Dict[str, int]]:
+    """Course -> co-enrolled course -> number of shared students."""
+    coenrollment = defaultdict(lambda: defaultdict(int))
+    for enrolled in student_course_map.values():
+        enrolled = sorted({c_id for c_id in enrolled if c_id in course_ids})
+        for c_a, c_b in combinations(enrolled, 2):
+            coenrollment[c_a][c_b] += 1
+            coenrollment[c_b][c_a] += 1
+    return coenrollment
+
+
+def _pair_clashes(assignment: Dict[str, set], coenrollment, involving) -> int:
+    """Students sharing a slot between two courses, counted per course pair, over pairs touching 'involving'."""
+    clashes = 0
+    for c_a in involving:
+        for c_b, headcount in coenrollment[c_a].items():
+            if c_b in involving and c_b < c_a:
+                continue
+            clashes += headcount * len(assignment.get(c_a, set()) & assignment.get(c_b, set()))
+    return clashes
+
+
+def repair_schedule(courses: Dict[str, Dict[str, list]],
+                    student_course_map: Dict[str, List[str]],
+                    course_professor_map: Dict[str, Union[str, List[str]]],
+                    course_classes_per_week: Dict[str, int],
+                    current_schedule: Dict[str, list],
+                    pinned: Dict[str, list],
+                    add_prof_constraints: bool = True,
+                    add_timeslot_capacity: bool = True,
+                    add_no_same_day: bool = True,
+                    max_classes_per_slot: int = 24,
+                    slot_catalog: SlotCatalog = None,
+                    max_time_in_seconds: float = 1.0,
+                    num_workers: int = 8,
+                    free: List[str] = None) -> dict:
+    """
+    Large-neighbourhood repair of an existing timetable after a manual edit
+    or an enrollment change.
+
+    The pinned placements (the admin's edits) are kept and the free courses
+    (e.g. those whose enrollment changed) may move anywhere. The
+    neighbourhood is those seed courses plus every course they collide with:
+    courses sharing a professor or students with a seed and scheduled in one
+    of its slots. Everything outside it stays exactly where it is and
+    only counts towards slot capacity, professor availability and student
+    clashes. The neighbourhood is re-solved with CP-SAT, minimising student
+    clashes first and moved sessions second, under a short time limit, so a
+    repair touches a handful of courses instead of regenerating the timetable.
+
+    Args:
+        courses (dict): Course ID -> {'time_slots': labels or slot ids}.
+        student_course_map (dict): Student -> list of course IDs.
+        course_professor_map (dict): Course ID -> professor or list of professors.
+        course_classes_per_week (dict): Course ID -> sessions per week (default 2).
+        current_schedule (dict): Course ID -> slots it occupies now (edits applied).
+        pinned (dict): Course ID -> slots that must be kept.
+        add_prof_constraints (bool): Keep a professor's courses in different slots.
+        add_timeslot_capacity (bool): Enforce max_classes_per_slot.
+        add_no_same_day (bool): At most one session of a course per day.
+        max_classes_per_slot (int): Slot capacity.
+        slot_catalog (SlotCatalog): Catalog for slot ids; built from the labels if None.
+        max_time_in_seconds (float): CP-SAT time limit.
+        num_workers (int): CP-SAT workers.
+        free (list): Course IDs to re-solve without pinning them.
+
+    Returns:
+        dict: {"status": "repaired" / "infeasible" / "unknown", "message": str,
+               "neighbourhood": [course IDs re-solved],
+               "schedule": {course: [labels]} for the neighbourhood (only when repaired),
+               "moves": [{"Course ID", "from": [labels], "to": [labels]}],
+               "student_clashes_before": int, "student_clashes_after": int or None,
+               "solve_seconds": float}
+    """
+    started = time.time()
+    slot_catalog, courses = courses_to_slot_ids(courses, slot_catalog)
+    current = {c_id: set(slot_catalog.to_ids(slots)) for c_id, slots in current_schedule.items()}
+    pinned = {c_id: set(slot_catalog.to_ids(slots)) for c_id, slots in pinned.items() if c_id in courses}
+
+    prof_courses = _professor_courses(course_professor_map, courses) if add_prof_constraints else {}
+    coenrollment = _coenrollment(student_course_map, courses)
+
+    # The seeds only collide with courses that share a professor or students
+    # with them and sit in one of their slots
+    seeds = set(pinned) | {c_id for c_id in (free or []) if c_id in courses}
+    neighbourhood = set(seeds)
+    for c_id in seeds:
+        colliding = set(coenrollment[c_id])
+        for c_list in prof_courses.values():
+            if c_id in c_list:
+                colliding.update(c_list - {c_id})
+        neighbourhood.update(other for other in colliding if current.get(other, set()) & current.get(c_id, set()))
+    fixed = {c_id: slots for c_id, slots in current.items() if c_id not in neighbourhood}
+    clashes_before = _pair_clashes(current, coenrollment, neighbourhood)
+
+    model = cp_model.CpModel()
+    course_time_vars = {}
+    for c_id in sorted(neighbourhood):
+        # Earlier manual placements stay possible even outside the course's free slots
+        domain = set(courses[c_id]['time_slots']) | current.get(c_id, set()) | pinned.get(c_id, set())
+        course_time_vars[c_id] = {s: model.NewBoolVar(f'{c_id}_{s}') for s in sorted(domain)}
+
+    for c_id, slot_dict in course_time_vars.items():
+        model.Add(sum(slot_dict.values()) == course_classes_per_week.get(c_id, 2))
+        for s in pinned.get(c_id, set()):
+            model.Add(slot_dict[s] == 1)
+        for s, var in slot_dict.items():
+            model.AddHint(var, int(s in current.get(c_id, set())))
+
+    for c_list in prof_courses.values():
+        movable = [c_id for c_id in c_list if c_id in course_time_vars]
+        if not movable:
+            continue
+        busy = defaultdict(int)
+        for c_id in c_list - neighbourhood:
+            for s in fixed.get(c_id, set()):
+                busy[s] += 1
+        slot_map = defaultdict(list)
+        for c_id in movable:
+            for s, var in course_time_vars[c_id].items():
+                slot_map[s].append(var)
+        for s, var_list in slot_map.items():
+            if busy[s] or len(var_list) > 1:
+                model.Add(sum(var_list) <= max(0, 1 - busy[s]))
+
+    if add_timeslot_capacity:
+        fixed_load = defaultdict(int)
+        for slots in fixed.values():
+            for s in slots:
+                fixed_load[s] += 1
+        slot_usage = defaultdict(list)
+        for slot_dict in course_time_vars.values():
+            for s, var in slot_dict.items():
+                slot_usage[s].append(var)
+        for s, var_list in slot_usage.items():
+            model.Add(sum(var_list) <= max(0, max_classes_per_slot - fixed_load[s]))
+
+    if add_no_same_day:
+        for c_id, slot_dict in course_time_vars.items():
+            day_map = defaultdict(list)
+            for s, var in slot_dict.items():
+                day_map[slot_catalog.day_index[s]].append(var)
+            for var_list in day_map.values():
+                if len(var_list) > 1:
+                    model.Add(sum(var_list) <= 1)
+
+    # Clashes with fixed courses are linear; clashes inside the neighbourhood need pair variables
+    clash_terms = []
+    for c_id, slot_dict in course_time_vars.items():
+        for s, var in slot_dict.items():
+            weight = sum(headcount for other, headcount in coenrollment[c_id].items()
+                         if other in fixed and s in fixed[other])
+            if weight:
+                clash_terms.append(weight * var)
+    for c_a, c_b in combinations(sorted(course_time_vars), 2):
+        headcount = coenrollment[c_a].get(c_b, 0)
+        if not headcount:
+            continue
+        for s in course_time_vars[c_a].keys() & course_time_vars[c_b].keys():
+            pair_var = model.NewBoolVar(f'clash_{c_a}_{c_b}_{s}')
+            model.Add(course_time_vars[c_a][s] + course_time_vars[c_b][s] - 1 <= pair_var)
+            clash_terms.append(headcount * pair_var)
+    move_terms = [var for c_id, slot_dict in course_time_vars.items()
+                  for s, var in slot_dict.items() if s not in current.get(c_id, set())]
+    model.Minimize(REPAIR_CLASH_WEIGHT * sum(clash_terms) + REPAIR_MOVE_WEIGHT * sum(move_terms))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = max_time_in_seconds
+    solver.parameters.num_workers = num_workers
+    status = solver.Solve(model)
+
+    result = {"status": "unknown", "message": "", "neighbourhood": sorted(neighbourhood), "schedule": {},
+              "moves": [], "student_clashes_before": clashes_before, "student_clashes_after": None,
+              "solve_seconds": time.time() - started}
+    if status == cp_model.INFEASIBLE:
+        result["status"] = "infeasible"
+        result["message"] = ("The edited placement cannot be kept without breaking a hard constraint "
+                             "(professor clash, full time slot or same-day rule) for the courses around it."
+                             if pinned else
+                             "The affected courses cannot be placed without breaking a hard constraint "
+                             "(professor clash, full time slot or same-day rule) around the fixed timetable.")
+        return result
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        result["message"] = f"No repair found within {max_time_in_seconds:g}s."
+        return result
+
+    repaired = dict(current)
+    for c_id, slot_dict in course_time_vars.items():
+        slots = {s for s, var in slot_dict.items() if solver.Value(var)}
+        repaired[c_id] = slots
+        result["schedule"][c_id] = [slot_catalog.labels[s] for s in sorted(slots)]
+        if slots != current.get(c_id, set()):
+            result["moves"].append({"Course ID": c_id,
+                                    "from": [slot_catalog.labels[s] for s in sorted(current.get(c_id, set()) - slots)],
+                                    "to": [slot_catalog.labels[s] for s in sorted(slots - current.get(c_id, set()))]})
+    result["status"] = "repaired"
+    result["student_clashes_after"] = _pair_clashes(repaired, coenrollment, neighbourhood)
+    result["message"] = (f"Re-optimised {len(neighbourhood)} course(s) around the change: {len(result['moves'])} moved, "
+                         f"student clashes {clashes_before} -> {result['student_clashes_after']}.")
+    result["solve_seconds"] = time.time() - started
+    return result
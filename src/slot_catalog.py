@@ -0,0 +1,160 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Weekday order used for day indices and consecutive-day adjacency
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def parse_minutes(time_str: str) -> Optional[int]:
+    """
+    Converts "HH:MM" or "HH:MM:SS" to minutes after midnight.
+
+    Returns:
+        int or None: None if the string is not a clock time.
+    """
+    try:
+        parts = str(time_str).split(":")
+        return int(parts[0]) * 60 + int(parts[1])
+    except (ValueError, IndexError):
+        return None
+
+
+def normalize_slot_label(label: str) -> str:
+    """
+    Drops the seconds from a "Day HH:MM:SS" label, leaving "Day HH:MM".
+    Labels in any other format are returned unchanged.
+    """
+    day, _, time_part = str(label).partition(" ")
+    parts = time_part.split(":")
+    if len(parts) == 3:
+        return f"{day} {parts[0]}:{parts[1]}"
+    return label
+
+
+class SlotCatalog:
+    """
+    Integer-indexed view of the week's time slots.
+
+    Slot ids are positions in ``labels`` (ordered by weekday, then start time),
+    so the solver pipeline can key everything by small ints and only turn
+    them back into "Day HH:MM" strings at the edges (database, UI, reports).
+
+    Attributes:
+        labels (list): Slot id -> "Day HH:MM" label.
+        db_ids (list): Slot id -> database SlotID (None when built from labels).
+        day_names (list): Day index -> day name, in weekday order.
+        day_index (list): Slot id -> day index.
+        start_minutes (list): Slot id -> start time in minutes (None if unknown).
+        end_minutes (list): Slot id -> end time in minutes (None if unknown).
+        slots_by_day (list): Day index -> slot ids on that day.
+        adjacent_day_pairs (list): (day index, day index) pairs of consecutive weekdays.
+    """
+
+    def __init__(self, slots: Iterable[Tuple[str, str, Optional[str], Optional[int]]]):
+        """
+        Args:
+            slots: (day, start_time, end_time, db_slot_id) tuples; end_time and
+                   db_slot_id may be None. Duplicate labels are kept once.
+        """
+        unique = {}
+        for day, start, end, db_id in slots:
+            label = normalize_slot_label(f"{day} {start}")
+            if label not in unique:
+                unique[label] = (day, parse_minutes(start), parse_minutes(end) if end else None, db_id)
+
+        def weekday(day):
+            return DAY_ORDER.index(day) if day in DAY_ORDER else len(DAY_ORDER)
+
+        day_names = sorted({day for day, _, _, _ in unique.values()}, key=lambda day: (weekday(day), day))
+        day_lookup = {day: idx for idx, day in enumerate(day_names)}
+        ordered = sorted(unique.items(), key=lambda item: (day_lookup[item[1][0]],
+                                                           item[1][1] if item[1][1] is not None else -1,
+                                                           item[0]))
+
+        self.labels: List[str] = [label for label, _ in ordered]
+        self.db_ids: List[Optional[int]] = [info[3] for _, info in ordered]
+        self.day_names: List[str] = day_names
+        self.day_index: List[int] = [day_lookup[info[0]] for _, info in ordered]
+        self.start_minutes: List[Optional[int]] = [info[1] for _, info in ordered]
+        self.end_minutes: List[Optional[int]] = [info[2] for _, info in ordered]
+        self.slot_ids: Dict[str, int] = {label: slot_id for slot_id, label in enumerate(self.labels)}
+
+        self.slots_by_day: List[List[int]] = [[] for _ in day_names]
+        for slot_id, d_idx in enumerate(self.day_index):
+            self.slots_by_day[d_idx].append(slot_id)
+
+        self.adjacent_day_pairs: List[Tuple[int, int]] = [
+            (d_idx, d_idx + 1) for d_idx in range(len(day_names) - 1)
+            if day_names[d_idx] in DAY_ORDER and day_names[d_idx + 1] in DAY_ORDER
+            and weekday(day_names[d_idx + 1]) == weekday(day_names[d_idx]) + 1
+        ]
+
+    @classmethod
+    def from_labels(cls, labels: Iterable[str]) -> "SlotCatalog":
+        """Builds a catalog from "Day HH:MM" labels (no end times or database ids)."""
+        slots = []
+        for label in labels:
+            day, _, start = str(label).partition(" ")
+            slots.append((day, start, None, None))
+        return cls(slots)
+
+    @classmethod
+    def from_slot_rows(cls, rows) -> "SlotCatalog":
+        """Builds a catalog from Slot model rows (Day, StartTime, EndTime, SlotID)."""
+        return cls((row.Day, row.StartTime, row.EndTime, row.SlotID) for row in rows)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, label) -> bool:
+        return normalize_slot_label(label) in self.slot_ids
+
+    def id_of(self, slot) -> int:
+        """Slot id of a label (seconds are ignored); ints are returned unchanged."""
+        if isinstance(slot, int):
+            return slot
+        return self.slot_ids[normalize_slot_label(slot)]
+
+    def to_ids(self, slots: Iterable) -> List[int]:
+        """Slot ids of the given labels or ids, skipping labels not in the catalog."""
+        ids = []
+        for slot in slots:
+            if isinstance(slot, int):
+                ids.append(slot)
+            else:
+                slot_id = self.slot_ids.get(normalize_slot_label(slot))
+                if slot_id is not None:
+                    ids.append(slot_id)
+        return ids
+
+    def label_of(self, slot_id: int) -> str:
+        return self.labels[slot_id]
+
+    def day_of(self, slot_id: int) -> str:
+        return self.day_names[self.day_index[slot_id]]
+
+    def db_id_of(self, slot) -> Optional[int]:
+        """Database SlotID of a label or slot id, or None if unknown."""
+        if not isinstance(slot, int):
+            slot = self.slot_ids.get(normalize_slot_label(slot))
+            if slot is None:
+                return None
+        return self.db_ids[slot]
+
+
+def courses_to_slot_ids(courses: Dict[str, Dict[str, list]], slot_catalog: "SlotCatalog" = None):
+    """
+    Rewrites a course dictionary onto integer slot ids.
+
+    Args:
+        courses (dict): Course ID -> {'time_slots': labels or slot ids}.
+        slot_catalog (SlotCatalog): Catalog for the ids; built from the labels in courses if None.
+
+    Returns:
+        tuple: (slot_catalog, courses with 'time_slots' as slot ids)
+    """
+    if slot_catalog is None:
+        slot_catalog = SlotCatalog.from_labels({slot for info in courses.values()
+                                                for slot in info.get('time_slots', [])})
+    courses = {c_id: dict(info, time_slots=slot_catalog.to_ids(info.get('time_slots', [])))
+               for c_id, info in courses.items()}
+    return slot_catalog, courses
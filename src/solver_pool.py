@@ -0,0 +1,192 @@
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import traceback
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of a running job (stop requests, time and memory limits)
+POLL_SECONDS = 0.2
+
+# Seconds a job gets to return its best schedule after a stop before it is killed
+STOP_GRACE_SECONDS = 30
+
+_pool_lock = threading.Lock()
+_pool_slots = None
+
+
+def solver_pool_settings():
+    """
+    Solver pool configuration from the environment:
+
+      SOLVER_POOL_WORKERS           -> jobs solved at the same time (default 1); others wait their turn
+      SOLVER_JOB_TIME_LIMIT_SECONDS -> wall-clock limit per job, after which it is stopped (default none)
+      SOLVER_JOB_MEMORY_LIMIT_MB    -> RSS limit of a job's process tree, above which it is killed (default none)
+
+    :return: Dictionary with "workers", "time_limit_seconds" and "memory_limit_mb" (None = unlimited)
+    """
+    def read(name, cast):
+        value = os.getenv(name, "").strip()
+        return cast(value) if value else None
+
+    return {
+        "workers": max(1, read("SOLVER_POOL_WORKERS", int) or 1),
+        "time_limit_seconds": read("SOLVER_JOB_TIME_LIMIT_SECONDS", float),
+        "memory_limit_mb": read("SOLVER_JOB_MEMORY_LIMIT_MB", float),
+    }
+
+
+def _slots():
+    """Semaphore bounding the number of concurrent solver processes, created on first use."""
+    global _pool_slots
+    with _pool_lock:
+        if _pool_slots is None:
+            _pool_slots = threading.BoundedSemaphore(solver_pool_settings()["workers"])
+        return _pool_slots
+
+
+def _solver_worker(target, kwargs, updates, stop_event):
+    """
+    Entry point of a solver process: runs target(**kwargs) with progress and
+    stop requests wired to the parent, then sends back the result (and the
+    filled metrics dict, which does not cross the process boundary by itself).
+    """
+    try:
+        result = target(**kwargs, progress_callback=lambda update: updates.put(("progress", update)),
+                        stop_event=stop_event)
+        if isinstance(kwargs.get("metrics"), dict):
+            updates.put(("metrics", kwargs["metrics"]))
+        updates.put(("result", result))
+    except BaseException as e:
+        updates.put(("error", f"{type(e).__name__}: {e}\n{traceback.format_exc()}"))
+
+
+def _process_tree_rss_mb(process: psutil.Process) -> float:
+    """Resident memory of a process and all its descendants (component solves run in child processes)."""
+    total = 0
+    for member in [process] + process.children(recursive=True):
+        try:
+            total += member.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+def _kill_process_tree(pid: int):
+    try:
+        process = psutil.Process(pid)
+        for member in process.children(recursive=True) + [process]:
+            member.kill()
+    except psutil.Error:
+        pass
+
+
+def run_solver_job(target, kwargs: dict, progress_callback=None, stop_event=None,
+                   time_limit_seconds: float = None, memory_limit_mb: float = None):
+    """
+    Runs a timetable solve (e.g. gen_timetable_auto) in its own process so the
+    CPU-heavy model building never holds the web server's GIL and a crash or
+    runaway memory use only takes down the job.
+
+    At most SOLVER_POOL_WORKERS jobs run at once; the caller blocks until a
+    slot is free (reported as a "queued" progress update). Progress updates of
+    the job are relayed to progress_callback from a queue, and stop_event is
+    relayed to the job, which then returns its best schedule so far. The same
+    graceful stop is requested when the time limit passes; a job still running
+    STOP_GRACE_SECONDS later is killed. A job whose process tree exceeds the
+    memory limit is killed at once.
+
+    :param target: Module-level function to run; it must accept progress_callback and stop_event
+    :param kwargs: Keyword arguments of target (picklable); a "metrics" dict is filled in place
+    :param progress_callback: Optional function called with every progress update, in the calling thread
+    :param stop_event: Optional threading.Event; once set, the job is asked to stop
+    :param time_limit_seconds: Wall-clock limit (default from SOLVER_JOB_TIME_LIMIT_SECONDS)
+    :param memory_limit_mb: Memory limit (default from SOLVER_JOB_MEMORY_LIMIT_MB)
+    :return: Whatever target returned
+    :raises RuntimeError: If the job raised, crashed, ran out of memory or ignored a stop
+    """
+    settings = solver_pool_settings()
+    time_limit_seconds = time_limit_seconds or settings["time_limit_seconds"]
+    memory_limit_mb = memory_limit_mb or settings["memory_limit_mb"]
+
+    slots = _slots()
+    if not slots.acquire(blocking=False):
+        if progress_callback:
+            progress_callback({"phase": "QUEUED", "queued": True})
+        slots.acquire()
+    try:
+        # spawn: forking a multi-threaded web server is unsafe
+        context = multiprocessing.get_context("spawn")
+        updates = context.Queue()
+        job_stop = context.Event()
+        process = context.Process(target=_solver_worker, args=(target, kwargs, updates, job_stop),
+                                  name="timetable-solver")
+        process.start()
+        print(f"[SOLVER POOL] Job started in process {process.pid}")
+        started = time.time()
+        kill_at = None
+        next_memory_check = started
+        exited_polls = 0
+        try:
+            monitored = psutil.Process(process.pid)
+        except psutil.Error:
+            monitored = None
+
+        while True:
+            try:
+                kind, payload = updates.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                kind, payload = None, None
+
+            if kind == "progress":
+                if progress_callback:
+                    progress_callback(payload)
+            elif kind == "metrics":
+                kwargs["metrics"].update(payload)
+            elif kind == "result":
+                process.join()
+                print(f"[SOLVER POOL] Job finished in {time.time() - started:.1f}s")
+                return payload
+            elif kind == "error":
+                process.join()
+                # The traceback only exists in the solver process; record it before it is lost
+                logger.error(f"Solver job in process {process.pid} failed:\n{payload}")
+                raise RuntimeError(f"Solver job failed: {payload.splitlines()[0]}")
+
+            # Enforce stop requests and limits after every message, so a job that
+            # reports progress continuously is still stopped or killed on time
+            now = time.time()
+            if not job_stop.is_set():
+                if stop_event is not None and stop_event.is_set():
+                    job_stop.set()
+                    kill_at = now + STOP_GRACE_SECONDS
+                elif time_limit_seconds and now - started > time_limit_seconds:
+                    print(f"[SOLVER POOL] Job exceeded its {time_limit_seconds:g}s limit; stopping it")
+                    job_stop.set()
+                    kill_at = now + STOP_GRACE_SECONDS
+            if kill_at is not None and now > kill_at:
+                _kill_process_tree(process.pid)
+                process.join()
+                raise RuntimeError(f"Solver job did not stop within {STOP_GRACE_SECONDS}s and was killed.")
+            # Measuring the process tree is costly, so it is done at most once per poll interval
+            if memory_limit_mb and monitored is not None and now >= next_memory_check:
+                next_memory_check = now + POLL_SECONDS
+                rss_mb = _process_tree_rss_mb(monitored)
+                if rss_mb > memory_limit_mb:
+                    _kill_process_tree(process.pid)
+                    process.join()
+                    raise RuntimeError(f"Solver job used {rss_mb:.0f} MB, above the {memory_limit_mb:g} MB "
+                                       f"limit, and was killed. Try a smaller instance or a higher limit.")
+            # A normal exit always leaves a result or error behind; allow one more empty poll to read it
+            if kind is None:
+                exited_polls = exited_polls + 1 if not process.is_alive() else 0
+            if exited_polls > 1:
+                raise RuntimeError(f"Solver process exited unexpectedly (exit code {process.exitcode}), "
+                                   f"possibly out of memory.")
+    finally:
+        slots.release()
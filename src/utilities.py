@@ -1,5 +1,7 @@
 import pandas as pd
 
+from .slot_catalog import SlotCatalog
+
 
 def faculty_busy_slots(df_faculty_pref):
     return df_faculty_pref.groupby("Name")["Busy Slot"].agg(list).to_dict()
@@ -14,7 +16,8 @@ def create_course_dictionary(student_course_map, course_professor_map, professor
         student_course_map (dict): Mapping of student identifiers to lists of courses.
         course_professor_map (dict): Mapping of courses to their assigned professors (can be list or single professor).
         professor_busy_slots (dict): Mapping of professor identifiers to a list of busy time slots.
-        time_slots (list): List of time slot strings (e.g., "Monday 08:30") to consider.
+        time_slots (list or SlotCatalog): List of time slot strings (e.g., "Monday 08:30") to consider,
+            or a SlotCatalog, in which case the available slots are returned as integer slot ids.
 
     Returns:
         dict: A dictionary where keys are course names and values are dictionaries with available 'time_slots'.
@@ -25,6 +28,14 @@ def create_course_dictionary(student_course_map, course_professor_map, professor
     # You can also define excluded slots if needed, or pass them as an extra parameter.
     excluded_slots = {'Wednesday 14:30', 'Tuesday 14:30'}
 
+    # With a catalog, translate every label to its slot id once up front
+    if isinstance(time_slots, SlotCatalog):
+        slot_catalog = time_slots
+        time_slots = list(range(len(slot_catalog)))
+        excluded_slots = set(slot_catalog.to_ids(excluded_slots))
+        professor_busy_slots = {prof: set(slot_catalog.to_ids(busy))
+                                for prof, busy in professor_busy_slots.items()}
+
     for course in unique_courses:
         professors = course_professor_map.get(course, [])
         
@@ -532,6 +532,15 @@ const selectedFiles = {
     formData.append("toggle_student", document.getElementById("toggle_student").checked);
     formData.append("toggle_same_day",document.getElementById("toggle_same_day").checked);
     formData.append("toggle_consec_days", document.getElementById("toggle_consec_days").checked);
+    formData.append("conflict_mode", document.getElementById("conflict_mode").value);
+
+    // Append the solver settings (blank = auto-tuned on the server)
+    ["solver_max_time", "solver_num_workers", "solver_gap_limit",
+     "solver_random_seed", "solver_linearization_level"].forEach((fieldId) => {
+      formData.append(fieldId, document.getElementById(fieldId).value);
+    });
+    formData.append("solver_log_search", document.getElementById("solver_log_search").checked);
+    formData.append("bypass_cache", document.getElementById("bypass_cache").checked);
 
     try {
       // Step 1: Submit files and start async task
@@ -541,7 +550,17 @@ const selectedFiles = {
       });
       
       if (!response.ok) {
-        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        // Surface the server's explanation (e.g. a failed pre-solve check) when there is one
+        let detail = `HTTP ${response.status}: ${response.statusText}`;
+        try {
+          const errorBody = await response.json();
+          if (errorBody.detail) {
+            detail = errorBody.detail;
+          }
+        } catch (parseError) {
+          // Keep the status text
+        }
+        throw new Error(detail);
       }
       
       const taskData = await response.json();
@@ -582,6 +601,87 @@ const selectedFiles = {
     }
   }
 
+  /**
+   * Add a "Stop and keep best timetable" button under the loading message
+   */
+  function addStopButton(taskId) {
+    const messageElement = document.getElementById('loading-message');
+    if (!messageElement || document.getElementById('stop-task-button')) {
+      return;
+    }
+    const stopButton = document.createElement('button');
+    stopButton.id = 'stop-task-button';
+    stopButton.type = 'button';
+    stopButton.textContent = 'Stop and keep best timetable';
+    stopButton.style.cssText = 'margin-top: 10px; padding: 6px 14px; border-radius: 4px; background: #dc2626; color: #fff; border: none; cursor: pointer;';
+    stopButton.addEventListener('click', async () => {
+      stopButton.disabled = true;
+      try {
+        await fetch(`/cancel_task/${taskId}`, { method: 'POST' });
+      } catch (err) {
+        console.error("Failed to stop task:", err);
+        stopButton.disabled = false;
+      }
+    });
+    messageElement.insertAdjacentElement('afterend', stopButton);
+  }
+
+  /**
+   * Add a "Preview draft timetable" button that shows the greedy draft while the exact solve runs
+   */
+  function addDraftPreviewButton(taskId) {
+    const messageElement = document.getElementById('loading-message');
+    if (!messageElement || document.getElementById('draft-preview-button')) {
+      return;
+    }
+    const previewButton = document.createElement('button');
+    previewButton.id = 'draft-preview-button';
+    previewButton.type = 'button';
+    previewButton.textContent = 'Preview draft timetable';
+    previewButton.style.cssText = 'margin-top: 10px; margin-left: 8px; padding: 6px 14px; border-radius: 4px; background: #2563eb; color: #fff; border: none; cursor: pointer;';
+    previewButton.addEventListener('click', async () => {
+      let preview = document.getElementById('draft-preview');
+      if (preview) {
+        preview.remove();
+        return;
+      }
+      try {
+        const response = await fetch(`/task_draft/${taskId}`);
+        if (!response.ok) {
+          throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+        const draft = await response.json();
+
+        // Group the draft rows as "Course: slot, slot"
+        const slotsByCourse = {};
+        draft.schedule.forEach(row => {
+          (slotsByCourse[row["Course ID"]] = slotsByCourse[row["Course ID"]] || []).push(row["Scheduled Time"]);
+        });
+
+        preview = document.createElement('div');
+        preview.id = 'draft-preview';
+        preview.style.cssText = 'margin-top: 10px; max-height: 240px; overflow-y: auto; background: #fff; color: #111; text-align: left; padding: 8px; border-radius: 4px; font-size: 12px;';
+        const unplacedCount = Object.keys(draft.unplaced).length;
+        const summary = document.createElement('p');
+        summary.textContent = `Draft (not saved): ${draft.student_clashes} student clashes` +
+          (unplacedCount ? `, ${unplacedCount} course(s) not fully placed` : '');
+        preview.appendChild(summary);
+        const table = document.createElement('table');
+        Object.keys(slotsByCourse).sort().forEach(courseId => {
+          const tableRow = table.insertRow();
+          tableRow.insertCell().textContent = courseId;
+          tableRow.insertCell().textContent = slotsByCourse[courseId].join(', ');
+        });
+        preview.appendChild(table);
+        previewButton.insertAdjacentElement('afterend', preview);
+      } catch (err) {
+        console.error("Failed to load draft timetable:", err);
+      }
+    });
+    const stopButton = document.getElementById('stop-task-button');
+    (stopButton || messageElement).insertAdjacentElement('afterend', previewButton);
+  }
+
   /**
    * Poll the server for task status until completion
    */
@@ -608,6 +708,13 @@ const selectedFiles = {
           }
           
           const status = await statusResponse.json();
+
+          if (status.status === "processing") {
+            addStopButton(taskId);
+            if (status.draft_available) {
+              addDraftPreviewButton(taskId);
+            }
+          }
           
           // Update loading message if possible
           if (typeof window.loadingManager !== 'undefined' && window.loadingManager && status.progress) {
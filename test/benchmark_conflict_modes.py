@@ -0,0 +1,150 @@
+"""
+Benchmarks the PHASE 4 student-conflict formulations of schedule_courses
+("student" vs "course_pair") on the data/ fixtures and on synthetic
+cohort-based instances.
+
+Usage:
+    python test/benchmark_conflict_modes.py
+    python test/benchmark_conflict_modes.py --students 10000 --output conflict_modes.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src.conflict_checker import check_conflicts
+from src.data_preprocessing import merge_data, prepare_student_course_map, create_course_professor_map_all
+from src.schedule_model import schedule_courses, STUDENT_CONFLICT_MODES
+from src.utilities import faculty_busy_slots, create_course_dictionary
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+TIMES = ['08:30', '10:30', '12:30', '14:30', '16:30', '18:30']
+TIME_SLOTS = [f"{day} {start}" for day in DAYS for start in TIMES]
+
+
+def load_fixture_instance(data_dir):
+    """
+    Builds solver inputs from the CSV fixtures in data/.
+
+    :param data_dir: Directory holding Test_Stud_reg.csv, Student_Course.csv and faculty_pref2.csv
+    :return: Dictionary of schedule_courses inputs
+    """
+    data_dir = Path(data_dir)
+    df_registration = pd.read_csv(data_dir / "Test_Stud_reg.csv", encoding="utf-8-sig")
+    df_courses = pd.read_csv(data_dir / "Student_Course.csv", encoding="utf-8-sig")
+    df_faculty_pref = pd.read_csv(data_dir / "faculty_pref2.csv", encoding="utf-8-sig")
+
+    df_merged = merge_data(df_registration, df_courses)
+    student_course_map = prepare_student_course_map(df_merged)
+    course_professor_map = create_course_professor_map_all(df_merged)
+    course_type = df_courses.set_index("Course code")["Type"].to_dict()
+    return {
+        "student_course_map": student_course_map,
+        "course_professor_map": course_professor_map,
+        "professor_busy_slots": faculty_busy_slots(df_faculty_pref),
+        "course_classes_per_week": {c_id: 2 for c_id in course_professor_map},
+        "course_type": course_type,
+    }
+
+
+def generate_synthetic_instance(num_students, seed=0):
+    """
+    Builds a cohort-heavy synthetic instance: every cohort shares three
+    required courses and each student adds one or two electives.
+
+    :param num_students: Number of students to generate
+    :param seed: Random seed
+    :return: Dictionary of schedule_courses inputs
+    """
+    rng = random.Random(seed)
+    num_cohorts = max(num_students // 200, 1)
+    required = [f"REQ{i}" for i in range(num_cohorts * 3)]
+    electives = [f"ELE{i}" for i in range(max(num_students // 100, 10))]
+    all_courses = required + electives
+    professors = [f"prof{i}" for i in range(max(len(all_courses) // 2, 1))]
+
+    student_course_map = {}
+    for i in range(num_students):
+        cohort = i % num_cohorts
+        enrolled = required[cohort * 3:cohort * 3 + 3] + rng.sample(electives, rng.randint(1, 2))
+        student_course_map[f"student{i}"] = enrolled
+
+    course_professor_map = {c_id: [rng.choice(professors)] for c_id in all_courses}
+    professor_busy_slots = {prof: rng.sample(TIME_SLOTS, rng.randint(0, 6)) for prof in professors}
+    return {
+        "student_course_map": student_course_map,
+        "course_professor_map": course_professor_map,
+        "professor_busy_slots": professor_busy_slots,
+        "course_classes_per_week": {c_id: 2 for c_id in all_courses},
+        "course_type": {c_id: ("Required" if c_id.startswith("REQ") else "Elective") for c_id in all_courses},
+    }
+
+
+def run_mode(instance, conflict_mode):
+    """
+    Runs schedule_courses once and records wall time and resulting clashes.
+
+    :param instance: Dictionary returned by one of the instance builders
+    :param conflict_mode: Student-conflict formulation to use
+    :return: Dictionary of results
+    """
+    courses = create_course_dictionary(instance["student_course_map"], instance["course_professor_map"],
+                                       instance["professor_busy_slots"], TIME_SLOTS)
+    solver_log = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(solver_log):
+        schedule_df, message = schedule_courses(courses, instance["student_course_map"],
+                                                instance["course_professor_map"],
+                                                instance["course_classes_per_week"],
+                                                instance["course_type"], [],
+                                                conflict_mode=conflict_mode)
+        conflicts = check_conflicts(schedule_df, instance["student_course_map"]) if not schedule_df.empty else None
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": conflict_mode,
+        "seconds": round(elapsed, 3),
+        "message": message.splitlines()[0],
+        "student_conflicts": None if conflicts is None else len(conflicts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=str(grandparent_path / "data"))
+    parser.add_argument("--students", type=int, nargs="*", default=[10000],
+                        help="Synthetic instance sizes (number of students)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    instances = [("data/ fixtures", load_fixture_instance(args.data_dir))]
+    for num_students in args.students:
+        instances.append((f"synthetic {num_students} students",
+                          generate_synthetic_instance(num_students, args.seed)))
+
+    results = []
+    for name, instance in instances:
+        for conflict_mode in STUDENT_CONFLICT_MODES:
+            result = {"instance": name, "students": len(instance["student_course_map"]),
+                      **run_mode(instance, conflict_mode)}
+            results.append(result)
+            print(f"{name:<32} {conflict_mode:<12} {result['seconds']:>9.2f}s "
+                  f"conflicts={result['student_conflicts']}  {result['message']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+End-to-end timetable generation benchmark over synthetic instances of growing
+size (see generate_dummy_data.py).
+
+Each scale point runs in a fresh process: the instance is loaded through the
+real upload functions into a temporary SQLite database and gen_timetable_auto
+is run on it. The ingestion time, model size and build time, the time spent in
+every solver phase, the peak RSS and the outcome are recorded, so scaling
+regressions show up as a diff between two JSON files.
+
+Usage:
+    python test/benchmark_generation.py
+    python test/benchmark_generation.py --students 100 1000 10000 50000 --time-limit 120 \\
+        --output generation_benchmark.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from generate_dummy_data import generate_instance
+from src.database_management.dbconnection import create_tables
+from src.database_management.Slot_info import insert_time_slots
+from src.database_management.Users import insert_user_data
+from src.database_management.Courses import insert_courses_professors
+from src.database_management.busy_slot import insert_professor_busy_slots
+from src.database_management.course_stud import insert_course_students
+from src.main_algorithm import gen_timetable_auto
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its finished children, in MB (Linux reports KB)."""
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(peak / 1024, 1)
+
+
+def run_scale_point(config):
+    """
+    Generates, ingests and schedules one instance. Meant to run in its own
+    process so that peak RSS belongs to this scale point alone.
+
+    :param config: Dictionary with "instance" (generate_instance arguments), "time_limit" and "max_classes_per_slot"
+    :return: Dictionary of measurements
+    """
+    instance = generate_instance(**config["instance"])
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = os.path.join(work_dir, "benchmark.db")
+        metrics = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            create_tables(db_path)
+            insert_time_slots(instance["time_slots"], db_path)
+            insert_user_data([instance["courses"], instance["student_courses"]], db_path)
+            insert_courses_professors(instance["courses"], db_path)
+            insert_professor_busy_slots(instance["faculty_preferences"], db_path)
+            insert_course_students(instance["student_courses"], db_path)
+            ingested = time.perf_counter()
+
+            schedule_df, conflicts, message = gen_timetable_auto(
+                db_path, max_classes_per_slot=config["max_classes_per_slot"],
+                solver_params={"max_time_in_seconds": config["time_limit"]},
+                use_cache=False, metrics=metrics)
+            finished = time.perf_counter()
+
+    model = metrics.get("model") or {}
+    return {
+        **config["instance"],
+        "enrollments": len(instance["student_courses"]),
+        "ingest_seconds": round(ingested - started, 3),
+        "generate_seconds": round(finished - ingested, 3),
+        "components": len(metrics.get("components", [])) or 1,
+        "variables": model.get("variables"),
+        "constraints": model.get("constraints"),
+        "model_build_seconds": model.get("build_seconds"),
+        "phases": metrics.get("phases", []),
+        "peak_rss_mb": peak_rss_mb(),
+        "scheduled_classes": len(schedule_df),
+        "student_conflicts": len(conflicts),
+        "message": message.splitlines()[0] if message else "",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, nargs="*", default=[100, 1000, 10000],
+                        help="Scale points (number of students)")
+    parser.add_argument("--students-per-course", type=int, default=25,
+                        help="Courses grow with the students: one course per this many students")
+    parser.add_argument("--courses-per-professor", type=float, default=2.0)
+    parser.add_argument("--courses-per-student", type=int, default=4)
+    parser.add_argument("--required-fraction", type=float, default=0.5)
+    parser.add_argument("--cohort-correlation", type=float, default=0.75)
+    parser.add_argument("--sections-fraction", type=float, default=0.0)
+    parser.add_argument("--busy-density", type=float, default=0.1)
+    parser.add_argument("--slots", type=int, default=30)
+    parser.add_argument("--max-classes-per-slot", type=int, default=None,
+                        help="Slot capacity (default: enough for every course to fit with 20%% slack)")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="CP-SAT time limit per phase")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    for num_students in args.students:
+        num_courses = max(10, num_students // args.students_per_course)
+        num_professors = max(5, round(num_courses / args.courses_per_professor))
+        max_classes_per_slot = args.max_classes_per_slot or max(1, -(-num_courses * 2 * 6 // (args.slots * 5)))
+        config = {
+            "instance": {"num_students": num_students, "num_courses": num_courses,
+                         "num_professors": num_professors, "courses_per_student": args.courses_per_student,
+                         "required_fraction": args.required_fraction,
+                         "cohort_correlation": args.cohort_correlation,
+                         "sections_fraction": args.sections_fraction, "busy_slot_density": args.busy_density,
+                         "num_slots": args.slots, "seed": args.seed},
+            "max_classes_per_slot": max_classes_per_slot,
+            "time_limit": args.time_limit,
+        }
+        # A fresh process per scale point keeps the peak RSS readings apart
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(run_scale_point, config).result()
+        results.append(result)
+        phase_times = " ".join(f"{phase['phase'].replace('PHASE ', 'P')}={phase['wall_seconds']:.1f}s"
+                               for phase in result["phases"])
+        print(f"{num_students:>7} students {num_courses:>5} courses  ingest={result['ingest_seconds']:.1f}s "
+              f"build={result['model_build_seconds'] or 0:.1f}s vars={result['variables']} "
+              f"constraints={result['constraints']} {phase_times} rss={result['peak_rss_mb']}MB  "
+              f"{result['message']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,184 @@
-import csv
-import random 
-import pandas as pd
+"""
+Generates synthetic upload files (courses, faculty preferences, student
+registrations and a time slot grid) in the formats the admin upload expects.
+
+Every size is a parameter, so the same generator produces the 100-student
+test data and 50,000-student scaling instances. Students belong to cohorts
+that share their required courses; cohort_correlation sets how much of a
+student's load comes from the cohort instead of from random electives.
+
+Usage:
+    python test/generate_dummy_data.py
+    python test/generate_dummy_data.py --students 20000 --courses 800 --professors 400 \\
+        --sections-fraction 0.1 --busy-density 0.2 --output-dir /tmp/instance_20k
+"""
+import argparse
+import json
 import os
+import random
+
+import pandas as pd
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+
+# File names of the generated uploads
+COURSES_FILE = "Students - Courses Offere List - AY 2024-25 - Term 1 - Sheet1.csv"
+FACULTY_PREFERENCES_FILE = "faculty_pref.csv"
+STUDENT_COURSES_FILE = "Student Registration Data.csv"
+TIME_SLOTS_FILE = "timeslots.json"
+
+
+def generate_time_slots(num_slots, days=DAYS, first_start="08:30", slot_minutes=90, gap_minutes=30):
+    """
+    Spreads num_slots slots over the week, the same number each day (the
+    last days get one fewer when it does not divide evenly).
+
+    :param num_slots: Total number of weekly slots
+    :param days: Teaching days
+    :param first_start: Start of the first slot of a day, "HH:MM"
+    :param slot_minutes: Slot length
+    :param gap_minutes: Break between consecutive slots
+    :return: Dictionary day -> list of (start, end) "HH:MM" tuples, as insert_time_slots expects
+    """
+    per_day = [num_slots // len(days) + (1 if i < num_slots % len(days) else 0) for i in range(len(days))]
+    hours, minutes = map(int, first_start.split(":"))
+    day_start = hours * 60 + minutes
+    time_slots = {}
+    for day, count in zip(days, per_day):
+        slots = []
+        for i in range(count):
+            start = day_start + i * (slot_minutes + gap_minutes)
+            end = start + slot_minutes
+            slots.append((f"{start // 60:02d}:{start % 60:02d}", f"{end // 60:02d}:{end % 60:02d}"))
+        time_slots[day] = slots
+    return time_slots
+
+
+def generate_instance(num_students=100, num_courses=100, num_professors=100, courses_per_student=4,
+                      required_fraction=0.5, num_cohorts=None, cohort_correlation=0.75,
+                      sections_fraction=0.0, max_sections=3, busy_slot_density=0.1, num_slots=30,
+                      classes_per_week=2, seed=0):
+    """
+    Builds a synthetic instance.
+
+    Required courses are split evenly over the cohorts. Each of a student's
+    courses_per_student picks is one of the cohort's required courses with
+    probability cohort_correlation (while any are left) and a uniformly
+    random elective otherwise. Courses with several sections list one
+    professor per section. Every professor is busy in about
+    busy_slot_density of the slots.
 
-# Get the current working directory
-path = os.getcwd()
-
-num_students = 100
-num_profs = 100
-num_courses = 100
-courses_per_student = 4
-
-# Gen_prof_names
-prof_names = []
-for i in range(num_profs):
-    prof_names.append(f"prof{i}")
-
-# Gen_courses
-course_names = []
-for i in range(num_courses):
-    course_names.append(f"course{i}")
-
-# Gen_students
-student_names = []
-for i in range(num_students):
-    student_names.append(f"student{i}")
-
-def select_with_prob(choice_list, check_list, repeat_percent,middle_num,max_num):
-    choice = random.choice(choice_list)
-    count = sum(1 for i in check_list if i == choice)
-    num = random.randint(0,101)
-    if count<middle_num and num<=repeat_percent:
-        select_with_prob(choice_list, check_list, repeat_percent,middle_num,max_num)
-    if count>=max_num:
-        select_with_prob(choice_list, check_list, repeat_percent,middle_num,max_num)
-    else:
-        return choice
-
-def gen_course_list(prof_names,course_names):
-    # Course_list generation
-    courses_offered = []
-    check_list = []
+    :param num_students: Number of students
+    :param num_courses: Number of courses
+    :param num_professors: Number of professors; sections are dealt out to them round-robin
+    :param courses_per_student: Courses each student registers for
+    :param required_fraction: Fraction of the courses that are Required (the rest are Electives)
+    :param num_cohorts: Number of cohorts (default: one per 200 students)
+    :param cohort_correlation: Probability that a pick is a cohort course (0 = fully random enrollment)
+    :param sections_fraction: Fraction of the courses taught in 2..max_sections sections
+    :param max_sections: Largest number of sections of a course
+    :param busy_slot_density: Fraction of the slots each professor is unavailable in
+    :param num_slots: Total number of weekly slots
+    :param classes_per_week: Classes per week of every course
+    :param seed: Random seed
+    :return: Dictionary with "courses", "faculty_preferences" and "student_courses" DataFrames
+             and the "time_slots" grid
+    """
+    rng = random.Random(seed)
+    num_cohorts = num_cohorts or max(1, num_students // 200)
+    courses_per_student = min(courses_per_student, num_courses)
+
+    course_names = [f"course{i}" for i in range(num_courses)]
+    professors = [f"prof{i}" for i in range(num_professors)]
+    num_required = round(required_fraction * num_courses)
+    required, electives = course_names[:num_required], course_names[num_required:]
+    required_set = set(required)
+    cohort_courses = [required[cohort::num_cohorts] for cohort in range(num_cohorts)]
+
+    # Every section takes the next professor in a shuffled rotation, which spreads the load evenly
+    dealt = list(professors)
+    rng.shuffle(dealt)
+    sections_dealt = 0
+    course_rows = []
     for course in course_names:
-        prof = select_with_prob(prof_names,check_list,75,2,3)
-        courses_offered.append({"Course code":course,"Faculty Name":prof,"Course Type":"Required"})
-        check_list.append(prof)
-    df = pd.DataFrame(courses_offered)
-    df.to_csv("test_data/Students - Courses Offere List - AY 2024-25 - Term 1 - Sheet1.csv",index=False)
-
-# Faculty Pref
-def generate_faculty_schedule(faculty_names):
-    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-    times = ['08:30', '10:30', '12:30', '14:30', '16:30', '18:30']
-    
-    data = []
-    
-    for name in faculty_names:
-        busy_count = random.randint(1, 15) 
-        busy_slots = set()
-        
-        while len(busy_slots) < busy_count:
-            day = random.choice(days)
-            time = random.choice(times)
-            busy_slots.add((day, time))
-        
-        for slots in busy_slots: 
-            data.append({'Name':name, 'Busy Slot':f'{slots[0]} {slots[1]}'})
-            
-    df = pd.DataFrame(data)
-    df.to_csv('test_data/faculty_pref.csv', index=False)
-
-def gen_student_csv(student_list, course_list):
-    data = []
-    for student in student_list:
-        courses = random.sample(course_list, 4)
-        for i in courses:
-            data.append({"Roll No.":student,"G CODE":i,"Sections": "A"})
-    df = pd.DataFrame(data)
-    df.to_csv("test_data/Student Registration Data.csv",index=False)
-
-gen_course_list(prof_names,course_names)
-generate_faculty_schedule(prof_names)
-gen_student_csv(student_names,course_names)
+        num_sections = rng.randint(2, max(2, max_sections)) if rng.random() < sections_fraction else 1
+        faculty = [dealt[(sections_dealt + section) % num_professors] for section in range(num_sections)]
+        sections_dealt += num_sections
+        course_rows.append({"Course code": course,
+                            "Faculty Name": ", ".join(dict.fromkeys(faculty)),
+                            "Type": "Required" if course in required_set else "Elective",
+                            "Classes Per Week": classes_per_week,
+                            "Number of Sections": num_sections})
+
+    time_slots = generate_time_slots(num_slots)
+    slot_labels = [f"{day} {start}" for day, slots in time_slots.items() for start, _ in slots]
+    busy_per_professor = round(busy_slot_density * len(slot_labels))
+    busy_rows = [{"Name": prof, "Busy Slot": slot}
+                 for prof in professors for slot in rng.sample(slot_labels, busy_per_professor)]
+
+    student_rows = []
+    for i in range(num_students):
+        student = f"student{i}"
+        cohort_left = list(cohort_courses[i % num_cohorts])
+        rng.shuffle(cohort_left)
+        chosen = []
+        while len(chosen) < courses_per_student:
+            if cohort_left and (rng.random() < cohort_correlation or not electives):
+                course = cohort_left.pop()
+            else:
+                course = rng.choice(electives or course_names)
+            if course not in chosen:
+                chosen.append(course)
+        student_rows.extend({"Roll No.": student, "G CODE": course, "Sections": "A"} for course in chosen)
+
+    return {
+        "courses": pd.DataFrame(course_rows),
+        "faculty_preferences": pd.DataFrame(busy_rows, columns=["Name", "Busy Slot"]),
+        "student_courses": pd.DataFrame(student_rows),
+        "time_slots": time_slots,
+    }
+
+
+def write_instance(instance, output_dir):
+    """
+    Writes an instance as upload files.
+
+    :param instance: Dictionary returned by generate_instance
+    :param output_dir: Directory to write to (created if missing)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    instance["courses"].to_csv(os.path.join(output_dir, COURSES_FILE), index=False)
+    instance["faculty_preferences"].to_csv(os.path.join(output_dir, FACULTY_PREFERENCES_FILE), index=False)
+    instance["student_courses"].to_csv(os.path.join(output_dir, STUDENT_COURSES_FILE), index=False)
+    with open(os.path.join(output_dir, TIME_SLOTS_FILE), "w") as f:
+        json.dump(instance["time_slots"], f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--courses", type=int, default=100)
+    parser.add_argument("--professors", type=int, default=100)
+    parser.add_argument("--courses-per-student", type=int, default=4)
+    parser.add_argument("--required-fraction", type=float, default=0.5)
+    parser.add_argument("--cohorts", type=int, help="Number of cohorts (default: one per 200 students)")
+    parser.add_argument("--cohort-correlation", type=float, default=0.75)
+    parser.add_argument("--sections-fraction", type=float, default=0.0)
+    parser.add_argument("--max-sections", type=int, default=3)
+    parser.add_argument("--busy-density", type=float, default=0.1)
+    parser.add_argument("--slots", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_data"))
+    args = parser.parse_args()
+
+    instance = generate_instance(args.students, args.courses, args.professors, args.courses_per_student,
+                                 args.required_fraction, args.cohorts, args.cohort_correlation,
+                                 args.sections_fraction, args.max_sections, args.busy_density, args.slots,
+                                 seed=args.seed)
+    write_instance(instance, args.output_dir)
+    print(f"Wrote {len(instance['student_courses'])} enrollments of {args.students} students in "
+          f"{args.courses} courses to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
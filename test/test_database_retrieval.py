@@ -4,10 +4,15 @@ import tempfile
 import unittest
 from pathlib import Path
 import pandas as pd
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 # Adjust the import below if your module is named differently.
 # For example, if your file is named data_functions.py:
 from src.database_management.database_retrieval import registration_data, faculty_pref, student_pref
+from src.database_management.database_retrieval import registration_data_with_sections
+from src.database_management.dbconnection import create_tables, get_db_session
+from src.database_management.models import User, Course, CourseProfessor, CourseStud
 
 
 class TestDataFunctions(unittest.TestCase):
@@ -141,5 +146,67 @@ class TestDataFunctions(unittest.TestCase):
         self.assertEqual(len(df), 0)
 
 
+class TestRegistrationDataWithSections(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        create_tables(self.db_path)
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def populate(self, num_students):
+        """Two sections of CS taught by p1 and p2, every student enrolled, alternating sections."""
+        with get_db_session(self.db_path) as session:
+            professors = [User(Email=email, Name=email, Role="Professor") for email in ["p2", "p1"]]
+            students = [User(Email=f"s{i:03d}", Name=f"s{i:03d}", Role="Student") for i in range(num_students)]
+            course = Course(CourseName="CS", CourseType="Required", ClassesPerWeek=2, NumberOfSections=2)
+            session.add_all(professors + students + [course])
+            session.flush()
+            session.add_all([CourseProfessor(CourseID=course.CourseID, ProfessorID=prof.UserID,
+                                             SectionNumber=section)
+                             for section, prof in enumerate(professors, start=1)])
+            session.add_all([CourseStud(CourseID=course.CourseID, StudentID=student.UserID,
+                                        SectionNumber=i % 2 + 1)
+                             for i, student in enumerate(students)])
+            session.commit()
+
+    def count_queries(self, function):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            result = function()
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+        return result, len(statements)
+
+    def test_section_professors_are_assigned_round_robin(self):
+        self.populate(4)
+        df = registration_data_with_sections(self.db_path)
+        self.assertEqual(list(df['G CODE']), ['CS-A', 'CS-B', 'CS-A', 'CS-B'])
+        # Professors ordered by email: section 1 -> p1, section 2 -> p2
+        self.assertEqual(list(df['Professor']), ['p1', 'p2', 'p1', 'p2'])
+
+    def test_query_count_does_not_grow_with_enrollments(self):
+        self.populate(5)
+        _, few = self.count_queries(lambda: registration_data_with_sections(self.db_path))
+        with get_db_session(self.db_path) as session:
+            course_id = session.query(Course.CourseID).scalar()
+            session.add_all([User(Email=f"t{i:03d}", Name=f"t{i:03d}", Role="Student") for i in range(50)])
+            session.flush()
+            session.add_all([CourseStud(CourseID=course_id, StudentID=user.UserID, SectionNumber=1)
+                             for user in session.query(User).filter(User.Email.like("t%"))])
+            session.commit()
+        df, many = self.count_queries(lambda: registration_data_with_sections(self.db_path))
+        self.assertEqual(len(df), 55)
+        self.assertEqual(few, many)
+        self.assertLessEqual(many, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,198 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import event, func, text
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src.database_management import dbconnection
+from src.database_management.dbconnection import (get_engine, get_session_factory, get_db_session, dispose_engine,
+                                                  dispose_all_engines, create_tables, ensure_tables_exist,
+                                                  invalidate_schema_verification)
+from src.database_management.models import User
+from src.database_management.settings_manager import get_setting, set_setting
+
+
+class TestEngineRegistry(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.db_paths = [os.path.join(self.work_dir.name, f"org{i}.db") for i in range(3)]
+        dispose_all_engines()
+
+    def tearDown(self):
+        dispose_all_engines()
+        self.work_dir.cleanup()
+
+    def test_sessions_share_one_engine(self):
+        with patch.object(dbconnection, "create_database_engine",
+                          wraps=dbconnection.create_database_engine) as engines:
+            create_tables(self.db_paths[0])
+            for _ in range(3):
+                with get_db_session(self.db_paths[0]) as session:
+                    session.execute(text("SELECT 1"))
+        self.assertEqual(engines.call_count, 1)
+        # A path and its sqlite:/// URL are the same database
+        self.assertIs(get_engine(self.db_paths[0]), get_engine(f"sqlite:///{self.db_paths[0]}"))
+
+    def test_least_recently_used_idle_engine_is_evicted(self):
+        with patch.object(dbconnection, "ENGINE_REGISTRY_SIZE", 2):
+            first = get_engine(self.db_paths[0])
+            get_engine(self.db_paths[1])
+            get_engine(self.db_paths[0])
+            get_engine(self.db_paths[2])
+            keys = list(dbconnection._engine_registry)
+        self.assertEqual(keys, [f"sqlite:///{self.db_paths[0]}", f"sqlite:///{self.db_paths[2]}"])
+        self.assertIs(get_engine(self.db_paths[0]), first)
+
+    def test_engine_in_use_is_not_evicted(self):
+        with patch.object(dbconnection, "ENGINE_REGISTRY_SIZE", 1):
+            busy = get_engine(self.db_paths[0])
+            with busy.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                get_engine(self.db_paths[1])
+                self.assertEqual(len(dbconnection._engine_registry), 2)
+            # Once idle it is the one to go
+            get_engine(self.db_paths[2])
+        keys = list(dbconnection._engine_registry)
+        self.assertNotIn(f"sqlite:///{self.db_paths[0]}", keys)
+
+    def test_dispose(self):
+        get_engine(self.db_paths[0])
+        get_engine(self.db_paths[1])
+        dispose_engine(self.db_paths[0])
+        self.assertEqual(list(dbconnection._engine_registry), [f"sqlite:///{self.db_paths[1]}"])
+        dispose_all_engines()
+        self.assertEqual(len(dbconnection._engine_registry), 0)
+
+
+
+class TestSchemaRouting(unittest.TestCase):
+    """
+    Two organizations on one pooled engine. SQLite stands in for PostgreSQL:
+    each organization's tables live in a database attached under its schema name.
+    """
+    def setUp(self):
+        dispose_all_engines()
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.main_db = os.path.join(self.work_dir.name, "main.db")
+        self.schemas = {"org_a": os.path.join(self.work_dir.name, "org_a.db"),
+                        "org_b": os.path.join(self.work_dir.name, "org_b.db")}
+        for path in self.schemas.values():
+            create_tables(path)
+        dispose_all_engines()
+
+        @event.listens_for(get_engine(self.main_db), "connect")
+        def attach_schemas(dbapi_connection, connection_record):
+            for schema_name, path in self.schemas.items():
+                dbapi_connection.execute(f"ATTACH DATABASE '{path}' AS {schema_name}")
+
+    def tearDown(self):
+        dispose_all_engines()
+        self.work_dir.cleanup()
+
+    def test_schemas_share_one_pool(self):
+        self.assertIs(get_engine(self.main_db, "org_a").pool, get_engine(self.main_db, "org_b").pool)
+        self.assertIsNot(get_session_factory(self.main_db, "org_a"), get_session_factory(self.main_db, "org_b"))
+
+    def test_concurrent_organizations_stay_isolated(self):
+        errors = []
+
+        def hammer(schema_name, worker):
+            SessionLocal = get_session_factory(self.main_db, schema_name)
+            try:
+                for i in range(25):
+                    with SessionLocal() as session:
+                        email = f"{schema_name}-{worker}-{i}"
+                        session.add(User(Email=email, Name=email, Role="Student"))
+                        session.commit()
+                    with SessionLocal() as session:
+                        emails = [row.Email for row in session.query(User.Email)]
+                        if any(not email.startswith(schema_name) for email in emails):
+                            errors.append(f"{schema_name} saw {emails}")
+            except Exception as e:
+                errors.append(f"{schema_name}: {e}")
+
+        threads = [threading.Thread(target=hammer, args=(schema_name, worker))
+                   for worker in range(4) for schema_name in self.schemas]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for schema_name in self.schemas:
+            with get_session_factory(self.main_db, schema_name)() as session:
+                self.assertEqual(session.query(func.count(User.UserID)).scalar(), 100)
+        # The connections were shared: far fewer than the 200 sessions opened
+        self.assertLessEqual(get_engine(self.main_db).pool.checkedin(), 15)
+
+    def test_search_path_is_only_set_when_the_schema_changes(self):
+        pooled = MagicMock(info={})
+        cursor = pooled.dbapi_connection.cursor.return_value
+
+        def connect(schema_name):
+            connection = MagicMock(connection=pooled)
+            connection.get_execution_options.return_value = (
+                {"schema_translate_map": {None: schema_name}} if schema_name else {})
+            dbconnection._sync_search_path(connection)
+
+        for schema_name in ["org_a", "org_a", "org_b", None, None]:
+            connect(schema_name)
+        self.assertEqual([call.args[0] for call in cursor.execute.call_args_list],
+                         ["SET search_path TO org_a, public", "SET search_path TO org_b, public",
+                          "SET search_path TO DEFAULT"])
+
+
+class TestSchemaVerification(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.work_dir.name, "org.db")
+        dispose_all_engines()
+
+    def tearDown(self):
+        dispose_all_engines()
+        self.work_dir.cleanup()
+
+    def test_tables_are_verified_once(self):
+        with patch.object(dbconnection, "create_tables", wraps=dbconnection.create_tables) as creates:
+            for _ in range(3):
+                ensure_tables_exist(self.db_path)
+        self.assertEqual(creates.call_count, 1)
+
+    def test_invalidation_verifies_again(self):
+        ensure_tables_exist(self.db_path)
+        with patch.object(dbconnection, "create_tables", wraps=dbconnection.create_tables) as creates:
+            invalidate_schema_verification(self.db_path)
+            ensure_tables_exist(self.db_path)
+            dispose_engine(self.db_path)
+            ensure_tables_exist(self.db_path)
+            ensure_tables_exist(self.db_path)
+        self.assertEqual(creates.call_count, 2)
+
+    def test_helpers_create_tables_on_a_fresh_database(self):
+        self.assertIsNone(get_setting(self.db_path, "max_classes_per_slot"))
+        set_setting(self.db_path, "max_classes_per_slot", 5)
+        # Later helper calls do not probe the tables again
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = get_engine(self.db_path)
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            self.assertEqual(get_setting(self.db_path, "max_classes_per_slot"), 5)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        self.assertEqual(len(statements), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src import main_algorithm
+from src.database_management.dbconnection import create_tables, get_db_session, dispose_all_engines
+from src.database_management.models import User, Course, CourseProfessor, CourseStud, Slot, Schedule
+from src.database_management.course_stud import parse_enrollment_code, sync_course_students
+from src.database_management.schedule import get_scheduled_slots
+from src.main_algorithm import reschedule_enrollment_changes
+
+
+class EnrollmentFixture(unittest.TestCase):
+    """
+    M1 has two sections (s1 and s3 in A, s2 in B); P1 and H1 have one section each
+    and share their slots, which is fine as long as no student takes both. The
+    saved timetable has no student clashes.
+    """
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        create_tables(self.db_path)
+        with get_db_session(self.db_path) as session:
+            users = [User(Email=email, Name=email, Role=role) for email, role in
+                     [("p1", "Professor"), ("p2", "Professor"), ("p3", "Professor"),
+                      ("s1", "Student"), ("s2", "Student"), ("s3", "Student"), ("s4", "Student")]]
+            courses = [Course(CourseName="M1", CourseType="Required", ClassesPerWeek=2, NumberOfSections=2),
+                       Course(CourseName="P1", CourseType="Elective", ClassesPerWeek=2, NumberOfSections=1),
+                       Course(CourseName="H1", CourseType="Elective", ClassesPerWeek=2, NumberOfSections=1)]
+            slots = [Slot(Day=day, StartTime=start, EndTime=end) for day in ("Monday", "Tuesday", "Wednesday")
+                     for start, end in (("09:00", "10:30"), ("11:00", "12:30"))]
+            session.add_all(users + courses + slots)
+            session.flush()
+            ids = {user.Email: user.UserID for user in users}
+            m1, p1, h1 = courses
+            slot_ids = {f"{slot.Day} {slot.StartTime}": slot.SlotID for slot in slots}
+            session.add_all([
+                CourseProfessor(CourseID=m1.CourseID, ProfessorID=ids["p1"], SectionNumber=1),
+                CourseProfessor(CourseID=m1.CourseID, ProfessorID=ids["p1"], SectionNumber=2),
+                CourseProfessor(CourseID=p1.CourseID, ProfessorID=ids["p2"], SectionNumber=1),
+                CourseProfessor(CourseID=h1.CourseID, ProfessorID=ids["p3"], SectionNumber=1),
+                CourseStud(CourseID=m1.CourseID, StudentID=ids["s1"], SectionNumber=1),
+                CourseStud(CourseID=m1.CourseID, StudentID=ids["s3"], SectionNumber=1),
+                CourseStud(CourseID=m1.CourseID, StudentID=ids["s2"], SectionNumber=2),
+                CourseStud(CourseID=p1.CourseID, StudentID=ids["s1"], SectionNumber=1),
+                CourseStud(CourseID=h1.CourseID, StudentID=ids["s2"], SectionNumber=1),
+            ])
+            saved = {(m1.CourseID, 1): ["Monday 09:00", "Wednesday 11:00"],
+                     (m1.CourseID, 2): ["Monday 11:00", "Tuesday 11:00"],
+                     (p1.CourseID, 1): ["Wednesday 09:00", "Tuesday 09:00"],
+                     (h1.CourseID, 1): ["Wednesday 09:00", "Tuesday 09:00"]}
+            session.add_all([Schedule(CourseID=course_id, SectionNumber=section, SlotID=slot_ids[label])
+                             for (course_id, section), labels in saved.items() for label in labels])
+            session.commit()
+        self.registrations = [("s1", "M1"), ("s3", "M1"), ("s2", "M1"), ("s1", "P1"), ("s2", "H1")]
+
+    def tearDown(self):
+        dispose_all_engines()
+        os.remove(self.db_path)
+
+    def registration_file(self, rows):
+        return pd.DataFrame(rows, columns=['Roll No.', 'G CODE'])
+
+    def enrollments(self):
+        with get_db_session(self.db_path) as session:
+            return sorted((row.Email, row.CourseName, row.SectionNumber) for row in
+                          session.query(User.Email, Course.CourseName, CourseStud.SectionNumber)
+                                 .join(CourseStud, CourseStud.StudentID == User.UserID)
+                                 .join(Course, CourseStud.CourseID == Course.CourseID))
+
+
+class TestParseEnrollmentCode(unittest.TestCase):
+    def test_section_formats(self):
+        self.assertEqual(parse_enrollment_code("M1"), ("M1", None))
+        self.assertEqual(parse_enrollment_code("M1-A"), ("M1", 1))
+        self.assertEqual(parse_enrollment_code("DATA-201-B"), ("DATA-201", 2))
+        self.assertEqual(parse_enrollment_code("M1(Sec2)"), ("M1", 2))
+        self.assertEqual(parse_enrollment_code("M1(C)"), ("M1", 3))
+
+
+class TestSyncCourseStudents(EnrollmentFixture):
+    def test_existing_enrollments_keep_their_sections(self):
+        before = self.enrollments()
+        changes = sync_course_students(self.registration_file(self.registrations), self.db_path)
+        self.assertEqual(changes, {"added": [], "removed": []})
+        self.assertEqual(self.enrollments(), before)
+        self.assertIn(("s2", "M1", 2), before)
+
+    def test_explicit_section_change_is_one_removal_and_one_addition(self):
+        rows = [("s2", "M1-A") if row == ("s2", "M1") else row for row in self.registrations]
+        changes = sync_course_students(self.registration_file(rows), self.db_path)
+        self.assertEqual(changes, {"added": [("s2", "M1-A")], "removed": [("s2", "M1-B")]})
+        self.assertIn(("s2", "M1", 1), self.enrollments())
+        self.assertNotIn(("s2", "M1", 2), self.enrollments())
+
+    def test_new_enrollment_goes_to_the_emptiest_section(self):
+        changes = sync_course_students(self.registration_file(self.registrations + [("s4", "M1")]), self.db_path)
+        # Section A has two students, section B one
+        self.assertEqual(changes, {"added": [("s4", "M1-B")], "removed": []})
+        self.assertIn(("s4", "M1", 2), self.enrollments())
+
+    def test_dropped_enrollment_is_removed(self):
+        rows = [row for row in self.registrations if row != ("s1", "P1")]
+        changes = sync_course_students(self.registration_file(rows), self.db_path)
+        self.assertEqual(changes, {"added": [], "removed": [("s1", "P1")]})
+        self.assertNotIn(("s1", "P1", 1), self.enrollments())
+        self.assertEqual(len(self.enrollments()), 4)
+
+
+class TestRescheduleEnrollmentChanges(EnrollmentFixture):
+    def test_unchanged_registrations_short_circuit(self):
+        saved = get_scheduled_slots(self.db_path)
+        with patch.object(main_algorithm, "repair_schedule") as repair, \
+                patch.object(main_algorithm, "replace_course_schedule") as replace:
+            result = reschedule_enrollment_changes(self.db_path, self.registration_file(self.registrations))
+        self.assertEqual(result["status"], "unchanged")
+        self.assertEqual((result["added"], result["removed"]), ([], []))
+        repair.assert_not_called()
+        replace.assert_not_called()
+        self.assertEqual(get_scheduled_slots(self.db_path), saved)
+
+    def test_only_moved_courses_are_rewritten(self):
+        saved = get_scheduled_slots(self.db_path)
+        # s1 now also takes H1, which shares both of its slots with P1
+        rows = self.registrations + [("s1", "H1")]
+        with patch.object(main_algorithm, "replace_course_schedule",
+                          wraps=main_algorithm.replace_course_schedule) as replace:
+            result = reschedule_enrollment_changes(self.db_path, self.registration_file(rows))
+        self.assertEqual(result["added"], [("s1", "H1")])
+        self.assertEqual(result["status"], "repaired")
+        self.assertEqual(result["student_clashes_after"], 0)
+        moved = {move["Course ID"] for move in result["moves"]}
+        self.assertTrue(moved)
+        self.assertTrue(moved <= {"H1", "P1"})
+        replace.assert_called_once()
+        self.assertEqual(set(replace.call_args[0][0]), moved)
+
+        after = get_scheduled_slots(self.db_path)
+        for course, labels in saved.items():
+            if course in moved:
+                self.assertEqual(sorted(after[course]), sorted(result["schedule"][course]))
+                self.assertFalse(set(after[course]) & set(after["P1" if course == "H1" else "H1"]))
+            else:
+                self.assertEqual(sorted(after[course]), sorted(labels))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src.heuristic_scheduler import dsatur_schedule
+from src.schedule_model import schedule_courses
+from src.slot_catalog import SlotCatalog
+
+
+class TestDsaturSchedule(unittest.TestCase):
+    def setUp(self):
+        self.slots = ['Monday 9:00', 'Monday 10:00', 'Tuesday 9:00', 'Tuesday 10:00',
+                      'Wednesday 9:00', 'Wednesday 10:00']
+        self.courses = {c_id: {'time_slots': list(self.slots)} for c_id in ['Math101', 'CS101', 'PHY101']}
+        self.course_professor_map = {'Math101': 'Prof1', 'CS101': 'Prof1', 'PHY101': 'Prof2'}
+        self.student_course_map = {'S1': ['Math101', 'PHY101'], 'S2': ['Math101', 'PHY101'],
+                                   'S3': ['CS101', 'PHY101']}
+        self.classes_per_week = {'Math101': 2, 'CS101': 2, 'PHY101': 2}
+
+    def test_places_every_session_within_the_hard_rules(self):
+        draft = dsatur_schedule(self.courses, self.student_course_map, self.course_professor_map,
+                                self.classes_per_week, max_classes_per_slot=2)
+        self.assertEqual(draft["unplaced"], {})
+        self.assertEqual(len(draft["schedule"]), 6)
+        catalog = SlotCatalog.from_labels(self.slots)
+        for c_id, slots in draft["assignment"].items():
+            self.assertEqual(len(slots), 2)
+            self.assertEqual(len({catalog.day_index[s] for s in slots}), 2)
+        # Prof1 teaches Math101 and CS101
+        self.assertFalse(set(draft["assignment"]['Math101']) & set(draft["assignment"]['CS101']))
+        usage = defaultdict(int)
+        for slots in draft["assignment"].values():
+            for s in slots:
+                usage[s] += 1
+        self.assertLessEqual(max(usage.values()), 2)
+        self.assertEqual(draft["student_clashes"], 0)
+
+    def test_most_constrained_course_goes_first(self):
+        # Only DSatur ordering keeps Tight's single slot free
+        self.courses = {'Loose': {'time_slots': ['Monday 9:00', 'Tuesday 9:00']},
+                        'Tight': {'time_slots': ['Monday 9:00']}}
+        draft = dsatur_schedule(self.courses, {}, {'Loose': 'Prof1', 'Tight': 'Prof1'},
+                                {'Loose': 1, 'Tight': 1})
+        self.assertEqual(draft["unplaced"], {})
+        self.assertEqual(draft["assignment"], {'Loose': [1], 'Tight': [0]})
+
+    def test_reports_unplaced_sessions(self):
+        self.courses['Math101'] = {'time_slots': ['Monday 9:00', 'Monday 10:00']}
+        draft = dsatur_schedule(self.courses, self.student_course_map, self.course_professor_map,
+                                self.classes_per_week)
+        self.assertEqual(draft["unplaced"], {'Math101': 1})
+        draft = dsatur_schedule(self.courses, self.student_course_map, self.course_professor_map,
+                                self.classes_per_week, add_no_same_day=False)
+        self.assertEqual(draft["unplaced"], {})
+
+    def test_large_instance_is_fast(self):
+        rng = random.Random(7)
+        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+        labels = [f'{day} {hour}:00' for day in days for hour in range(8, 16)]
+        catalog = SlotCatalog.from_labels(labels)
+        courses = {f'C{i}': {'time_slots': rng.sample(range(len(labels)), 30)} for i in range(500)}
+        professors = {c_id: f'P{i % 150}' for i, c_id in enumerate(courses)}
+        students = {f'S{i}': rng.sample(sorted(courses), 5) for i in range(3000)}
+        started = time.perf_counter()
+        draft = dsatur_schedule(courses, students, professors, {}, max_classes_per_slot=40,
+                                slot_catalog=catalog)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(draft["unplaced"], {})
+
+    def test_schedule_courses_with_and_without_hints(self):
+        for heuristic_hints in (True, False):
+            df, message = schedule_courses(self.courses, self.student_course_map, self.course_professor_map,
+                                           self.classes_per_week, {}, [], max_classes_per_slot=2,
+                                           heuristic_hints=heuristic_hints)
+            self.assertEqual(message, "Schedule found through PHASE 5 constraints.")
+            self.assertEqual(len(df), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
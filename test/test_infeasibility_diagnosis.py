@@ -0,0 +1,124 @@
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src import infeasibility_diagnosis
+from src.infeasibility_diagnosis import diagnose_infeasibility
+from src.schedule_model import schedule_courses
+
+
+class TestUnsatCoreDiagnosis(unittest.TestCase):
+    def setUp(self):
+        # A feasible background course that must never show up in a core
+        self.courses = {'Bystander': {'time_slots': ['Tuesday 9:00', 'Thursday 9:00', 'Friday 9:00']}}
+        self.course_professor_map = {'Bystander': 'Prof. Idle'}
+        self.classes_per_week = {'Bystander': 2}
+
+    def test_professor_clash(self):
+        self.courses.update({'C1': {'time_slots': ['Monday 9:00', 'Monday 10:00']},
+                             'C2': {'time_slots': ['Monday 9:00', 'Monday 10:00']},
+                             'C3': {'time_slots': ['Monday 9:00', 'Monday 10:00']}})
+        self.course_professor_map.update({'C1': 'Prof1', 'C2': 'Prof1', 'C3': 'Prof1'})
+        self.classes_per_week.update({'C1': 1, 'C2': 1, 'C3': 1})
+        result = diagnose_infeasibility(self.courses, self.course_professor_map, self.classes_per_week)
+        self.assertFalse(result["feasible"])
+        self.assertEqual(result["phase"], 2)
+        self.assertEqual(result["professors"], ['Prof1'])
+        self.assertNotIn('Bystander', result["courses"])
+        self.assertTrue(result["message"].startswith("PHASE 2 FAILED"))
+        self.assertIn("Professor 'Prof1' teaches C1, C2, C3", result["message"])
+
+    def test_slot_capacity(self):
+        for c_id in ['C1', 'C2', 'C3']:
+            self.courses[c_id] = {'time_slots': ['Monday 9:00']}
+            self.course_professor_map[c_id] = f'Prof {c_id}'
+            self.classes_per_week[c_id] = 1
+        result = diagnose_infeasibility(self.courses, self.course_professor_map, self.classes_per_week,
+                                        max_classes_per_slot=2)
+        self.assertEqual(result["phase"], 3)
+        self.assertEqual(result["slots"], ['Monday 9:00'])
+
+    def test_same_day(self):
+        self.courses['C1'] = {'time_slots': ['Monday 9:00', 'Monday 10:00', 'Monday 11:00']}
+        self.course_professor_map['C1'] = 'Prof1'
+        self.classes_per_week['C1'] = 2
+        result = diagnose_infeasibility(self.courses, self.course_professor_map, self.classes_per_week)
+        self.assertEqual(result["phase"], 5)
+        self.assertEqual(result["courses"], ['C1'])
+        self.assertIn("can only meet on Monday", result["message"])
+
+    def overloaded_professor(self, count):
+        # Every course of one professor is squeezed into two slots; any three of them clash
+        for i in range(count):
+            c_id = f'C{i}'
+            self.courses[c_id] = {'time_slots': ['Monday 9:00', 'Monday 10:00']}
+            self.course_professor_map[c_id] = 'Prof1'
+            self.classes_per_week[c_id] = 1
+
+    def count_solves(self, **kwargs):
+        solves = []
+        original = infeasibility_diagnosis.cp_model.CpSolver.Solve
+
+        def counting_solve(solver, model, *args):
+            solves.append(solver.parameters.max_time_in_seconds)
+            return original(solver, model, *args)
+
+        with patch.object(infeasibility_diagnosis.cp_model.CpSolver, "Solve", counting_solve):
+            result = diagnose_infeasibility(self.courses, self.course_professor_map, self.classes_per_week,
+                                            **kwargs)
+        return result, solves
+
+    def test_minimization_shares_one_budget(self):
+        self.overloaded_professor(12)
+        result, solves = self.count_solves(minimize_time_in_seconds=0)
+        # Only the feasibility solve runs; its core is reported unminimized
+        self.assertEqual(len(solves), 1)
+        self.assertFalse(result["feasible"])
+        self.assertEqual(result["professors"], ['Prof1'])
+
+        result, solves = self.count_solves(max_time_in_seconds=60, minimize_time_in_seconds=5)
+        self.assertEqual(solves[0], 60)
+        self.assertTrue(all(limit <= 5 for limit in solves[1:]))
+        self.assertEqual(result["professors"], ['Prof1'])
+
+    def test_minimal_core(self):
+        self.overloaded_professor(12)
+        result, solves = self.count_solves()
+        self.assertEqual(result["phase"], 2)
+        # Three courses and their professor are a minimal contradiction
+        self.assertEqual(len(result["courses"]), 3)
+        self.assertEqual(result["professors"], ['Prof1'])
+        # At most one trial per group of that core
+        self.assertLessEqual(len(solves), 1 + 4)
+
+    def test_feasible(self):
+        result = diagnose_infeasibility(self.courses, self.course_professor_map, self.classes_per_week)
+        self.assertTrue(result["feasible"])
+        self.assertIsNone(result["message"])
+
+    def test_schedule_courses_core_mode(self):
+        df, message = schedule_courses(self.courses, {'S1': ['Bystander']}, self.course_professor_map,
+                                       self.classes_per_week, {}, [], diagnosis_mode="core")
+        self.assertEqual(message, "Schedule found through PHASE 5 constraints.")
+        self.assertEqual(len(df), 2)
+
+        # Only the combination of professor and same-day rules fails, so the pre-checks pass
+        self.courses['C1'] = {'time_slots': ['Monday 9:00', 'Monday 10:00', 'Tuesday 9:00']}
+        self.courses['C2'] = {'time_slots': ['Tuesday 9:00']}
+        self.course_professor_map.update({'C1': 'Prof1', 'C2': 'Prof1'})
+        self.classes_per_week.update({'C1': 2, 'C2': 1})
+        df, message = schedule_courses(self.courses, {'S1': ['Bystander', 'C1']}, self.course_professor_map,
+                                       self.classes_per_week, {}, [], diagnosis_mode="core")
+        self.assertTrue(df.empty)
+        self.assertTrue(message.startswith("PHASE 5 FAILED"))
+        self.assertIn("Course 'C1'", message)
+        self.assertIn("Professor 'Prof1' teaches C1, C2", message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src.schedule_model import schedule_courses
+from src.model_export import load_manifest, replay_exported_model
+
+
+class TestModelExport(unittest.TestCase):
+    def setUp(self):
+        self.export_dir = tempfile.mkdtemp()
+        slots = ['Monday 9:00', 'Tuesday 9:00', 'Wednesday 9:00', 'Thursday 9:00']
+        self.courses = {c_id: {'time_slots': list(slots)} for c_id in ['C1', 'C2', 'C3']}
+        self.student_course_map = {'S1': ['C1', 'C2'], 'S2': ['C2', 'C3']}
+        self.course_professor_map = {'C1': 'P1', 'C2': 'P2', 'C3': 'P1'}
+        self.classes_per_week = {c_id: 2 for c_id in self.courses}
+
+    def tearDown(self):
+        shutil.rmtree(self.export_dir)
+
+    def schedule(self, **kwargs):
+        return schedule_courses(self.courses, self.student_course_map, self.course_professor_map,
+                                self.classes_per_week, {}, [], export_dir=self.export_dir,
+                                solver_params={"num_workers": 1}, **kwargs)
+
+    def test_every_phase_is_exported(self):
+        schedule_df, message = self.schedule()
+        manifest = load_manifest(self.export_dir)
+        self.assertEqual([entry["phase"] for entry in manifest["phases"]],
+                         ['PHASE 1', 'PHASE 2', 'PHASE 3', 'PHASE 4', 'PHASE 5'])
+        self.assertEqual(len(manifest["variables"]), 12)
+        self.assertEqual(sorted(manifest["phase_literals"]), ['cap', 'conf', 'prof', 'same'])
+        for entry in manifest["phases"]:
+            for file_name in entry["files"].values():
+                self.assertTrue(os.path.exists(os.path.join(self.export_dir, file_name)))
+
+    def test_replay_reproduces_the_final_phase(self):
+        schedule_df, message = self.schedule()
+        result = replay_exported_model(self.export_dir, param_overrides=["num_workers: 2"], repeats=2)
+        self.assertEqual(result["phase"], 'PHASE 5')
+        self.assertIn("num_workers: 2", result["params"])
+        self.assertEqual(len(result["runs"]), 2)
+        self.assertEqual(result["runs"][0]["status"], 'OPTIMAL')
+        self.assertEqual(result["runs"][0]["objective"], result["recorded"]["objective"])
+        # The manifest maps the solution back to courses and slots
+        self.assertEqual(len(result["schedule"]), 6)
+        self.assertEqual({row["Course ID"] for row in result["schedule"]}, set(self.courses))
+
+    def test_replay_of_an_earlier_phase(self):
+        self.schedule()
+        result = replay_exported_model(self.export_dir, phase='PHASE 2')
+        self.assertEqual(result["runs"][0]["status"], 'OPTIMAL')
+        with self.assertRaises(ValueError):
+            replay_exported_model(self.export_dir, phase='PHASE 9')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import sys
+from pathlib import Path
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src.presolve_checks import find_presolve_problems, presolve_failure_message
+
+
+class TestPresolveChecks(unittest.TestCase):
+    def setUp(self):
+        self.courses = {
+            'Math101': {'time_slots': ['Monday 9:00', 'Wednesday 11:00', 'Friday 10:00']},
+            'CS101': {'time_slots': ['Monday 10:00', 'Tuesday 9:00', 'Thursday 10:00']},
+        }
+        self.course_professor_map = {'Math101': 'Prof. Einstein', 'CS101': 'Prof. Turing'}
+        self.classes_per_week = {'Math101': 2, 'CS101': 2}
+
+    def test_feasible_instance_passes(self):
+        self.assertEqual(find_presolve_problems(self.courses, self.course_professor_map,
+                                                self.classes_per_week), [])
+
+    def test_too_few_slots(self):
+        self.classes_per_week['Math101'] = 4
+        problems = find_presolve_problems(self.courses, self.course_professor_map, self.classes_per_week)
+        self.assertEqual(problems[0]['phase'], 1)
+        self.assertTrue(presolve_failure_message(problems).startswith(
+            "PHASE 1 PRE-CHECK FAILED: Course 'Math101' needs 4 sessions but only has 3 slot(s) available."))
+
+    def test_professor_hall_condition(self):
+        # Three courses, one professor, four sessions squeezed into three shared slots
+        slots = ['Monday 9:00', 'Tuesday 9:00', 'Wednesday 9:00']
+        courses = {'A': {'time_slots': slots[:2]}, 'B': {'time_slots': slots[:2]},
+                   'C': {'time_slots': slots}}
+        problems = find_presolve_problems(courses, {'A': 'P1', 'B': 'P1', 'C': ['P1', 'P2']},
+                                          {'A': 1, 'B': 1, 'C': 2}, add_no_same_day=False)
+        self.assertEqual([problem['phase'] for problem in problems], [2])
+        self.assertIn("Professor 'P1' must teach 4 sessions of A, B, C", problems[0]['summary'])
+        self.assertIn("3 free slot(s)", problems[0]['summary'])
+
+    def test_total_capacity(self):
+        courses = {f'C{i}': {'time_slots': ['Monday 9:00', 'Tuesday 9:00']} for i in range(3)}
+        problems = find_presolve_problems(courses, {}, {c_id: 2 for c_id in courses}, max_classes_per_slot=2)
+        self.assertEqual([problem['phase'] for problem in problems], [3])
+        problems = find_presolve_problems(courses, {}, {c_id: 2 for c_id in courses}, max_classes_per_slot=2,
+                                          add_timeslot_capacity=False)
+        self.assertEqual(problems, [])
+
+    def test_distinct_days(self):
+        self.courses['Math101'] = {'time_slots': ['Monday 9:00', 'Monday 11:00', 'Friday 10:00']}
+        self.classes_per_week['Math101'] = 3
+        problems = find_presolve_problems(self.courses, self.course_professor_map, self.classes_per_week)
+        self.assertEqual([problem['phase'] for problem in problems], [5])
+        self.assertIn("fall on 2 day(s): Monday, Friday", problems[0]['summary'])
+
+    def test_other_problems_are_listed(self):
+        self.classes_per_week['Math101'] = 4
+        self.courses['CS101'] = {'time_slots': ['Monday 10:00', 'Monday 11:00']}
+        message = presolve_failure_message(find_presolve_problems(self.courses, self.course_professor_map,
+                                                                  self.classes_per_week))
+        self.assertTrue(message.startswith("PHASE 1 PRE-CHECK FAILED"))
+        self.assertIn("Other problems found:\n", message)
+        self.assertIn("• PHASE 5: Course 'CS101'", message)
+
+
+if __name__ == '__main__':
+    unittest.main()
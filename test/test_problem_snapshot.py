@@ -0,0 +1,114 @@
+import unittest
+import dataclasses
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src.database_management.dbconnection import create_tables, get_db_session
+from src.database_management.models import User, Course, CourseProfessor, CourseStud, Slot, ProfessorBusySlot, Settings
+from src.database_management.database_retrieval import (registration_data, registration_data_with_sections,
+                                                        faculty_pref, get_course_section_professor_mapping)
+from src.database_management.problem_snapshot import load_problem_snapshot
+from src.main_algorithm import load_timetable_inputs
+
+
+class TestProblemSnapshot(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        create_tables(self.db_path)
+        with get_db_session(self.db_path) as session:
+            users = [User(Email=email, Name=email, Role=role) for email, role in
+                     [("p1", "Professor"), ("p2", "Professor"), ("s1", "Student"), ("s2", "Student"),
+                      ("s3", "Student")]]
+            courses = [Course(CourseName="Math", CourseType="Required", ClassesPerWeek=2, NumberOfSections=1),
+                       Course(CourseName="CS", CourseType="Elective", ClassesPerWeek=3, NumberOfSections=2)]
+            slots = [Slot(Day=day, StartTime=start, EndTime=end) for day, start, end in
+                     [("Monday", "09:00", "10:30"), ("Tuesday", "09:00", "10:30"), ("Wednesday", "11:00", "12:30")]]
+            session.add_all(users + courses + slots)
+            session.flush()
+            ids = {user.Email: user.UserID for user in users}
+            math, cs = courses
+            session.add_all([
+                CourseProfessor(CourseID=math.CourseID, ProfessorID=ids["p1"], SectionNumber=1),
+                CourseProfessor(CourseID=cs.CourseID, ProfessorID=ids["p1"], SectionNumber=1),
+                CourseProfessor(CourseID=cs.CourseID, ProfessorID=ids["p2"], SectionNumber=2),
+                CourseStud(CourseID=math.CourseID, StudentID=ids["s1"], SectionNumber=1),
+                CourseStud(CourseID=math.CourseID, StudentID=ids["s2"], SectionNumber=1),
+                CourseStud(CourseID=cs.CourseID, StudentID=ids["s1"], SectionNumber=1),
+                CourseStud(CourseID=cs.CourseID, StudentID=ids["s3"], SectionNumber=2),
+                ProfessorBusySlot(ProfessorID=ids["p2"], SlotID=slots[0].SlotID),
+                Settings(SettingKey="max_classes_per_slot", SettingValue="5"),
+                Settings(SettingKey="solver_num_workers", SettingValue="4"),
+                Settings(SettingKey="solver_max_time_seconds", SettingValue="auto"),
+            ])
+            session.commit()
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def test_matches_the_retrieval_functions(self):
+        snapshot = load_problem_snapshot(self.db_path)
+        self.assertTrue(snapshot.registration_data().equals(registration_data(self.db_path)))
+        self.assertTrue(snapshot.registration_data_with_sections().equals(
+            registration_data_with_sections(self.db_path)))
+        self.assertTrue(snapshot.faculty_pref().equals(faculty_pref(self.db_path)))
+        self.assertEqual(snapshot.get_course_section_professor_mapping(),
+                         get_course_section_professor_mapping(self.db_path))
+        self.assertEqual(snapshot.slot_catalog.labels, ['Monday 09:00', 'Tuesday 09:00', 'Wednesday 11:00'])
+
+    def test_settings_and_flags(self):
+        snapshot = load_problem_snapshot(self.db_path)
+        self.assertEqual(snapshot.max_classes_per_slot, 5)
+        solver_settings = snapshot.solver_settings()
+        self.assertEqual(solver_settings["num_workers"], 4)
+        self.assertIsNone(solver_settings["max_time_in_seconds"])
+        self.assertTrue(snapshot.has_multi_section_courses)
+        self.assertFalse(snapshot.needs_default_time_slots)
+
+    def test_inputs_without_busy_slots(self):
+        with get_db_session(self.db_path) as session:
+            session.query(ProfessorBusySlot).delete()
+            session.commit()
+        snapshot = load_problem_snapshot(self.db_path)
+        self.assertEqual(list(snapshot.faculty_pref().columns), ['Name', 'Busy Slot'])
+        with patch("src.main_algorithm.check_migration_needed", return_value=False):
+            inputs = load_timetable_inputs(self.db_path, snapshot)
+        self.assertIn(0, inputs["courses"]["CS-B"]["time_slots"])
+
+    def test_snapshot_is_immutable(self):
+        snapshot = load_problem_snapshot(self.db_path)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            snapshot.courses = ()
+        self.assertIsInstance(snapshot.enrollments, tuple)
+
+    def test_inputs_are_loaded_in_one_session(self):
+        # Migration check aside, building the solver inputs takes a single database connection
+        checkouts = []
+
+        def record(dbapi_connection, connection_record, connection_proxy):
+            checkouts.append(dbapi_connection)
+
+        event.listen(Pool, "checkout", record)
+        try:
+            with patch("src.main_algorithm.check_migration_needed", return_value=False):
+                inputs = load_timetable_inputs(self.db_path)
+        finally:
+            event.remove(Pool, "checkout", record)
+        self.assertEqual(len(checkouts), 1)
+        self.assertEqual(inputs["student_course_map"], {"s1": ["CS-A", "Math"], "s2": ["Math"], "s3": ["CS-B"]})
+        self.assertEqual(inputs["course_professor_map"], {"CS-A": ["p1"], "CS-B": ["p2"], "Math": ["p1"]})
+        self.assertNotIn(0, inputs["courses"]["CS-B"]["time_slots"])
+
+
+if __name__ == '__main__':
+    unittest.main()
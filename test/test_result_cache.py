@@ -0,0 +1,173 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src.database_management.dbconnection import create_tables, get_db_session
+from src.database_management.models import ScheduleCache, User, Course, CourseProfessor, CourseStud, Slot, Schedule
+from src.database_management.result_cache import (problem_fingerprint, get_cached_result,
+                                                   store_cached_result, clear_result_cache)
+from src import schedule_model, main_algorithm
+from src.main_algorithm import timetable_cache_key, store_timetable, load_cached_timetable, gen_timetable
+from src.slot_catalog import SlotCatalog
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        create_tables(self.db_path)
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def test_fingerprint_ignores_order(self):
+        first = {"students": {"S1": ["Math101", "CS101"], "S2": ["CS101"]}, "max": 24}
+        second = {"max": 24, "students": {"S2": ["CS101"], "S1": ["CS101", "Math101"]}}
+        self.assertEqual(problem_fingerprint(first), problem_fingerprint(second))
+        second["students"]["S2"].append("PHY101")
+        self.assertNotEqual(problem_fingerprint(first), problem_fingerprint(second))
+
+    def test_round_trip_and_hit_count(self):
+        self.assertIsNone(get_cached_result(self.db_path, "k1"))
+        store_cached_result(self.db_path, "k1", {"message": "ok"})
+        self.assertEqual(get_cached_result(self.db_path, "k1"), {"message": "ok"})
+        get_cached_result(self.db_path, "k1")
+        with get_db_session(self.db_path) as session:
+            self.assertEqual(session.query(ScheduleCache).filter_by(CacheKey="k1").one().HitCount, 2)
+
+    def test_ttl_expiry(self):
+        store_cached_result(self.db_path, "old", {"message": "ok"})
+        with get_db_session(self.db_path) as session:
+            session.query(ScheduleCache).filter_by(CacheKey="old").one().CreatedAt = time.time() - 3600
+            session.commit()
+        self.assertIsNone(get_cached_result(self.db_path, "old", ttl_seconds=60))
+        # The expired entry is gone for good
+        self.assertIsNone(get_cached_result(self.db_path, "old"))
+
+    def test_lru_eviction(self):
+        for key in ["a", "b", "c"]:
+            store_cached_result(self.db_path, key, {"key": key}, max_entries=3)
+            time.sleep(0.01)
+        get_cached_result(self.db_path, "a")
+        store_cached_result(self.db_path, "d", {"key": "d"}, max_entries=3)
+        # "b" was the least recently used
+        self.assertIsNone(get_cached_result(self.db_path, "b"))
+        for key in ["a", "c", "d"]:
+            self.assertEqual(get_cached_result(self.db_path, key), {"key": key})
+        self.assertEqual(clear_result_cache(self.db_path), 3)
+
+    def test_timetable_round_trip(self):
+        catalog = SlotCatalog.from_labels(['Monday 09:00', 'Tuesday 09:00'])
+        inputs = {"courses": {"C1": {"time_slots": [1, 0]}}, "student_course_map": {"S1": ["C1"]},
+                  "course_professor_map": {"C1": ["P1"]}, "course_classes_per_week": {"C1": 2},
+                  "course_type": {"C1": "Required"}, "slot_catalog": catalog}
+        key = timetable_cache_key(inputs, max_classes_per_slot=24, conflict_mode="student")
+        self.assertNotEqual(key, timetable_cache_key(inputs, max_classes_per_slot=20, conflict_mode="student"))
+        inputs["courses"]["C1"]["time_slots"] = [0, 1]
+        self.assertEqual(key, timetable_cache_key(inputs, max_classes_per_slot=24, conflict_mode="student"))
+
+        schedule_df = pd.DataFrame({"Course ID": ["C1", "C1"], "Scheduled Time": ['Monday 09:00', 'Tuesday 09:00']})
+        conflicts = pd.DataFrame(columns=['Roll No.', 'Conflict Time Slot', 'Conflicting Courses'])
+        store_timetable(self.db_path, key, schedule_df, conflicts, "STOPPED EARLY during PHASE 4: ...", 1.0)
+        self.assertIsNone(load_cached_timetable(self.db_path, key))
+
+        store_timetable(self.db_path, key, schedule_df, conflicts, "Schedule found through PHASE 5 constraints.", 1.0)
+        updates = []
+        cached_df, cached_conflicts, message = load_cached_timetable(self.db_path, key, updates.append)
+        pd.testing.assert_frame_equal(cached_df, schedule_df)
+        self.assertEqual(list(cached_conflicts.columns), list(conflicts.columns))
+        self.assertEqual(message, "Schedule found through PHASE 5 constraints.")
+        self.assertTrue(updates[0]["cached"])
+
+    def test_only_proven_verdicts_are_cached_for_empty_schedules(self):
+        empty = pd.DataFrame(columns=["Course ID", "Scheduled Time"])
+        store_timetable(self.db_path, "timeout", empty, pd.DataFrame(), "PHASE 3 TIMED OUT: ...", 10.0)
+        store_timetable(self.db_path, "bogus", empty, pd.DataFrame(),
+                        "Schedule found through PHASE 5 constraints.", 10.0)
+        self.assertIsNone(get_cached_result(self.db_path, "timeout"))
+        self.assertIsNone(get_cached_result(self.db_path, "bogus"))
+        store_timetable(self.db_path, "infeasible", empty, pd.DataFrame(), "PHASE 2 FAILED: ...", 1.0)
+        store_timetable(self.db_path, "precheck", empty, pd.DataFrame(), "PHASE 1 PRE-CHECK FAILED: ...", 1.0)
+        self.assertEqual(get_cached_result(self.db_path, "infeasible")["message"], "PHASE 2 FAILED: ...")
+        self.assertEqual(get_cached_result(self.db_path, "precheck")["message"], "PHASE 1 PRE-CHECK FAILED: ...")
+
+
+class TestUnfinishedRuns(unittest.TestCase):
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        create_tables(self.db_path)
+        with get_db_session(self.db_path) as session:
+            users = [User(Email=email, Name=email, Role=role) for email, role in
+                     [("p1", "Professor"), ("s1", "Student")]]
+            course = Course(CourseName="Math", CourseType="Required", ClassesPerWeek=2, NumberOfSections=1)
+            slots = [Slot(Day=day, StartTime="09:00", EndTime="10:30") for day in ("Monday", "Tuesday", "Friday")]
+            session.add_all(users + [course] + slots)
+            session.flush()
+            session.add_all([CourseProfessor(CourseID=course.CourseID, ProfessorID=users[0].UserID, SectionNumber=1),
+                             CourseStud(CourseID=course.CourseID, StudentID=users[1].UserID, SectionNumber=1)])
+            session.commit()
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def cache_entries(self):
+        with get_db_session(self.db_path) as session:
+            return session.query(ScheduleCache).count()
+
+    def test_timeout_is_not_cached(self):
+        apply_solver_parameters = schedule_model.apply_solver_parameters
+
+        def without_time(solver, params):
+            # No time to search: every solve ends UNKNOWN
+            apply_solver_parameters(solver, params)
+            solver.parameters.max_time_in_seconds = 0.0
+
+        with patch.object(schedule_model, "apply_solver_parameters", without_time):
+            schedule_data, _, message = gen_timetable(self.db_path)
+        self.assertTrue(schedule_data.empty)
+        self.assertTrue(message.startswith("PHASE 1 TIMED OUT"))
+        self.assertEqual(self.cache_entries(), 0)
+
+        # The next run solves instead of replaying the timeout
+        schedule_data, _, message = gen_timetable(self.db_path)
+        self.assertEqual(len(schedule_data), 2)
+        self.assertEqual(self.cache_entries(), 1)
+
+    def saved_schedule(self):
+        with get_db_session(self.db_path) as session:
+            return sorted((row.CourseID, row.SlotID) for row in session.query(Schedule))
+
+    def test_stop_before_the_hard_constraints_keeps_the_saved_timetable(self):
+        schedule_data, _, _ = gen_timetable(self.db_path)
+        saved = self.saved_schedule()
+        self.assertEqual(len(saved), 2)
+
+        stop_event = threading.Event()
+
+        def stop_in_phase_2(update):
+            if update["phase"] == "PHASE 2" and "objective" in update:
+                stop_event.set()
+
+        with patch.object(main_algorithm, "schedule", wraps=main_algorithm.schedule) as save:
+            schedule_data, _, message = gen_timetable(self.db_path, use_cache=False,
+                                                      progress_callback=stop_in_phase_2, stop_event=stop_event)
+        save.assert_not_called()
+        self.assertTrue(schedule_data.empty)
+        self.assertTrue(message.startswith("STOPPED EARLY during PHASE 2"))
+        self.assertEqual(self.saved_schedule(), saved)
+
+
+if __name__ == '__main__':
+    unittest.main()
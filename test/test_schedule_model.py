@@ -1,6 +1,8 @@
 import unittest
 import sys
+import threading
 from pathlib import Path
+from unittest.mock import patch
 import pandas as pd
 
 # Get the current file's directory path
@@ -13,7 +15,13 @@ grandparent_path = current_file_path.parent.parent
 sys.path.append(str(grandparent_path))
 
 # Import the schedule_courses function
-from src.schedule_model import schedule_courses
+from src.schedule_model import (schedule_courses, group_students_by_enrollment, build_coenrollment_matrix,
+                                find_course_components, slot_capacity_can_bind, default_solver_parameters,
+                                resolve_solver_parameters, add_consecutive_day_penalties)
+from src import schedule_model
+from src.slot_catalog import SlotCatalog
+from ortools.sat.python import cp_model
+from src.conflict_checker import check_conflicts
 
 class TestCourseScheduling(unittest.TestCase):
     def setUp(self):
@@ -126,5 +134,339 @@ class TestCourseScheduling(unittest.TestCase):
             self.assertEqual(len(slots), len(set(slots)), f"Professor {professor} has overlapping classes.")
 
 
+class TestIncrementalPhases(unittest.TestCase):
+    """
+    Phases are solved on one shared model under assumptions; the
+    diagnostics must still name the first failing phase.
+    """
+    def setUp(self):
+        self.courses = {
+            'Math101': {'time_slots': ['Monday 9:00', 'Wednesday 11:00', 'Friday 10:00']},
+            'CS101': {'time_slots': ['Monday 10:00', 'Tuesday 9:00', 'Thursday 10:00']},
+            'History201': {'time_slots': ['Tuesday 11:00', 'Thursday 9:00', 'Friday 11:00']}
+        }
+        self.student_course_map = {
+            'Alice': ['Math101', 'CS101'],
+            'Bob': ['CS101', 'History201'],
+            'Charlie': ['Math101', 'History201']
+        }
+        self.course_professor_map = {
+            'Math101': 'Prof. Einstein',
+            'CS101': 'Prof. Turing',
+            'History201': 'Prof. Einstein'
+        }
+        self.classes_per_week = {c_id: 2 for c_id in self.courses}
+        self.course_type = {c_id: 'Required' for c_id in self.courses}
+
+    def test_all_phases_feasible(self):
+        df, message = schedule_courses(self.courses, self.student_course_map, self.course_professor_map,
+                                       self.classes_per_week, self.course_type, [],
+                                       add_no_consec_days=True)
+        self.assertEqual(message, "Schedule found through PHASE 6 constraints.")
+        self.assertEqual(len(df), 6)
+        self.assertFalse(df.duplicated(subset=['Scheduled Time']).any())
+
+    def test_professor_phase_reported(self):
+        # Each professor alone can fit (so the pre-checks pass), but the
+        # co-taught course X cannot avoid both A and B
+        courses = {'X': {'time_slots': ['Monday 9:00', 'Tuesday 9:00']},
+                   'A': {'time_slots': ['Monday 9:00']},
+                   'B': {'time_slots': ['Tuesday 9:00']}}
+        df, message = schedule_courses(courses, {'S1': ['X', 'A', 'B']},
+                                       {'X': ['Prof1', 'Prof2'], 'A': 'Prof1', 'B': 'Prof2'},
+                                       {'X': 1, 'A': 1, 'B': 1}, {}, [])
+        self.assertTrue(df.empty)
+        self.assertTrue(message.startswith("PHASE 2 FAILED"))
+
+    def test_same_day_phase_reported(self):
+        # C1 must use Tuesday to avoid meeting twice on Monday, but C2 (same professor) needs Tuesday too
+        courses = {'C1': {'time_slots': ['Monday 9:00', 'Monday 10:00', 'Tuesday 9:00']},
+                   'C2': {'time_slots': ['Tuesday 9:00']}}
+        df, message = schedule_courses(courses, {'S1': ['C1']}, {'C1': 'Prof1', 'C2': 'Prof1'},
+                                       {'C1': 2, 'C2': 1}, {}, [])
+        self.assertTrue(df.empty)
+        self.assertTrue(message.startswith("PHASE 5 FAILED"))
+
+    def test_presolve_check_skips_the_solver(self):
+        courses = {'C1': {'time_slots': ['Monday 9:00', 'Monday 10:00']}}
+        updates = []
+        df, message = schedule_courses(courses, {'S1': ['C1']}, {'C1': 'Prof1'}, {'C1': 2}, {}, [],
+                                       progress_callback=updates.append)
+        self.assertTrue(df.empty)
+        self.assertTrue(message.startswith("PHASE 5 PRE-CHECK FAILED"))
+        self.assertEqual(updates, [])
+
+    def test_disabled_family_is_not_enforced(self):
+        courses = {'C1': {'time_slots': ['Monday 9:00', 'Monday 10:00']}}
+        df, message = schedule_courses(courses, {'S1': ['C1']}, {'C1': 'Prof1'}, {'C1': 2}, {}, [],
+                                       add_no_same_day=False)
+        self.assertEqual(message, "Schedule found through PHASE 5 constraints.")
+        self.assertEqual(len(df), 2)
+
+    def test_progress_callback_reports_solutions(self):
+        updates = []
+        schedule_courses(self.courses, self.student_course_map, self.course_professor_map,
+                         self.classes_per_week, self.course_type, [], progress_callback=updates.append)
+        started = [u["phase"] for u in updates if "objective" not in u]
+        self.assertEqual(started, [f"PHASE {i}" for i in range(1, 6)])
+        solutions = [u for u in updates if "objective" in u]
+        self.assertTrue(solutions)
+        for update in solutions:
+            self.assertGreaterEqual(update["gap"], 0.0)
+            self.assertLessEqual(update["best_bound"], update["objective"])
+            self.assertIn("elapsed_seconds", update)
+
+    def test_stop_event_returns_best_schedule_so_far(self):
+        stop_event = threading.Event()
+
+        def stop_in_phase_3(update):
+            if update["phase"] == "PHASE 3" and "objective" in update:
+                stop_event.set()
+
+        # Without the same-day rule, PHASE 3 already enforces every hard constraint
+        df, message = schedule_courses(self.courses, self.student_course_map, self.course_professor_map,
+                                       self.classes_per_week, self.course_type, [], add_no_same_day=False,
+                                       progress_callback=stop_in_phase_3, stop_event=stop_event)
+        self.assertTrue(message.startswith("STOPPED EARLY during PHASE 3: best schedule found satisfies "
+                                           "PHASE 3 constraints"))
+        self.assertEqual(len(df), 6)
+
+    def test_stop_before_every_hard_constraint_is_enforced_discards_the_schedule(self):
+        stop_event = threading.Event()
+        updates = []
+
+        def stop_in_phase_2(update):
+            updates.append(update)
+            if update["phase"] == "PHASE 2" and "objective" in update:
+                stop_event.set()
+
+        df, message = schedule_courses(self.courses, self.student_course_map, self.course_professor_map,
+                                       self.classes_per_week, self.course_type, [],
+                                       progress_callback=stop_in_phase_2, stop_event=stop_event)
+        # The PHASE 2 schedule ignores slot capacity and the same-day rule
+        self.assertTrue(df.empty)
+        self.assertTrue(message.startswith("STOPPED EARLY during PHASE 2: the best schedule found only "
+                                           "satisfies PHASE 2 constraints"))
+        self.assertFalse(any(update.get("stopped_early") for update in updates))
+
+    def test_metrics_cover_every_phase(self):
+        df, message, metrics = schedule_courses(self.courses, self.student_course_map, self.course_professor_map,
+                                                self.classes_per_week, self.course_type, [],
+                                                return_metrics=True)
+        self.assertEqual([entry["phase"] for entry in metrics["phases"]], [f"PHASE {i}" for i in range(1, 6)])
+        self.assertGreater(metrics["model"]["variables"], 0)
+        self.assertGreater(metrics["model"]["constraints"], 0)
+        for entry in metrics["phases"]:
+            self.assertEqual(entry["status"], "OPTIMAL")
+            self.assertLessEqual(entry["best_bound"], entry["objective"])
+            self.assertGreaterEqual(entry["wall_seconds"], 0.0)
+            self.assertEqual(entry["presolve"]["variables"], metrics["model"]["variables"])
+            for counter in ("booleans", "conflicts", "branches", "cpu_seconds"):
+                self.assertIn(counter, entry)
+        self.assertGreaterEqual(metrics["total_seconds"], 0.0)
+
+    def test_each_phase_is_warm_started_from_the_previous_one(self):
+        solves = []
+        original = cp_model.CpSolver.Solve
+
+        def recording_solve(solver, model, *args):
+            status = original(solver, model, *args)
+            proto = model.Proto()
+            solves.append((dict(zip(proto.solution_hint.vars, proto.solution_hint.values)),
+                           list(solver.ResponseProto().solution)))
+            return status
+
+        with patch.object(cp_model.CpSolver, "Solve", recording_solve):
+            df, message, metrics = schedule_courses(self.courses, self.student_course_map,
+                                                    self.course_professor_map, self.classes_per_week,
+                                                    self.course_type, [], heuristic_hints=False,
+                                                    return_metrics=True)
+        self.assertEqual(len(solves), 5)
+        first_hints, _ = solves[0]
+        self.assertEqual(first_hints, {})
+        self.assertEqual(metrics["phases"][0]["hints"], {"hinted": 0, "kept": None})
+        for previous, current, entry in zip(solves, solves[1:], metrics["phases"][1:]):
+            hints, solution = current
+            _, previous_solution = previous
+            # One hint per course/slot variable, set to the previous phase's value
+            self.assertEqual(len(hints), sum(len(info['time_slots']) for info in self.courses.values()))
+            self.assertEqual(hints, {var: previous_solution[var] for var in hints})
+            kept = sum(1 for var, value in hints.items() if solution[var] == value)
+            self.assertEqual(entry["hints"], {"hinted": len(hints), "kept": kept})
+
+    def test_metrics_of_a_failed_presolve_check(self):
+        courses = {'C1': {'time_slots': ['Monday 9:00', 'Monday 10:00']}}
+        df, message, metrics = schedule_courses(courses, {'S1': ['C1']}, {'C1': 'Prof1'}, {'C1': 2}, {}, [],
+                                                return_metrics=True)
+        self.assertTrue(df.empty)
+        self.assertIsNone(metrics["model"])
+        self.assertEqual(metrics["phases"], [])
+
+
+class TestEnrollmentSignatures(unittest.TestCase):
+    def test_identical_enrollments_share_a_group(self):
+        student_course_map = {
+            'S1': ['A', 'B'],
+            'S2': ['B', 'A'],
+            'S3': ['A', 'C'],
+            'S4': ['A'],
+        }
+        groups = group_students_by_enrollment(student_course_map)
+        self.assertEqual(groups, {frozenset({'A', 'B'}): 2, frozenset({'A', 'C'}): 1})
+
+    def test_course_filter(self):
+        groups = group_students_by_enrollment({'S1': ['A', 'B', 'X']}, lambda c_id: c_id != 'X')
+        self.assertEqual(groups, {frozenset({'A', 'B'}): 1})
+
+    def test_weighted_groups_minimise_student_clashes(self):
+        """Two slots for three courses: the smallest cohort must take the clash."""
+        courses = {c_id: {'time_slots': ['Monday 9:00', 'Tuesday 9:00']} for c_id in ['A', 'B', 'C']}
+        student_course_map = {f's{i}': ['A', 'B'] for i in range(5)}
+        student_course_map.update({f't{i}': ['B', 'C'] for i in range(3)})
+        student_course_map.update({f'u{i}': ['A', 'C'] for i in range(2)})
+        df, _ = schedule_courses(courses, student_course_map, {'A': 'P1', 'B': 'P2', 'C': 'P3'},
+                                 {c_id: 1 for c_id in courses}, {}, [])
+        conflicts = check_conflicts(df, student_course_map)
+        self.assertEqual(len(conflicts), 2)
+        self.assertEqual(set(conflicts['Roll No.']), {'u0', 'u1'})
+
+
+class TestCoursePairMode(unittest.TestCase):
+    def test_coenrollment_matrix(self):
+        matrix = build_coenrollment_matrix({'S1': ['A', 'B', 'C'], 'S2': ['B', 'A'], 'S3': ['C']})
+        self.assertEqual(matrix, {('A', 'B'): 2, ('A', 'C'): 1, ('B', 'C'): 1})
+
+    def test_course_pair_mode_matches_student_mode(self):
+        courses = {c_id: {'time_slots': ['Monday 9:00', 'Tuesday 9:00']} for c_id in ['A', 'B', 'C']}
+        student_course_map = {f's{i}': ['A', 'B'] for i in range(5)}
+        student_course_map.update({f't{i}': ['B', 'C'] for i in range(3)})
+        student_course_map.update({f'u{i}': ['A', 'C'] for i in range(2)})
+        df, _ = schedule_courses(courses, student_course_map, {'A': 'P1', 'B': 'P2', 'C': 'P3'},
+                                 {c_id: 1 for c_id in courses}, {}, [], conflict_mode="course_pair")
+        self.assertEqual(len(check_conflicts(df, student_course_map)), 2)
+
+    def test_unknown_mode_rejected(self):
+        with self.assertRaises(ValueError):
+            schedule_courses({'A': {'time_slots': ['Monday 9:00']}}, {}, {}, {'A': 1}, {}, [],
+                             conflict_mode="bogus")
+
+
+class TestComponentDecomposition(unittest.TestCase):
+    def setUp(self):
+        slots = ['Monday 9:00', 'Tuesday 9:00', 'Wednesday 9:00']
+        self.courses = {c_id: {'time_slots': list(slots)} for c_id in ['A1', 'A2', 'B1', 'B2', 'C1']}
+        self.student_course_map = {'s1': ['A1', 'A2'], 's2': ['B1'], 's3': ['B2']}
+        self.course_professor_map = {'A1': 'P1', 'A2': 'P2', 'B1': 'P3', 'B2': 'P3', 'C1': 'P4'}
+
+    def test_components_follow_students_and_professors(self):
+        components = find_course_components(self.courses, self.student_course_map, self.course_professor_map)
+        self.assertEqual(sorted(sorted(comp) for comp in components), [['A1', 'A2'], ['B1', 'B2'], ['C1']])
+
+    def test_capacity_binding(self):
+        self.assertTrue(slot_capacity_can_bind(self.courses, 4))
+        self.assertFalse(slot_capacity_can_bind(self.courses, 5))
+
+    def test_decomposed_solve_merges_components(self):
+        classes_per_week = {c_id: 2 for c_id in self.courses}
+        classes_per_week['B2'] = 1  # B1 and B2 share P3 across three slots
+        df, message = schedule_courses(self.courses, self.student_course_map, self.course_professor_map,
+                                       classes_per_week, {}, [], add_timeslot_capacity=False, max_workers=2)
+        self.assertEqual(message, "Schedule found through PHASE 5 constraints.")
+        self.assertEqual(sorted(df['Course ID'].unique()), sorted(self.courses))
+        self.assertEqual(len(df), 9)
+
+    def test_stopped_components_report_one_stopped_early_update(self):
+        def stop_each_component_in_phase_5(pool, jobs, progress_callback=None):
+            # Solves the buckets here instead of on the pool, stopping each one in PHASE 5
+            results = []
+            for job in jobs:
+                stop_event = threading.Event()
+
+                def stop_in_phase_5(update):
+                    if update["phase"] == "PHASE 5" and "objective" in update:
+                        stop_event.set()
+
+                results.append(schedule_model._solve_component(
+                    dict(job, stop_event=stop_event, progress_callback=stop_in_phase_5)))
+            return results
+
+        classes_per_week = {c_id: 1 for c_id in self.courses}
+        updates = []
+        with patch.object(schedule_model, "_collect_component_results", stop_each_component_in_phase_5):
+            df, message, metrics = schedule_courses(self.courses, self.student_course_map,
+                                                    self.course_professor_map, classes_per_week, {}, [],
+                                                    add_timeslot_capacity=False, max_workers=2,
+                                                    progress_callback=updates.append,
+                                                    stop_event=threading.Event(), return_metrics=True)
+        self.assertTrue(message.startswith("STOPPED EARLY during PHASE 5"))
+        self.assertEqual(len(df), 5)
+        stopped_updates = [update for update in updates if update.get("stopped_early")]
+        self.assertEqual(len(stopped_updates), 1)
+        component_gaps = [component["stopped_early"]["gap"] for component in metrics["components"]]
+        self.assertEqual(len(component_gaps), 2)
+        self.assertEqual(stopped_updates[0]["gap"], max(component_gaps))
+        self.assertEqual(stopped_updates[0]["schedule_phase"], "PHASE 5")
+        self.assertEqual(metrics["stopped_early"], stopped_updates[0])
+
+    def test_earliest_failing_phase_is_reported(self):
+        # Two components that only the solver can prove infeasible:
+        # X/Y/Z clash through co-taught X -> phase 2; D1/D2 -> phase 5
+        courses = {'X': {'time_slots': ['Monday 9:00', 'Tuesday 9:00']},
+                   'Y': {'time_slots': ['Monday 9:00']},
+                   'Z': {'time_slots': ['Tuesday 9:00']},
+                   'D1': {'time_slots': ['Monday 9:00', 'Monday 10:00', 'Tuesday 9:00']},
+                   'D2': {'time_slots': ['Tuesday 9:00']}}
+        course_professor_map = {'X': ['P1', 'P2'], 'Y': 'P1', 'Z': 'P2', 'D1': 'P3', 'D2': 'P3'}
+        classes_per_week = {'X': 1, 'Y': 1, 'Z': 1, 'D1': 2, 'D2': 1}
+        df, message = schedule_courses(courses, {'s1': ['X'], 's2': ['D1']}, course_professor_map,
+                                       classes_per_week, {}, [], add_timeslot_capacity=False, max_workers=3)
+        self.assertTrue(df.empty)
+        self.assertTrue(message.startswith("PHASE 2 FAILED"))
+
+
+class TestSolverParameters(unittest.TestCase):
+    def test_defaults_scale_with_instance_size(self):
+        small = default_solver_parameters(10, 30, 100)
+        large = default_solver_parameters(500, 30, 10000)
+        self.assertLess(small["max_time_in_seconds"], large["max_time_in_seconds"])
+        self.assertEqual(small["relative_gap_limit"], 0.0)
+        self.assertGreater(large["relative_gap_limit"], 0.0)
+
+    def test_overrides_are_typed_and_blank_means_auto(self):
+        params = resolve_solver_parameters({"max_time_in_seconds": "5", "num_workers": None,
+                                            "log_search_progress": "true"}, 10, 30, 100)
+        self.assertEqual(params["max_time_in_seconds"], 5.0)
+        self.assertEqual(params["num_workers"], default_solver_parameters(10, 30, 100)["num_workers"])
+        self.assertIs(params["log_search_progress"], True)
+
+    def test_unknown_parameter_rejected(self):
+        with self.assertRaises(ValueError):
+            resolve_solver_parameters({"max_deterministic_time": 1}, 10, 30, 100)
+
+
+class TestConsecutiveDayPenalty(unittest.TestCase):
+    def test_model_size(self):
+        # 5 days x 6 slots: one var per slot, one day indicator per day, one penalty per adjacent pair
+        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+        catalog = SlotCatalog.from_labels([f"{day} {hour:02d}:30" for day in days for hour in range(8, 20, 2)])
+        model = cp_model.CpModel()
+        consec_lit = model.NewBoolVar('phase_consec')
+        course_time_vars = {c_id: {s: model.NewBoolVar(f'{c_id}_{s}') for s in range(len(catalog))}
+                            for c_id in ['C1', 'C2']}
+        before = len(model.Proto().variables)
+
+        penalties = add_consecutive_day_penalties(model, course_time_vars, catalog, consec_lit)
+
+        self.assertEqual(len(penalties), 2 * 4)
+        self.assertEqual(len(model.Proto().variables) - before, 2 * (5 + 4))
+
+    def test_penalty_counts_adjacent_days(self):
+        courses = {'C1': {'time_slots': ['Monday 9:00', 'Tuesday 9:00', 'Wednesday 9:00']}}
+        df, message = schedule_courses(courses, {'S1': ['C1']}, {'C1': 'Prof1'}, {'C1': 2}, {}, [],
+                                       add_no_consec_days=True)
+        self.assertEqual(message, "Schedule found through PHASE 6 constraints.")
+        self.assertEqual(sorted(df['Scheduled Time']), ['Monday 9:00', 'Wednesday 9:00'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import random
+import sys
+from pathlib import Path
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src.schedule_repair import repair_schedule
+from src.heuristic_scheduler import dsatur_schedule
+from src.slot_catalog import SlotCatalog
+
+
+class TestScheduleRepair(unittest.TestCase):
+    def setUp(self):
+        slots = ['Monday 9:00', 'Monday 10:00', 'Tuesday 9:00', 'Tuesday 10:00', 'Wednesday 9:00']
+        self.courses = {c_id: {'time_slots': list(slots)} for c_id in ['C1', 'C2', 'C3', 'C4']}
+        self.student_course_map = {'S1': ['C1', 'C2'], 'S2': ['C1', 'C2'], 'S3': ['C3']}
+        self.course_professor_map = {'C1': 'P1', 'C2': 'P2', 'C3': 'P3', 'C4': 'P1'}
+        self.classes_per_week = {c_id: 1 for c_id in self.courses}
+        # C1 has just been dragged from Tuesday 9:00 into C2's slot
+        self.current = {'C1': ['Monday 9:00'], 'C2': ['Monday 9:00'], 'C3': ['Tuesday 10:00'],
+                        'C4': ['Wednesday 9:00']}
+
+    def repair(self, pinned, **kwargs):
+        return repair_schedule(self.courses, self.student_course_map, self.course_professor_map,
+                               self.classes_per_week, self.current, pinned, **kwargs)
+
+    def test_student_clash_is_moved_away(self):
+        result = self.repair({'C1': ['Monday 9:00']})
+        self.assertEqual(result["status"], "repaired")
+        # C4 shares Prof1 with C1 but not a slot, so it stays put
+        self.assertEqual(result["neighbourhood"], ['C1', 'C2'])
+        self.assertEqual(result["schedule"]['C1'], ['Monday 9:00'])
+        self.assertNotEqual(result["schedule"]['C2'], ['Monday 9:00'])
+        self.assertEqual([move["Course ID"] for move in result["moves"]], ['C2'])
+        self.assertEqual(result["student_clashes_before"], 2)
+        self.assertEqual(result["student_clashes_after"], 0)
+
+    def test_professor_clash_is_moved_away(self):
+        self.current['C1'] = ['Wednesday 9:00']
+        self.current['C2'] = ['Tuesday 9:00']
+        result = self.repair({'C1': ['Wednesday 9:00']})
+        self.assertEqual(result["status"], "repaired")
+        self.assertEqual(result["neighbourhood"], ['C1', 'C4'])
+        self.assertEqual([move["Course ID"] for move in result["moves"]], ['C4'])
+
+    def test_enrollment_change_frees_affected_courses(self):
+        # S3 has just enrolled in C4 too, which meets while C3 does
+        self.current = {'C1': ['Tuesday 9:00'], 'C2': ['Monday 9:00'], 'C3': ['Tuesday 10:00'],
+                        'C4': ['Tuesday 10:00']}
+        self.student_course_map['S3'] = ['C3', 'C4']
+        result = self.repair({}, free=['C4'])
+        self.assertEqual(result["status"], "repaired")
+        self.assertEqual(result["neighbourhood"], ['C3', 'C4'])
+        self.assertEqual(result["student_clashes_after"], 0)
+        self.assertEqual(len(result["moves"]), 1)
+
+    def test_newly_scheduled_course_is_placed(self):
+        del self.current['C4']
+        result = self.repair({}, free=['C4'])
+        self.assertEqual(result["status"], "repaired")
+        # Professor P1 already teaches C1 on Monday 9:00
+        self.assertNotEqual(result["schedule"]['C4'], ['Monday 9:00'])
+        self.assertEqual(result["moves"][0]["from"], [])
+
+    def test_full_slot_cannot_take_the_edit(self):
+        # C3 is fixed in Tuesday 10:00, which only holds one class
+        result = self.repair({'C1': ['Tuesday 10:00']}, max_classes_per_slot=1)
+        self.assertEqual(result["status"], "infeasible")
+        self.assertEqual(result["schedule"], {})
+
+    def test_repair_of_a_large_timetable_is_fast(self):
+        rng = random.Random(3)
+        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+        catalog = SlotCatalog.from_labels([f'{day} {hour}:00' for day in days for hour in range(8, 16)])
+        courses = {f'C{i}': {'time_slots': rng.sample(range(len(catalog)), 30)} for i in range(400)}
+        professors = {c_id: f'P{i % 120}' for i, c_id in enumerate(courses)}
+        students = {f'S{i}': rng.sample(sorted(courses), 5) for i in range(2000)}
+        draft = dsatur_schedule(courses, students, professors, {}, max_classes_per_slot=40, slot_catalog=catalog)
+        current = {c_id: list(slots) for c_id, slots in draft["assignment"].items()}
+        edited_slot = next(s for s in courses['C0']['time_slots'] if s not in current['C0'])
+        current['C0'] = [current['C0'][0], edited_slot]
+        result = repair_schedule(courses, students, professors, {}, current, {'C0': [edited_slot]},
+                                 max_classes_per_slot=40, slot_catalog=catalog)
+        self.assertEqual(result["status"], "repaired")
+        self.assertIn(catalog.labels[edited_slot], result["schedule"]['C0'])
+        self.assertLess(len(result["neighbourhood"]), len(courses))
+        self.assertLess(result["solve_seconds"], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
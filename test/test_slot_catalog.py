@@ -0,0 +1,69 @@
+import unittest
+import sys
+from pathlib import Path
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src.slot_catalog import SlotCatalog
+from src.utilities import create_course_dictionary
+from src.schedule_model import schedule_courses
+
+
+class SlotRow:
+    def __init__(self, slot_id, day, start, end):
+        self.SlotID = slot_id
+        self.Day = day
+        self.StartTime = start
+        self.EndTime = end
+
+
+class TestSlotCatalog(unittest.TestCase):
+    def setUp(self):
+        # Deliberately out of order, with seconds as some databases return them
+        self.catalog = SlotCatalog.from_slot_rows([
+            SlotRow(7, 'Wednesday', '08:30:00', '10:00:00'),
+            SlotRow(3, 'Monday', '10:30', '12:00'),
+            SlotRow(1, 'Monday', '08:30', '10:00'),
+            SlotRow(9, 'Friday', '08:30', '10:00'),
+            SlotRow(5, 'Tuesday', '08:30', '10:00'),
+        ])
+
+    def test_ids_follow_weekday_and_start_time(self):
+        self.assertEqual(self.catalog.labels, ['Monday 08:30', 'Monday 10:30', 'Tuesday 08:30',
+                                               'Wednesday 08:30', 'Friday 08:30'])
+        self.assertEqual(self.catalog.db_ids, [1, 3, 5, 7, 9])
+        self.assertEqual(self.catalog.start_minutes[1], 630)
+        self.assertEqual(self.catalog.end_minutes[1], 720)
+
+    def test_day_groupings_and_adjacency(self):
+        self.assertEqual(self.catalog.day_names, ['Monday', 'Tuesday', 'Wednesday', 'Friday'])
+        self.assertEqual(self.catalog.slots_by_day, [[0, 1], [2], [3], [4]])
+        # Wednesday -> Friday is not a consecutive pair
+        self.assertEqual(self.catalog.adjacent_day_pairs, [(0, 1), (1, 2)])
+
+    def test_label_lookup_ignores_seconds(self):
+        self.assertEqual(self.catalog.id_of('Wednesday 08:30:00'), 3)
+        self.assertEqual(self.catalog.db_id_of('Wednesday 08:30'), 7)
+        self.assertIsNone(self.catalog.db_id_of('Saturday 08:30'))
+        self.assertEqual(self.catalog.to_ids(['Friday 08:30', 'Sunday 09:00', 2]), [4, 2])
+
+    def test_course_dictionary_uses_slot_ids(self):
+        courses = create_course_dictionary({'s1': ['C1']}, {'C1': 'P1'},
+                                           {'P1': ['Monday 08:30']}, self.catalog)
+        self.assertEqual(courses['C1']['time_slots'], [1, 2, 3, 4])
+
+    def test_schedule_returns_labels(self):
+        courses = {'C1': {'time_slots': [0, 1, 2]}}
+        df, message = schedule_courses(courses, {'s1': ['C1']}, {'C1': 'P1'}, {'C1': 2}, {}, [],
+                                       slot_catalog=self.catalog)
+        self.assertEqual(message, "Schedule found through PHASE 5 constraints.")
+        scheduled = sorted(df['Scheduled Time'])
+        # Monday can only hold one of the two sessions
+        self.assertIn('Tuesday 08:30', scheduled)
+        self.assertEqual(len(scheduled), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Get the grandparent directory path, which is two levels up
+grandparent_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(grandparent_path))
+
+from src import solver_pool
+from src.solver_pool import run_solver_job
+
+
+# Job targets run in a spawned process, so they must be importable module-level functions
+
+def solve_quickly(value, progress_callback=None, stop_event=None, metrics=None):
+    for phase in ('PHASE 1', 'PHASE 2'):
+        progress_callback({"phase": phase})
+    if metrics is not None:
+        metrics["phases"] = [{"phase": 'PHASE 1'}, {"phase": 'PHASE 2'}]
+    return value * 2
+
+
+def solve_until_stopped(progress_callback=None, stop_event=None):
+    while not stop_event.is_set():
+        time.sleep(0.05)
+    return "best so far"
+
+
+def solve_with_steady_progress(progress_callback=None, stop_event=None):
+    # Reports faster than the pool polls, like a solver finding improving solutions
+    improvements = 0
+    while not stop_event.is_set():
+        improvements += 1
+        progress_callback({"phase": 'PHASE 1', "solutions": improvements})
+        time.sleep(0.01)
+    return improvements
+
+
+def grow_with_steady_progress(progress_callback=None, stop_event=None):
+    hoard = []
+    while True:
+        hoard.append(bytearray(4 * 1024 * 1024))
+        progress_callback({"phase": 'PHASE 1', "solutions": len(hoard)})
+        time.sleep(0.01)
+
+
+def solve_and_raise(progress_callback=None, stop_event=None):
+    raise ValueError("bad input")
+
+
+def solve_and_crash(progress_callback=None, stop_event=None):
+    os._exit(3)
+
+
+def solve_and_grow(progress_callback=None, stop_event=None):
+    hoard = []
+    while True:
+        hoard.append(bytearray(16 * 1024 * 1024))
+        time.sleep(0.05)
+
+
+class TestSolverPool(unittest.TestCase):
+    def test_result_progress_and_metrics_are_relayed(self):
+        updates = []
+        metrics = {}
+        result = run_solver_job(solve_quickly, {"value": 21, "metrics": metrics},
+                                progress_callback=updates.append)
+        self.assertEqual(result, 42)
+        self.assertEqual([update["phase"] for update in updates], ['PHASE 1', 'PHASE 2'])
+        self.assertEqual(len(metrics["phases"]), 2)
+
+    def test_stop_event_is_relayed(self):
+        stop_event = threading.Event()
+        threading.Timer(1.0, stop_event.set).start()
+        self.assertEqual(run_solver_job(solve_until_stopped, {}, stop_event=stop_event), "best so far")
+
+    def test_time_limit_requests_a_stop(self):
+        started = time.time()
+        self.assertEqual(run_solver_job(solve_until_stopped, {}, time_limit_seconds=1), "best so far")
+        self.assertLess(time.time() - started, solver_pool.STOP_GRACE_SECONDS)
+
+    def test_steady_progress_does_not_delay_a_stop(self):
+        stop_event = threading.Event()
+        threading.Timer(1.0, stop_event.set).start()
+        updates = []
+        started = time.time()
+        improvements = run_solver_job(solve_with_steady_progress, {}, progress_callback=updates.append,
+                                      stop_event=stop_event)
+        self.assertLess(time.time() - started, 5)
+        self.assertGreater(improvements, 0)
+        self.assertEqual(len(updates), improvements)
+
+    def test_steady_progress_does_not_delay_the_time_limit(self):
+        started = time.time()
+        run_solver_job(solve_with_steady_progress, {}, progress_callback=lambda update: None,
+                       time_limit_seconds=1)
+        self.assertLess(time.time() - started, 5)
+
+    def test_steady_progress_does_not_delay_the_memory_limit(self):
+        with self.assertRaises(RuntimeError) as raised:
+            run_solver_job(grow_with_steady_progress, {}, progress_callback=lambda update: None,
+                           memory_limit_mb=200)
+        self.assertIn("limit", str(raised.exception))
+
+    def test_job_exception_is_reported(self):
+        with self.assertRaises(RuntimeError) as raised, self.assertLogs("src.solver_pool", "ERROR") as logs:
+            run_solver_job(solve_and_raise, {})
+        self.assertIn("ValueError: bad input", str(raised.exception))
+        # The solver process's traceback is logged in full
+        self.assertIn("Traceback (most recent call last)", logs.output[0])
+        self.assertIn("in solve_and_raise", logs.output[0])
+
+    def test_crash_only_fails_the_job(self):
+        with self.assertRaises(RuntimeError) as raised:
+            run_solver_job(solve_and_crash, {})
+        self.assertIn("exit code 3", str(raised.exception))
+        # The pool slot is released and the next job runs normally
+        self.assertEqual(run_solver_job(solve_quickly, {"value": 1}), 2)
+
+    def test_memory_limit_kills_the_job(self):
+        with self.assertRaises(RuntimeError) as raised:
+            run_solver_job(solve_and_grow, {}, memory_limit_mb=200)
+        self.assertIn("limit", str(raised.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()